@@ -59,6 +59,67 @@ class Settings(BaseSettings):
     # Encryption
     credential_encryption_key: str = ""
 
+    # Scan extraction (0 = one parse worker per CPU)
+    extraction_workers: int = 0
+    # SQLite file for the blob-SHA extraction cache ("" disables it)
+    extraction_cache_path: str = "/tmp/mizanos/extraction_cache.sqlite3"
+    # Extraction runs in a child process whose parse workers share this much
+    # address space with it (0 = no cap); stopped after the timeout with
+    # partial results
+    extraction_memory_limit_mb: int = 2048
+    extraction_timeout_seconds: int = 300
+    # Scan clones check out only files the extractors read; blobs above the
+    # limit are never downloaded ("" disables the filter)
+    clone_sparse: bool = True
+    clone_blob_limit: str = "1m"
+
+    # Estimated prompt tokens per progress-matching request; tasks are packed
+    # into as few requests as fit
+    scan_prompt_token_budget: int = 24000
+
+    # Estimated tokens of portfolio context in all-projects chat: a capped
+    # overview plus the top-k snippets most relevant to the question
+    chat_context_token_budget: int = 6000
+    chat_context_top_k: int = 40
+    # Estimated tokens of chat history per prompt: recent user turns verbatim
+    # plus a rolling summary of older ones, capped at chat_summary_max_tokens
+    chat_history_token_budget: int = 2000
+    chat_summary_max_tokens: int = 400
+
+    # Arq worker: total concurrent jobs, and how many of them may be scans
+    worker_max_jobs: int = 10
+    scan_job_concurrency: int = 2
+
+    # Prometheus: bearer token required by the API's /metrics ("" = open,
+    # except in production, where /metrics is then not served at all),
+    # and the port the worker serves its own metrics on (0 = off)
+    metrics_token: str = ""
+    worker_metrics_port: int = 0
+
+    # Per-request SQL: log requests running at least this many statements,
+    # spending this long in the database, or repeating one statement this
+    # many times with differing parameters (likely an N+1 loop)
+    query_count_log_threshold: int = 50
+    query_time_log_ms: int = 1000
+    query_repeat_threshold: int = 10
+
+    # Profiling: requests sending "X-Profile: <profiling_token>" are profiled
+    # ("" = header ignored), as are the worker functions in profile_jobs;
+    # profile_sample_rate profiles that share of all requests and jobs
+    profiling_token: str = ""
+    profile_jobs: list[str] = []
+    profile_sample_rate: float = 0.0
+    profile_interval_ms: float = 1.0
+    profile_retention_hours: int = 24
+
+    # Tracing: "" (off), "otlp" (collector at tracing_otlp_endpoint) or
+    # "file" (JSON lines appended to tracing_file); traces are sampled at
+    # tracing_sample_ratio, and jobs follow their request's decision
+    tracing_exporter: str = ""
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_file: str = "traces.jsonl"
+    tracing_sample_ratio: float = 1.0
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "extra": "ignore"}
 
 
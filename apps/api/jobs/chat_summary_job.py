@@ -0,0 +1,23 @@
+"""Chat history summary job — folds overflowing turns into the session summary."""
+
+import logging
+from uuid import UUID
+
+from apps.api.services.chat_history import summarize_history
+from apps.api.services.llm_config import get_llm_config
+
+logger = logging.getLogger(__name__)
+
+
+async def summarize_chat_history_job(ctx: dict, session_id_str: str) -> None:
+    """Refresh one chat session's rolling history summary."""
+    session_id = UUID(session_id_str)
+    async with ctx["session_factory"]() as session:
+        try:
+            config = await get_llm_config(session)
+        except ValueError:
+            logger.warning("Chat %s: no LLM configured, summary not refreshed", session_id)
+            return
+        client = ctx["llm"].client(config.api_key, config.base_url)
+        if await summarize_history(session, session_id, client, config.model):
+            await session.commit()
@@ -1,36 +1,70 @@
 """Worker dependency injection — DB sessions and progress tracking."""
 
 import logging
+import time
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from packages.common.db.session import async_session_factory
+from apps.api.services.job_events import publish_job_event
 from apps.api.services.job_service import JobService
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between DB writes for progress ticks within the same stage
+_PERSIST_INTERVAL = 10.0
+
 
 class JobContext:
-    """Provides a DB session and progress helpers for worker tasks."""
+    """Provides a DB session and progress helpers for worker tasks.
+
+    Every progress update is published to the job's Redis channel; DB writes
+    are limited to stage boundaries (a new progress message) and at most one
+    per ``_PERSIST_INTERVAL`` within a stage.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, ctx: dict | None = None) -> None:
+        # Worker ctx from on_startup; supplies the shared session factory
+        self._session_factory = (ctx or {}).get("session_factory", async_session_factory)
         self._session: AsyncSession | None = None
+        self._persisted_message: str | None = None
+        self._persisted_at: float | None = None
 
     async def get_session(self) -> AsyncSession:
         """Create a fresh DB session for the job."""
         if self._session is None:
-            self._session = async_session_factory()
+            self._session = self._session_factory()
         return self._session
 
     async def update_progress(
         self, job_id: UUID, progress: int, message: str | None = None
     ) -> None:
         """Update job progress and descriptive label from inside a worker task."""
+        progress = min(progress, 100)
+        await publish_job_event(job_id, {
+            "job_id": str(job_id),
+            "status": "running",
+            "progress": progress,
+            "progress_message": message,
+        })
+        if not self._should_persist(message):
+            return
+
         session = await self.get_session()
         service = JobService(session)
         await service.update_progress(job_id, progress, message=message)
         await session.commit()
+        self._persisted_message = message
+        self._persisted_at = time.monotonic()
+
+    def _should_persist(self, message: str | None) -> bool:
+        """Persist on the first update, on stage change, or after the interval."""
+        if self._persisted_at is None:
+            return True
+        if message is not None and message != self._persisted_message:
+            return True
+        return time.monotonic() - self._persisted_at >= _PERSIST_INTERVAL
 
     async def mark_completed(self, job_id: UUID, result_data: dict | None = None) -> None:
         """Mark job as completed."""
@@ -38,6 +72,9 @@ class JobContext:
         service = JobService(session)
         await service.mark_completed(job_id, result_data)
         await session.commit()
+        await publish_job_event(job_id, {
+            "job_id": str(job_id), "status": "completed", "progress": 100,
+        })
 
     async def mark_failed(self, job_id: UUID, error_message: str) -> None:
         """Mark job as failed."""
@@ -45,6 +82,9 @@ class JobContext:
         service = JobService(session)
         await service.mark_failed(job_id, error_message)
         await session.commit()
+        await publish_job_event(job_id, {
+            "job_id": str(job_id), "status": "failed", "error_message": error_message,
+        })
 
     async def close(self) -> None:
         """Close the DB session."""
@@ -0,0 +1,156 @@
+"""Per-job-type concurrency limits and queue priorities for the Arq worker.
+
+Arq runs every job from one queue under a single ``max_jobs``. Limits are
+enforced per worker process: a job whose type is at its limit is enqueued
+again a little later instead of holding a worker slot, so a backlog of scans
+can't occupy every slot and starve short jobs. Priority backdates a job's queue
+score at enqueue time, so higher-priority jobs are picked up first.
+"""
+
+import functools
+import logging
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from arq.worker import Function, func
+
+from apps.api.config import settings
+from apps.api.jobs.stats import record_finish, record_start
+from apps.api.observability.profiling import profiled, should_profile_job
+from apps.api.observability.tracing import inject_context, job_span
+
+logger = logging.getLogger(__name__)
+
+# Seconds a job waits before re-checking a full concurrency limit
+DEFER_SECONDS = 10
+# Deferrals before a job runs over its limit (30 minutes of waiting at most)
+_MAX_DEFERRALS = 180
+# Job kwarg carrying the enqueuing request's W3C trace context
+TRACE_CONTEXT_KWARG = "trace_context"
+# Job kwarg counting how often a job was deferred by its concurrency limit
+DEFERRALS_KWARG = "job_deferrals"
+
+
+@dataclass(frozen=True)
+class JobLimit:
+    """Concurrency cap and priority for one job function."""
+
+    max_concurrent: int
+    # Seconds the queue score is backdated at enqueue; higher runs sooner
+    priority: int = 0
+
+
+# Long-running jobs are listed explicitly; anything else is treated as short
+JOB_LIMITS: dict[str, JobLimit] = {
+    "high_level_scan_job": JobLimit(max_concurrent=settings.scan_job_concurrency),
+}
+DEFAULT_JOB_LIMIT = JobLimit(max_concurrent=settings.worker_max_jobs, priority=300)
+
+
+def job_limit(function: str) -> JobLimit:
+    return JOB_LIMITS.get(function, DEFAULT_JOB_LIMIT)
+
+
+def enqueue_options(function: str) -> dict:
+    """Extra ``enqueue_job`` kwargs applying the function's priority.
+
+    Also passes the caller's trace context, which ``limited_func`` removes
+    before the job function is called.
+    """
+    options: dict = {}
+    trace_context = inject_context()
+    if trace_context:
+        options[TRACE_CONTEXT_KWARG] = trace_context
+    priority = job_limit(function).priority
+    if priority:
+        options["_defer_until"] = datetime.now(timezone.utc) - timedelta(seconds=priority)
+    return options
+
+
+class JobLimiter:
+    """Running job counts per function within this worker process."""
+
+    def __init__(self) -> None:
+        self.running: Counter[str] = Counter()
+
+    def try_acquire(self, function: str) -> bool:
+        if self.running[function] >= job_limit(function).max_concurrent:
+            return False
+        self.running[function] += 1
+        return True
+
+    def force_acquire(self, function: str) -> None:
+        self.running[function] += 1
+
+    def release(self, function: str) -> None:
+        self.running[function] -= 1
+
+
+async def _defer(
+    ctx: dict, name: str, args: tuple, kwargs: dict, trace_context: dict | None, deferrals: int,
+) -> None:
+    """Enqueue a new run of a job that found its limit full.
+
+    The copy gets a fresh job id: the current one stays taken until this
+    run's result expires.
+    """
+    if trace_context:
+        kwargs = {**kwargs, TRACE_CONTEXT_KWARG: trace_context}
+    await ctx["redis"].enqueue_job(
+        name, *args, _defer_by=DEFER_SECONDS, **{DEFERRALS_KWARG: deferrals}, **kwargs,
+    )
+    logger.debug("Job %s deferred (%d) at its concurrency limit", ctx.get("job_id"), deferrals)
+
+
+def limited_func(
+    coroutine: Callable[..., Awaitable],
+    *,
+    timeout: int | None = None,
+    keep_result: int | None = None,
+) -> Function:
+    """Register ``coroutine`` with Arq behind its concurrency limit and stats.
+
+    A deferred job is enqueued afresh with its deferral count in its kwargs,
+    so waiting for a slot never uses up Arq's tries, which stay reserved for
+    failures and worker crashes; after ``_MAX_DEFERRALS`` a job runs even over
+    the limit rather than being dropped. ``keep_result=0`` lets a job enqueued under a fixed
+    ``_job_id`` be enqueued again as soon as it finishes. Runs picked by
+    ``should_profile_job`` are profiled.
+    """
+    name = coroutine.__qualname__
+
+    @functools.wraps(coroutine)
+    async def run(ctx: dict, *args, **kwargs):
+        trace_context = kwargs.pop(TRACE_CONTEXT_KWARG, None)
+        deferrals = kwargs.pop(DEFERRALS_KWARG, 0)
+        limiter: JobLimiter = ctx["limiter"]
+        if not limiter.try_acquire(name):
+            if deferrals < _MAX_DEFERRALS:
+                await _defer(ctx, name, args, kwargs, trace_context, deferrals + 1)
+                return None
+            logger.warning("Job %s exhausted deferrals; running over its limit", ctx.get("job_id"))
+            limiter.force_acquire(name)
+
+        started = time.time()
+        enqueued: datetime | None = ctx.get("enqueue_time")
+        if enqueued is not None:
+            await record_start(ctx["redis"], name, (started - enqueued.timestamp()) * 1000)
+        ok = False
+        profile = (
+            profiled("job", name, redis=ctx["redis"]) if should_profile_job(name) else nullcontext()
+        )
+        try:
+            with job_span(name, trace_context, ctx.get("job_id")):
+                async with profile:
+                    result = await coroutine(ctx, *args, **kwargs)
+            ok = True
+            return result
+        finally:
+            limiter.release(name)
+            await record_finish(ctx["redis"], name, (time.time() - started) * 1000, ok)
+
+    return func(run, name=name, timeout=timeout, keep_result=keep_result)
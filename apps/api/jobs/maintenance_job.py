@@ -0,0 +1,47 @@
+"""Maintenance job — standard checklist seeding and archive cleanup.
+
+Each API process requests it at startup instead of running both inline
+before serving, and a worker cron requests it daily so archive retention
+does not depend on deploys. Both steps are idempotent, and seeding is skipped
+after one query when every template already exists.
+"""
+
+import logging
+
+from arq.connections import ArqRedis
+
+from apps.api.jobs.limits import enqueue_options
+from apps.api.services.archive_cleanup import run_archive_cleanup
+from apps.api.services.seed_checklists import run_checklist_seeds
+from packages.common.redis import get_arq_redis
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_JOB = "maintenance_job"
+# Seconds the finished job's id is kept: replicas restarting within this
+# window of each other (a rolling deploy) request it only once
+MAINTENANCE_DEDUP_SECONDS = 600
+
+
+async def maintenance_job(ctx: dict) -> None:
+    """Seed missing checklist templates, then delete expired archives."""
+    async with ctx["session_factory"]() as session:
+        await run_checklist_seeds(session)
+    async with ctx["session_factory"]() as session:
+        await run_archive_cleanup(session)
+
+
+async def request_maintenance(redis: ArqRedis | None = None) -> None:
+    """Queue the maintenance job unless it ran moments ago. Never raises."""
+    try:
+        redis = redis or await get_arq_redis()
+        await redis.enqueue_job(
+            MAINTENANCE_JOB, _job_id=MAINTENANCE_JOB, **enqueue_options(MAINTENANCE_JOB),
+        )
+    except Exception:
+        logger.warning("Failed to queue the maintenance job", exc_info=True)
+
+
+async def maintenance_cron(ctx: dict) -> None:
+    """Daily trigger; the job itself runs like any enqueued copy."""
+    await request_maintenance(ctx["redis"])
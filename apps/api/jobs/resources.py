@@ -0,0 +1,64 @@
+"""Worker-wide shared resources, created once at startup and passed via ``ctx``.
+
+``ctx`` keys set here:
+    http             -- pooled ``httpx.AsyncClient`` for outbound HTTP (GitHub)
+    llm              -- ``LLMGateway`` handing out pooled OpenAI-compatible clients
+    session_factory  -- the process-wide async session factory (one engine)
+    limiter          -- per-job-type ``JobLimiter``
+Arq itself provides ``ctx["redis"]``, which is also adopted as the shared
+Redis pool for job events.
+"""
+
+import httpx
+from openai import AsyncOpenAI
+
+from apps.api.jobs.limits import JobLimiter
+from packages.common.db.session import async_session_factory, engine
+from packages.common.redis import use_arq_redis
+
+_LLM_TIMEOUT = 120.0
+
+
+class LLMGateway:
+    """One client per (api_key, base_url), all sharing one connection pool."""
+
+    def __init__(self) -> None:
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(_LLM_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+        self._clients: dict[tuple[str, str | None], AsyncOpenAI] = {}
+
+    def client(self, api_key: str, base_url: str | None = None) -> AsyncOpenAI:
+        key = (api_key, base_url)
+        if key not in self._clients:
+            self._clients[key] = AsyncOpenAI(
+                api_key=api_key, base_url=base_url,
+                timeout=_LLM_TIMEOUT, http_client=self._http,
+            )
+        return self._clients[key]
+
+    async def aclose(self) -> None:
+        self._clients.clear()
+        await self._http.aclose()
+
+
+async def open_resources(ctx: dict) -> None:
+    """Create the shared pools for this worker process."""
+    ctx["http"] = httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+    ctx["llm"] = LLMGateway()
+    ctx["session_factory"] = async_session_factory
+    ctx["limiter"] = JobLimiter()
+    use_arq_redis(ctx["redis"])
+
+
+async def close_resources(ctx: dict) -> None:
+    """Close everything ``open_resources`` created; Arq closes its own Redis."""
+    if "http" in ctx:
+        await ctx["http"].aclose()
+    if "llm" in ctx:
+        await ctx["llm"].aclose()
+    await engine.dispose()
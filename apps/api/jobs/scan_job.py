@@ -1,12 +1,17 @@
 """Arq job function for high-level repository scanning."""
 
+import asyncio
 import logging
 from uuid import UUID
 
+from sqlalchemy import delete, func, select
+
 from apps.api.jobs.context import JobContext
-from apps.api.services.artifact_extractor import ArtifactExtractor
+from apps.api.services.analysis_payloads import load_payload, store_payload
+from apps.api.services.isolated_extraction import run_isolated_extraction
 from apps.api.services.progress_matcher import ProgressMatcherService
 from apps.api.services.repo_clone_service import RepoCloneService
+from apps.api.services.scan_metrics import ScanMetrics
 from apps.api.services.task_service import TaskService
 
 logger = logging.getLogger(__name__)
@@ -29,13 +34,14 @@ def _serialize_task(task) -> dict:
 async def high_level_scan_job(ctx: dict, job_id_str: str) -> None:
     """High-level repo scan: clone, extract artifacts, AI-match to tasks."""
     job_id = UUID(job_id_str)
-    jctx = JobContext()
+    jctx = JobContext(ctx)
+    metrics = ScanMetrics()
     tmp_dir = None
 
     try:
         session = await jctx.get_session()
 
-        from apps.api.models.audit import RepositoryAnalysis, RepoScanHistory
+        from apps.api.models.audit import RepositoryAnalysis, RepoScanHistory, ScanTaskVerdict
         from apps.api.models.job import Job
         from apps.api.models.product import Product
 
@@ -45,37 +51,78 @@ async def high_level_scan_job(ctx: dict, job_id_str: str) -> None:
             return
 
         product_id = job.product_id
+        force = bool((job.input_data or {}).get("force"))
+        clone_svc = RepoCloneService(session, http=ctx.get("http"))
+
+        # 5% — Skip the pipeline if the branch HEAD has not moved
+        if not force:
+            await jctx.update_progress(job_id, 5, "Checking for new commits")
+            with metrics.stage("precheck"):
+                unchanged = await _reuse_if_unchanged(session, clone_svc, product_id)
+            if unchanged is not None:
+                logger.info("Job %s: HEAD unchanged for product %s, reusing last analysis", job_id, product_id)
+                unchanged["metrics"] = metrics.to_dict()
+                await jctx.mark_completed(job_id, result_data=unchanged)
+                return
 
         # 10% — Clone repo
         await jctx.update_progress(job_id, 10, "Cloning repository")
         logger.info("Job %s: starting clone for product %s", job_id, product_id)
-        clone_svc = RepoCloneService(session)
-        tmp_dir, commit_sha = await clone_svc.shallow_clone(product_id)
+        with metrics.stage("clone"):
+            tmp_dir, commit_sha = await clone_svc.shallow_clone(product_id)
+        # Walks the whole clone; kept off the event loop like extraction
+        await asyncio.to_thread(metrics.record_clone, tmp_dir)
+        metrics.counters.update(clone_svc.last_clone_report)
         logger.info("Job %s: clone complete, commit %s", job_id, commit_sha[:8])
 
         # 30% — Extract artifacts
         await jctx.update_progress(job_id, 30, "Extracting code artifacts")
-        extractor = ArtifactExtractor()
-        artifacts = extractor.extract(tmp_dir)
+        # In a memory-capped child process, waited on off the event loop so
+        # progress events and heartbeats keep flowing
+        with metrics.stage("extract"):
+            extraction = await asyncio.to_thread(run_isolated_extraction, tmp_dir)
+        artifacts = extraction.artifacts
+        metrics.counters.update(extraction.counters)
+        metrics.warnings.extend(extraction.warnings)
+        metrics.record_artifacts(artifacts)
+        if extraction.failed:
+            # Matching against no artifacts would store a 0% analysis as
+            # the product's latest and have later scans reuse it
+            raise RuntimeError(f"Code extraction failed: {'; '.join(extraction.warnings)}")
 
         # 50% — Fetch tasks
         await jctx.update_progress(job_id, 50, "Loading project tasks")
         task_svc = TaskService(session)
-        tasks_result = await task_svc.list_tasks(
-            product_id=product_id, page_size=500, task_type="task",
-        )
+        with metrics.stage("load_tasks"):
+            tasks_result = await task_svc.list_tasks(
+                product_id=product_id, page_size=500, task_type="task",
+            )
         task_dicts = [_serialize_task(t) for t in tasks_result["data"]]
 
-        # 70% — AI matching
+        # 70% — AI matching; verdicts are committed as they stream in, and a
+        # retry of this job at the same commit only matches the rest
         await jctx.update_progress(job_id, 70, "Analyzing progress with AI")
-        matcher = ProgressMatcherService(session)
-        result = await matcher.match(task_dicts, artifacts)
+        known = await _load_verdicts(session, job_id, commit_sha)
+        recorder = _VerdictRecorder(jctx, session, job_id, commit_sha, len(task_dicts), len(known))
+        matcher = ProgressMatcherService(session, llm=ctx.get("llm"), on_verdict=recorder)
+        with metrics.stage("match"):
+            result = await matcher.match(task_dicts, artifacts, known=known)
+        metrics.record_llm_batches(matcher.batch_stats)
+        metrics.counters["verdicts_reused"] = len(known)
 
         # 85% — Store results
         await jctx.update_progress(job_id, 85, "Saving scan results")
-        await _save_scan_results(
-            session, product_id, commit_sha, artifacts, result,
-        )
+        with metrics.stage("save"):
+            scan_history = await _save_scan_results(
+                session, product_id, commit_sha, artifacts, result, partial=extraction.partial,
+            )
+            # The analysis now holds every verdict
+            await session.execute(delete(ScanTaskVerdict).where(ScanTaskVerdict.job_id == job_id))
+            await session.commit()
+        # Stored once the save stage is closed, so the history row has it and the total
+        result["metrics"] = metrics.to_dict()
+        result["partial"] = extraction.partial
+        scan_history.stage_metrics = result["metrics"]
         await session.commit()
 
         # 100% — Done
@@ -83,6 +130,7 @@ async def high_level_scan_job(ctx: dict, job_id_str: str) -> None:
 
     except Exception as exc:
         logger.exception("Scan job %s failed: %s", job_id, exc)
+        await _discard_verdicts(jctx, job_id)
         await jctx.mark_failed(job_id, str(exc)[:500])
     finally:
         if tmp_dir:
@@ -90,11 +138,131 @@ async def high_level_scan_job(ctx: dict, job_id_str: str) -> None:
         await jctx.close()
 
 
+class _VerdictRecorder:
+    """Commits each streamed task verdict and advances progress from 70% to 85%."""
+
+    def __init__(
+        self, jctx: JobContext, session, job_id: UUID, commit_sha: str,
+        total: int, done: int,
+    ) -> None:
+        self.jctx = jctx
+        self.session = session
+        self.job_id = job_id
+        self.commit_sha = commit_sha
+        self.total = total
+        self.done = done
+        # Batches stream concurrently but share one session
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, evidence: dict) -> None:
+        from apps.api.models.audit import ScanTaskVerdict
+
+        async with self._lock:
+            self.session.add(ScanTaskVerdict(
+                job_id=self.job_id,
+                task_id=str(evidence["task_id"]),
+                commit_sha=self.commit_sha,
+                evidence=evidence,
+            ))
+            try:
+                await self.session.commit()
+            except Exception:
+                # Losing the checkpoint only costs a re-match on retry
+                logger.warning("Failed to store verdict for job %s", self.job_id, exc_info=True)
+                await self.session.rollback()
+            self.done += 1
+            progress = 70 + 15 * self.done // max(self.total, 1)
+            await self.jctx.update_progress(self.job_id, progress, "Analyzing progress with AI")
+
+
+async def _discard_verdicts(jctx: JobContext, job_id: UUID) -> None:
+    """Drop a failed job's checkpointed verdicts.
+
+    Failures caught here are final: Arq only re-runs the job after a worker
+    crash or timeout, which never reach this path.
+    """
+    from apps.api.models.audit import ScanTaskVerdict
+
+    session = await jctx.get_session()
+    try:
+        await session.rollback()
+        await session.execute(delete(ScanTaskVerdict).where(ScanTaskVerdict.job_id == job_id))
+        await session.commit()
+    except Exception:
+        logger.warning("Failed to discard verdicts of job %s", job_id, exc_info=True)
+
+
+async def _load_verdicts(session, job_id: UUID, commit_sha: str) -> dict[str, dict]:
+    """Verdicts stored by an earlier, interrupted run of this job at ``commit_sha``."""
+    from apps.api.models.audit import ScanTaskVerdict
+
+    await session.execute(delete(ScanTaskVerdict).where(
+        ScanTaskVerdict.job_id == job_id, ScanTaskVerdict.commit_sha != commit_sha,
+    ))
+    rows = (await session.execute(
+        select(ScanTaskVerdict.task_id, ScanTaskVerdict.evidence)
+        .where(ScanTaskVerdict.job_id == job_id)
+    )).all()
+    await session.commit()
+    return {task_id: evidence for task_id, evidence in rows}
+
+
+async def _reuse_if_unchanged(
+    session, clone_svc: RepoCloneService, product_id: UUID,
+) -> dict | None:
+    """Return the latest analysis as a job result if the remote HEAD is unchanged."""
+    from apps.api.models.audit import RepositoryAnalysis, RepoScanHistory
+    from apps.api.models.product import Product
+
+    remote_sha = await clone_svc.resolve_remote_head(product_id)
+    if not remote_sha:
+        return None
+
+    last_scan = (await session.execute(
+        select(RepoScanHistory)
+        .where(
+            RepoScanHistory.product_id == product_id,
+            # Partial scans are never reused; the next one extracts again
+            RepoScanHistory.scan_status == "completed",
+        )
+        .order_by(RepoScanHistory.created_at.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+    product = await session.get(Product, product_id)
+    branch = product.tracked_branch or "main"
+    if (
+        last_scan is None
+        or last_scan.latest_commit_sha != remote_sha
+        or last_scan.branch != branch
+    ):
+        return None
+
+    if product.latest_analysis_id is None:
+        return None
+    analysis = await session.get(RepositoryAnalysis, product.latest_analysis_id)
+    if analysis is None:
+        return None
+
+    return {
+        "scan_summary": analysis.gap_analysis or {},
+        "task_evidence": await load_payload(session, analysis.functional_inventory_sha) or [],
+        "unchanged": True,
+        "commit_sha": remote_sha,
+        "analysis_id": str(analysis.id),
+    }
+
+
 async def _save_scan_results(
-    session, product_id: UUID, commit_sha: str,
-    artifacts: dict, result: dict,
-) -> None:
-    """Persist scan results to RepositoryAnalysis, RepoScanHistory, Product."""
+    session, product_id: UUID, commit_sha: str, artifacts: dict, result: dict,
+    partial: bool = False,
+) -> "RepoScanHistory":
+    """Persist scan results to RepositoryAnalysis, RepoScanHistory, Product.
+
+    A ``partial`` scan (some artifact categories missing) is recorded with
+    that status but does not become the product's latest analysis or
+    progress, and is never reused for an unchanged HEAD. Returns the history
+    row; the caller fills in its ``stage_metrics``.
+    """
     from apps.api.models.audit import RepositoryAnalysis, RepoScanHistory
     from apps.api.models.product import Product
 
@@ -102,17 +270,28 @@ async def _save_scan_results(
     repo_url = product.repository_url or ""
     branch = product.tracked_branch or "main"
 
-    # Save RepositoryAnalysis
+    summary = result.get("scan_summary", {})
+    progress_pct = summary.get("progress_pct", 0.0)
+
+    # Save RepositoryAnalysis; large payloads go to deduplicated storage
     analysis = RepositoryAnalysis(
         product_id=product_id,
         repository_url=repo_url,
         branch=branch,
+        commit_sha=commit_sha,
         file_count=len(artifacts.get("file_tree", [])),
-        structure_map={"file_tree": artifacts.get("file_tree", [])},
-        functional_inventory=result.get("task_evidence", []),
-        gap_analysis=result.get("scan_summary", {}),
+        progress_pct=progress_pct,
+        structure_map_sha=await store_payload(
+            session, {"file_tree": artifacts.get("file_tree", [])},
+        ),
+        functional_inventory_sha=await store_payload(
+            session, result.get("task_evidence", []),
+        ),
+        gap_analysis=summary,
     )
     session.add(analysis)
+    # Flush so the analysis has its id before the product points at it
+    await session.flush()
 
     # Save RepoScanHistory
     scan_history = RepoScanHistory(
@@ -120,7 +299,7 @@ async def _save_scan_results(
         repository_url=repo_url,
         branch=branch,
         latest_commit_sha=commit_sha,
-        scan_status="completed",
+        scan_status="partial" if partial else "completed",
         files_changed=len(artifacts.get("file_tree", [])),
         components_discovered={
             "routes": len(artifacts.get("routes", [])),
@@ -132,10 +311,13 @@ async def _save_scan_results(
     )
     session.add(scan_history)
 
-    # Update Product progress
-    summary = result.get("scan_summary", {})
-    progress_pct = summary.get("progress_pct", 0.0)
-    if product:
+    # Update Product progress and its pointer to the latest scan
+    if product and not partial:
         product.progress = progress_pct
+        product.latest_analysis_id = analysis.id
+        # now() is the transaction start, so this equals analysis.created_at
+        product.last_scan_at = func.now()
+        product.last_scan_progress = progress_pct
 
     await session.flush()
+    return scan_history
@@ -0,0 +1,88 @@
+"""Worker throughput and queue latency per job type, kept in Redis.
+
+Each job records its queue latency (enqueue to start) when it starts and its
+run time and outcome when it finishes. Samples are capped lists and outcomes
+are per-minute counters that expire, so the keys stay small.
+"""
+
+import logging
+import time
+
+from arq.connections import ArqRedis
+from arq.constants import default_queue_name
+
+from apps.api.services.scan_metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+STATS_PREFIX = "mizan:worker-stats"
+THROUGHPUT_WINDOW_MINUTES = 15
+_MAX_SAMPLES = 500
+_COUNTER_TTL = (THROUGHPUT_WINDOW_MINUTES + 5) * 60
+
+
+def _key(function: str, suffix: str) -> str:
+    return f"{STATS_PREFIX}:{function}:{suffix}"
+
+
+async def record_start(redis: ArqRedis, function: str, queue_latency_ms: float) -> None:
+    """Record how long a job waited in the queue. Never raises."""
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.lpush(_key(function, "queue_ms"), round(queue_latency_ms))
+            pipe.ltrim(_key(function, "queue_ms"), 0, _MAX_SAMPLES - 1)
+            await pipe.execute()
+    except Exception:
+        logger.debug("Failed to record start of %s", function, exc_info=True)
+
+
+async def record_finish(redis: ArqRedis, function: str, run_ms: float, ok: bool) -> None:
+    """Record a job's run time and outcome. Never raises."""
+    minute = int(time.time() // 60)
+    counter = _key(function, f"{'done' if ok else 'failed'}:{minute}")
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.lpush(_key(function, "run_ms"), round(run_ms))
+            pipe.ltrim(_key(function, "run_ms"), 0, _MAX_SAMPLES - 1)
+            pipe.incr(counter)
+            pipe.expire(counter, _COUNTER_TTL)
+            await pipe.execute()
+    except Exception:
+        logger.debug("Failed to record finish of %s", function, exc_info=True)
+
+
+def _percentiles(values: list[float]) -> dict:
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+    }
+
+
+async def load_worker_stats(redis: ArqRedis, functions: list[str]) -> dict:
+    """Queue depth plus per-function latency percentiles and recent throughput."""
+    now_minute = int(time.time() // 60)
+    minutes = range(now_minute - THROUGHPUT_WINDOW_MINUTES + 1, now_minute + 1)
+
+    job_types = []
+    for function in functions:
+        queue_ms = [float(v) for v in await redis.lrange(_key(function, "queue_ms"), 0, -1)]
+        run_ms = [float(v) for v in await redis.lrange(_key(function, "run_ms"), 0, -1)]
+        done = await redis.mget([_key(function, f"done:{m}") for m in minutes])
+        failed = await redis.mget([_key(function, f"failed:{m}") for m in minutes])
+        completed = sum(int(v) for v in done if v)
+        job_types.append({
+            "function": function,
+            "completed": completed,
+            "failed": sum(int(v) for v in failed if v),
+            "throughput_per_min": round(completed / THROUGHPUT_WINDOW_MINUTES, 2),
+            "queue_latency_ms": _percentiles(queue_ms),
+            "run_ms": _percentiles(run_ms),
+        })
+
+    return {
+        "queue_depth": await redis.zcard(default_queue_name),
+        "window_minutes": THROUGHPUT_WINDOW_MINUTES,
+        "job_types": job_types,
+    }
@@ -1,15 +1,50 @@
 """Arq worker settings — registers job functions and Redis config."""
 
+from arq import cron
+from prometheus_client import start_http_server
+
+from apps.api.config import settings
+from apps.api.jobs.chat_summary_job import summarize_chat_history_job
+from apps.api.jobs.limits import limited_func
+from apps.api.jobs.maintenance_job import (
+    MAINTENANCE_DEDUP_SECONDS,
+    maintenance_cron,
+    maintenance_job,
+)
+from apps.api.jobs.resources import close_resources, open_resources
 from apps.api.jobs.scan_job import high_level_scan_job
+from apps.api.observability import metrics, tracing
 from packages.common.redis.client import parse_redis_settings
 
 
+async def startup(ctx: dict) -> None:
+    """Create worker-wide resources shared by every job through ``ctx``."""
+    await open_resources(ctx)
+    metrics.instrument_httpx()
+    tracing.configure_tracing("mizan-worker")
+    if settings.worker_metrics_port:
+        start_http_server(settings.worker_metrics_port)
+
+
+async def shutdown(ctx: dict) -> None:
+    """Release worker-wide resources."""
+    await close_resources(ctx)
+    tracing.shutdown_tracing()
+
+
 class WorkerSettings:
     """Arq worker configuration."""
 
-    functions = [high_level_scan_job]
+    functions = [
+        limited_func(high_level_scan_job),
+        limited_func(summarize_chat_history_job, timeout=120, keep_result=0),
+        limited_func(maintenance_job, timeout=300, keep_result=MAINTENANCE_DEDUP_SECONDS),
+    ]
+    cron_jobs = [cron(maintenance_cron, hour=3, minute=30)]
     redis_settings = parse_redis_settings()
-    max_jobs = 5
+    max_jobs = settings.worker_max_jobs
     job_timeout = 900  # 15 minutes
     max_tries = 2
     health_check_interval = 30
+    on_startup = startup
+    on_shutdown = shutdown
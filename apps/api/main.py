@@ -1,5 +1,6 @@
 """Mizan Flow API - FastAPI Application Entry Point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 
@@ -7,13 +8,18 @@ from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from apps.api.config import settings
+from apps.api.jobs.maintenance_job import request_maintenance
 from apps.api.middleware.logging import LoggingMiddleware
+from apps.api.middleware.metrics import MetricsMiddleware
+from apps.api.middleware.profiling import ProfilingMiddleware
 from apps.api.middleware.security_headers import SecurityHeadersMiddleware
+from apps.api.middleware.tracing import TracingMiddleware
+from apps.api.observability import metrics, tracing
 from apps.api.routers import (
     api_keys,
     auth,
@@ -45,6 +51,7 @@ from apps.api.routers import (
 )
 from apps.api.routers import jobs
 from apps.api.routers import reports
+from apps.api.routers import profiles
 from apps.api.routers import (
     external_documents,
     document_folders,
@@ -58,6 +65,7 @@ from apps.api.routers import (
     project_checklists,
     milestones,
 )
+from packages.common.db.session import engine
 
 
 @asynccontextmanager
@@ -68,16 +76,18 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     if not settings.credential_encryption_key:
         raise RuntimeError("CREDENTIAL_ENCRYPTION_KEY must be set via environment variable")
 
-    # Seed standard checklist templates if they don't exist
-    from apps.api.services.seed_checklists import run_checklist_seeds
-    await run_checklist_seeds()
+    metrics.instrument_httpx()
+    tracing.configure_tracing("mizan-api")
 
-    # Delete archived products past 30-day retention
-    from apps.api.services.archive_cleanup import run_archive_cleanup
-    await run_archive_cleanup()
+    # Checklist seeding and archive cleanup run in the worker; queueing the
+    # job must not hold up serving, even while Redis is unreachable
+    maintenance = asyncio.create_task(request_maintenance())
 
     yield
 
+    maintenance.cancel()
+    tracing.shutdown_tracing()
+
 
 _is_production = settings.environment == "production"
 
@@ -92,14 +102,19 @@ app = FastAPI(
 )
 
 # Middleware stack (order matters - last added runs first)
+app.add_middleware(ProfilingMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(MetricsMiddleware, query_headers=not _is_production)
+if tracing.enabled():
+    app.add_middleware(TracingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "Accept", "X-API-Key"],
+    allow_headers=["Authorization", "Content-Type", "Accept", "X-API-Key", "X-Profile"],
+    expose_headers=["X-Profile-Id", "X-Trace-Id"],
 )
 
 def _cors_headers(request: Request) -> dict[str, str]:
@@ -180,6 +195,7 @@ app.include_router(project_checklists.router, prefix="/project-checklists", tags
 app.include_router(milestones.router, prefix="/products", tags=["milestones"])
 app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 app.include_router(reports.router, prefix="/reports", tags=["reports"])
+app.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
 
 
 # Mount static files for uploaded avatars
@@ -192,3 +208,20 @@ app.mount("/uploads", StaticFiles(directory=str(_uploads_dir)), name="uploads")
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request) -> Response:
+    """Prometheus scrape endpoint; requires the bearer token when one is set.
+
+    Production never serves it without a token, like the API docs.
+    """
+    if _is_production and not settings.metrics_token:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    if settings.metrics_token and (
+        request.headers.get("authorization") != f"Bearer {settings.metrics_token}"
+    ):
+        return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+    await metrics.sample_gauges(engine)
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
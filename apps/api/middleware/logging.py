@@ -2,28 +2,40 @@
 
 import time
 import logging
-from collections.abc import Callable
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger("mizan.api")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Log request method, path, status code, and duration."""
+class LoggingMiddleware:
+    """Log request method, path, status code, and duration.
+
+    Pure ASGI: the duration is measured to the start of the response, and
+    streamed bodies pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
         start = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = (time.perf_counter() - start) * 1000
-
-        logger.info(
-            "%s %s → %d (%.1fms)",
-            request.method,
-            request.url.path,
-            response.status_code,
-            duration_ms,
-        )
-        return response
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration_ms = (time.perf_counter() - start) * 1000
+                logger.info(
+                    "%s %s → %d (%.1fms)",
+                    scope["method"],
+                    URL(scope=scope).path,
+                    message["status"],
+                    duration_ms,
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,90 @@
+"""Request metrics middleware — latency and SQL statement counts per route."""
+
+import logging
+import time
+
+from starlette.datastructures import URL, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from apps.api.config import settings
+from apps.api.observability.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_QUERIES,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+from apps.api.observability.query_stats import QueryStats, track_queries
+
+logger = logging.getLogger("mizan.api.queries")
+
+# Label for requests no route matched, so unknown paths don't add series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, e.g. ``/products/{product_id}``."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _log_if_heavy(scope: Scope, queries: QueryStats) -> None:
+    repeated = queries.repeated(settings.query_repeat_threshold)
+    if (
+        queries.count < settings.query_count_log_threshold
+        and queries.duration_ms < settings.query_time_log_ms
+        and not repeated
+    ):
+        return
+    message = "%s %s ran %d SQL statements (%.1fms DB)"
+    args: list = [scope["method"], URL(scope=scope).path, queries.count, queries.duration_ms]
+    if repeated:
+        message += "; possible N+1, repeated with differing parameters: %s"
+        args.append("; ".join(
+            f"{count}x {' '.join(statement.split())[:120]}" for statement, count in repeated[:3]
+        ))
+    logger.warning(message, *args)
+
+
+class MetricsMiddleware:
+    """Record request duration and statement count under the route template.
+
+    Requests that run many statements, spend long in the database or repeat
+    one statement with differing parameters are logged. With
+    ``query_headers`` the statement count and DB time so far are added to
+    the response as ``X-DB-Query-Count`` and ``X-DB-Time-ms``.
+    """
+
+    def __init__(self, app: ASGIApp, query_headers: bool = False) -> None:
+        self.app = app
+        self.query_headers = query_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+        queries = QueryStats()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                if self.query_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(queries.count)
+                    headers["X-DB-Time-ms"] = f"{queries.duration_ms:.1f}"
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            with track_queries() as queries:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, status).observe(
+                time.perf_counter() - start
+            )
+            HTTP_REQUEST_QUERIES.labels(scope["method"], route).observe(queries.count)
+            _log_if_heavy(scope, queries)
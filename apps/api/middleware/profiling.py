@@ -0,0 +1,35 @@
+"""Opt-in request profiling middleware."""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from apps.api.middleware.metrics import route_template
+from apps.api.observability.profiling import PROFILE_ID_HEADER, profiled, should_profile_request
+
+
+class ProfilingMiddleware:
+    """Profile requests that ask for it (or are sampled) and return the profile id.
+
+    The profile covers the whole request, streamed body included, and is
+    named after the route template once routing has happened.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not should_profile_request(Headers(scope=scope)):
+            await self.app(scope, receive, send)
+            return
+
+        async with profiled("request", f"{scope['method']} {scope['path']}") as run:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message)[PROFILE_ID_HEADER] = run.id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                run.name = f"{scope['method']} {route_template(scope)}"
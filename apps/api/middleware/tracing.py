@@ -0,0 +1,55 @@
+"""Request tracing middleware — one server span per HTTP request."""
+
+from opentelemetry.propagate import extract
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from apps.api.middleware.metrics import route_template
+from apps.api.observability.tracing import current_trace_id, tracer
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+
+class TracingMiddleware:
+    """Open a server span per request, named after the route template.
+
+    Continues an incoming ``traceparent`` when there is one and returns the
+    trace id as ``X-Trace-Id`` so a slow response can be looked up.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        # Without an incoming traceparent, stay under any span already current
+        parent = extract(headers) if "traceparent" in headers else None
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+            trace_id = current_trace_id()
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                    if trace_id:
+                        MutableHeaders(scope=message)[TRACE_ID_HEADER] = trace_id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                span.set_attribute("http.route", route)
+                span.update_name(f"{scope['method']} {route}")
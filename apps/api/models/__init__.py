@@ -2,7 +2,13 @@
 
 from .ai import AIChatMessage, AIChatSession
 from .api_key import ApiKey
-from .audit import Audit, RepoScanHistory, RepositoryAnalysis
+from .audit import (
+    AnalysisPayload,
+    Audit,
+    RepoScanHistory,
+    RepositoryAnalysis,
+    ScanTaskVerdict,
+)
 from .deployment import DeploymentChecklistItem
 from .document import (
     DocumentAccessLink,
@@ -82,9 +88,11 @@ __all__ = [
     "AIChatSession",
     "AIChatMessage",
     # Audit
+    "AnalysisPayload",
     "Audit",
     "RepoScanHistory",
     "RepositoryAnalysis",
+    "ScanTaskVerdict",
     # Deployment
     "DeploymentChecklistItem",
     # Evaluation
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -18,10 +18,20 @@ class AIChatSession(Base, UUIDMixin, TimestampMixin):
     product_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True), ForeignKey("products.id"), nullable=True
     )
+    # Rolling summary of turns too old for the prompt's verbatim window,
+    # covering every message created up to summary_until
+    history_summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    summary_until: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
 
 class AIChatMessage(Base, UUIDMixin):
     __tablename__ = "ai_chat_messages"
+    # Serves keyset pagination and history reads, newest first
+    __table_args__ = (
+        Index("ix_ai_chat_messages_session_created_id", "session_id", "created_at", "id"),
+    )
 
     session_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("ai_chat_sessions.id"), nullable=False
@@ -4,7 +4,16 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -53,6 +62,23 @@ class RepoScanHistory(Base, UUIDMixin):
     components_discovered: Mapped[dict] = mapped_column(JSONB, default=list)
     diff_summary: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    stage_metrics: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class AnalysisPayload(Base):
+    """A zlib-compressed JSON document, keyed by the SHA-256 of its content.
+
+    Analyses with identical file trees or evidence share one row.
+    """
+
+    __tablename__ = "analysis_payloads"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -66,12 +92,18 @@ class RepositoryAnalysis(Base, UUIDMixin):
     )
     repository_url: Mapped[str] = mapped_column(String, nullable=False)
     branch: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    commit_sha: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     file_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    progress_pct: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     overall_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     tech_stack: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
-    structure_map: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
-    functional_inventory: Mapped[Optional[dict]] = mapped_column(
-        JSONB, nullable=True
+    # File tree and task evidence are stored in analysis_payloads
+    # (see services/analysis_payloads.py)
+    structure_map_sha: Mapped[Optional[str]] = mapped_column(
+        String(64), ForeignKey("analysis_payloads.sha256"), nullable=True
+    )
+    functional_inventory_sha: Mapped[Optional[str]] = mapped_column(
+        String(64), ForeignKey("analysis_payloads.sha256"), nullable=True
     )
     code_critique: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     standards_compliance: Mapped[Optional[dict]] = mapped_column(
@@ -81,3 +113,23 @@ class RepositoryAnalysis(Base, UUIDMixin):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+
+class ScanTaskVerdict(Base, UUIDMixin):
+    """One task's evidence from a scan job, stored as soon as the LLM emits it.
+
+    Lets a retried scan job skip tasks already matched at the same commit.
+    """
+
+    __tablename__ = "scan_task_verdicts"
+    __table_args__ = (UniqueConstraint("job_id", "task_id"),)
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False
+    )
+    task_id: Mapped[str] = mapped_column(String, nullable=False)
+    commit_sha: Mapped[str] = mapped_column(String, nullable=False)
+    evidence: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
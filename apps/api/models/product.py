@@ -46,6 +46,20 @@ class Product(Base, UUIDMixin, TimestampMixin):
     tasks_locked: Mapped[bool] = mapped_column(
         Boolean, server_default="false", nullable=False
     )
+    # Latest code progress scan, maintained by the scan job so readers can
+    # join once instead of looking up the newest analysis per product
+    latest_analysis_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "repository_analyses.id", ondelete="SET NULL",
+            use_alter=True, name="fk_products_latest_analysis_id",
+        ),
+        nullable=True,
+    )
+    last_scan_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_scan_progress: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     creator: Mapped[Optional["Profile"]] = relationship(
         "Profile", foreign_keys=[created_by], lazy="selectin"
@@ -0,0 +1,134 @@
+"""Prometheus metrics for the API and worker processes.
+
+Request latency and per-request query counts are recorded by
+``MetricsMiddleware``; connection-pool checkout time by the engine's pool;
+outbound HTTP latency by ``instrument_httpx``. Pool and queue gauges are
+sampled when ``/metrics`` is scraped. Each process keeps its own registry:
+the API serves it on ``/metrics``, the worker on ``worker_metrics_port``.
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+from arq.constants import default_queue_name
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "mizan_http_request_duration_seconds",
+    "HTTP request duration until the response body is sent, by route template.",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "mizan_http_requests_in_progress", "HTTP requests currently being served.",
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "mizan_http_request_db_queries",
+    "SQL statements executed per HTTP request, by route template.",
+    ["method", "route"],
+    buckets=_QUERY_BUCKETS,
+)
+
+DB_POOL_SIZE = Gauge("mizan_db_pool_size", "Configured connection pool size.")
+DB_POOL_CHECKED_OUT = Gauge("mizan_db_pool_checked_out", "Connections currently checked out.")
+DB_POOL_OVERFLOW = Gauge("mizan_db_pool_overflow", "Connections open beyond the pool size.")
+DB_POOL_CHECKOUT = Histogram(
+    "mizan_db_pool_checkout_seconds",
+    "Time to obtain a pooled connection, including waiting for a free one.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+
+REDIS_UP = Gauge("mizan_redis_up", "Whether Redis answered PING at the last scrape.")
+ARQ_QUEUE_DEPTH = Gauge("mizan_arq_queue_depth", "Jobs waiting in the Arq queue.")
+
+OUTBOUND_DURATION = Histogram(
+    "mizan_outbound_request_duration_seconds",
+    "Outbound HTTP time to response headers, by service.",
+    ["service", "method", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+OUTBOUND_ERRORS = Counter(
+    "mizan_outbound_request_errors_total",
+    "Outbound HTTP requests that failed without a response, by service.",
+    ["service", "error"],
+)
+
+_LLM_HOSTS = ("openrouter.ai", "api.openai.com", "api.anthropic.com")
+# A scrape must not hang on Redis connection retries
+_REDIS_SAMPLE_TIMEOUT = 2.0
+
+
+def observe_pool_checkout(seconds: float) -> None:
+    DB_POOL_CHECKOUT.observe(seconds)
+
+
+def outbound_service(host: str) -> str:
+    """Coarse label for an outbound host, keeping label cardinality fixed."""
+    if host == "github.com" or host.endswith((".github.com", ".githubusercontent.com")):
+        return "github"
+    if host.endswith(_LLM_HOSTS):
+        return "llm"
+    return "other"
+
+
+def instrument_httpx() -> None:
+    """Time every request sent through an httpx async transport.
+
+    Wraps ``AsyncHTTPTransport`` once per process, which covers clients the
+    code creates per call as well as the ones the OpenAI SDK creates.
+    Streamed responses are timed to their headers.
+    """
+    transport = httpx.AsyncHTTPTransport
+    if getattr(transport, "_mizan_instrumented", False):
+        return
+    original = transport.handle_async_request
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        service = outbound_service(request.url.host)
+        start = time.perf_counter()
+        try:
+            response = await original(self, request)
+        except Exception as exc:
+            OUTBOUND_ERRORS.labels(service, type(exc).__name__).inc()
+            OUTBOUND_DURATION.labels(service, request.method, "error").observe(time.perf_counter() - start)
+            raise
+        OUTBOUND_DURATION.labels(service, request.method, str(response.status_code)).observe(
+            time.perf_counter() - start
+        )
+        return response
+
+    transport.handle_async_request = handle_async_request
+    transport._mizan_instrumented = True
+
+
+async def sample_gauges(engine: AsyncEngine) -> None:
+    """Refresh pool and queue gauges. Never raises."""
+    pool = engine.pool
+    DB_POOL_SIZE.set(pool.size())
+    DB_POOL_CHECKED_OUT.set(pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    from packages.common.redis import get_arq_redis
+
+    try:
+        async with asyncio.timeout(_REDIS_SAMPLE_TIMEOUT):
+            redis = await get_arq_redis()
+            await redis.ping()
+            ARQ_QUEUE_DEPTH.set(await redis.zcard(default_queue_name))
+        REDIS_UP.set(1)
+    except Exception:
+        logger.debug("Redis unavailable while sampling metrics", exc_info=True)
+        REDIS_UP.set(0)
+
+
+def render() -> tuple[bytes, str]:
+    """The registry in Prometheus text format, with its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
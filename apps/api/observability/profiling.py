@@ -0,0 +1,138 @@
+"""Opt-in sampling profiles of single requests and jobs, kept in Redis.
+
+A request is profiled when it carries ``X-Profile: <profiling_token>`` or is
+picked by ``profile_sample_rate``; a job when its function is listed in
+``profile_jobs`` or is picked by the same rate. pyinstrument samples the
+request's or job's own async context only, so concurrent work on the event
+loop does not show up in its profile.
+
+Profiles are stored compressed in Redis, shared by the API and the worker,
+for ``profile_retention_hours``; admins list and render them through
+``/profiles``.
+"""
+
+import hmac
+import json
+import logging
+import random
+import time
+import uuid
+import zlib
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from arq.connections import ArqRedis
+
+from apps.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILES_KEY = "mizan:profiles"
+_MAX_PROFILES = 200
+
+
+def _profile_key(profile_id: str) -> str:
+    return f"{PROFILES_KEY}:{profile_id}"
+
+
+def _sampled() -> bool:
+    return settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate
+
+
+def should_profile_request(headers: Mapping[str, str]) -> bool:
+    """Whether to profile a request, from its ``X-Profile`` header or sampling."""
+    token = headers.get(PROFILE_HEADER)
+    if token and settings.profiling_token:
+        return hmac.compare_digest(token, settings.profiling_token)
+    return _sampled()
+
+
+def should_profile_job(function: str) -> bool:
+    return function in settings.profile_jobs or _sampled()
+
+
+@dataclass
+class ProfileRun:
+    """One profiled request or job; ``name`` may be refined while it runs."""
+
+    kind: str
+    name: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+@asynccontextmanager
+async def profiled(kind: str, name: str, redis: ArqRedis | None = None) -> AsyncIterator[ProfileRun]:
+    """Profile the block and store the result when it exits, even on error.
+
+    Storing never raises; without ``redis`` the API's shared pool is used.
+    """
+    from pyinstrument import Profiler
+
+    run = ProfileRun(kind=kind, name=name)
+    profiler = Profiler(interval=settings.profile_interval_ms / 1000, async_mode="enabled")
+    profiler.start()
+    try:
+        yield run
+    finally:
+        session = profiler.stop()
+        await _store(run, session, redis)
+
+
+async def _store(run: ProfileRun, session, redis: ArqRedis | None) -> None:
+    meta = {
+        "id": run.id,
+        "kind": run.kind,
+        "name": run.name,
+        "duration_ms": round(session.duration * 1000, 1),
+        "cpu_ms": round(session.cpu_time * 1000, 1),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    ttl = settings.profile_retention_hours * 3600
+    try:
+        if redis is None:
+            from packages.common.redis import get_arq_redis
+
+            redis = await get_arq_redis()
+        data = zlib.compress(json.dumps(session.to_json()).encode())
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(_profile_key(run.id), mapping={"meta": json.dumps(meta), "session": data})
+            pipe.expire(_profile_key(run.id), ttl)
+            pipe.zadd(PROFILES_KEY, {run.id: time.time()})
+            pipe.zremrangebyscore(PROFILES_KEY, 0, time.time() - ttl)
+            pipe.zremrangebyrank(PROFILES_KEY, 0, -_MAX_PROFILES - 1)
+            await pipe.execute()
+        logger.info("Stored profile %s of %s %s (%.0fms)", run.id, run.kind, run.name, meta["duration_ms"])
+    except Exception:
+        logger.warning("Failed to store profile of %s %s", run.kind, run.name, exc_info=True)
+
+
+async def list_profiles(redis: ArqRedis, limit: int = 50) -> list[dict]:
+    """Stored profile summaries, newest first."""
+    ids = await redis.zrevrange(PROFILES_KEY, 0, limit - 1)
+    profiles = []
+    for profile_id in ids:
+        meta = await redis.hget(_profile_key(_decode(profile_id)), "meta")
+        if meta:
+            profiles.append(json.loads(meta))
+    return profiles
+
+
+async def render_profile(redis: ArqRedis, profile_id: str, fmt: str) -> str | None:
+    """A stored profile as pyinstrument HTML or speedscope JSON; None if expired."""
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+    from pyinstrument.session import Session
+
+    data = await redis.hget(_profile_key(profile_id), "session")
+    if data is None:
+        return None
+    session = Session.from_json(json.loads(zlib.decompress(data)))
+    renderer = SpeedscopeRenderer() if fmt == "speedscope" else HTMLRenderer()
+    return renderer.render(session)
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,153 @@
+"""Per-request SQL statement counts and DB time, collected with engine events.
+
+``track_queries()`` opens a scope (one per HTTP request, set up by the
+metrics middleware); every statement executed on an instrumented engine
+inside it is counted and timed. SQLAlchemy runs async-engine events in
+greenlets that share the calling task's context, so a context variable is
+enough to attribute statements to the request that issued them. Scopes
+nest: a statement counts towards every enclosing scope, so
+``assert_max_queries`` around an in-process request sees the same
+statements as the middleware's own scope.
+
+The same statement text executed repeatedly with different parameters is
+the signature of an N+1 loop; ``QueryStats.repeated()`` reports those.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Distinct parameter sets remembered per statement; enough to tell a loop
+# from a statement re-run with the same arguments
+_MAX_DISTINCT_PARAMS = 32
+_STATEMENT_CHARS = 200
+
+
+@dataclass
+class StatementStats:
+    """Executions of one statement text within a scope."""
+
+    count: int = 0
+    params: set[int] = field(default_factory=set)
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within one ``track_queries()`` scope."""
+
+    count: int = 0
+    # Seconds spent between cursor execute and its return
+    duration: float = 0.0
+    statements: dict[str, StatementStats] = field(default_factory=dict)
+    parent: "QueryStats | None" = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least ``threshold`` times with differing parameters, most first."""
+        found = [
+            (statement, s.count)
+            for statement, s in self.statements.items()
+            if s.count >= threshold and len(s.params) > 1
+        ]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+    def describe(self, limit: int = 10) -> str:
+        """The most executed statements, one per line, for logs and assertion messages."""
+        busiest = sorted(self.statements.items(), key=lambda item: item[1].count, reverse=True)
+        return "\n".join(
+            f"  {s.count:>4}x  {' '.join(statement.split())[:_STATEMENT_CHARS]}"
+            for statement, s in busiest[:limit]
+        )
+
+    def _record(self, statement: str, params_key: int, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats()
+        stats.count += 1
+        if len(stats.params) < _MAX_DISTINCT_PARAMS:
+            stats.params.add(params_key)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count and time the statements executed until the block exits."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail with ``AssertionError`` if the block executes more than ``limit`` statements.
+
+    Usage::
+
+        with assert_max_queries(3):
+            await MilestoneService(session).list_milestones(product_id)
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(
+            f"{stats.count} SQL statements executed, expected at most {limit}:\n"
+            f"{stats.describe()}"
+        )
+
+
+def _params_key(parameters) -> int:
+    try:
+        return hash(repr(parameters))
+    except Exception:
+        return 0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_stats_start")
+    elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+    params_key = _params_key(parameters)
+    while stats is not None:
+        stats._record(statement, params_key, elapsed)
+        stats = stats.parent
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    starts = conn.info.get("query_stats_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def install(engine: Engine) -> None:
+    """Attach the counting hooks to a (sync) engine; idempotent."""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
@@ -0,0 +1,226 @@
+"""Distributed tracing with OpenTelemetry across the API, worker and their calls.
+
+Each HTTP request gets a server span (``TracingMiddleware``); jobs enqueued
+while it runs carry its W3C trace context in their kwargs and continue the
+trace in the worker (``enqueue_options`` / ``limited_func``). Within a
+request or job, spans are opened for SQL statements, outbound httpx
+requests, LLM calls and scan stages, so one trace shows where a scan or a
+report spent its time.
+
+``tracing_exporter`` selects where spans go: ``""`` (off — the API's no-op
+tracer, and no hooks installed), ``"otlp"`` (an OpenTelemetry collector at
+``tracing_otlp_endpoint``) or ``"file"`` (JSON lines in ``tracing_file``).
+"""
+
+import logging
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+
+import httpx
+from opentelemetry import trace
+from opentelemetry.propagate import extract, inject
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from apps.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("mizan")
+
+# Statement text recorded on SQL spans; parameters are never recorded
+_STATEMENT_CHARS = 2000
+_provider = None
+
+
+def enabled() -> bool:
+    return bool(settings.tracing_exporter)
+
+
+def configure_tracing(service_name: str) -> None:
+    """Install the tracer provider and exporter for this process; idempotent."""
+    global _provider
+    if _provider is not None or not enabled():
+        return
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    if settings.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        exporter = OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    elif settings.tracing_exporter == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        exporter = ConsoleSpanExporter(
+            out=open(settings.tracing_file, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    else:
+        logger.warning("Unknown TRACING_EXPORTER %r; tracing disabled", settings.tracing_exporter)
+        return
+
+    _provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": service_name,
+            "deployment.environment": settings.environment,
+        }),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+    instrument_httpx()
+    logger.info("Tracing enabled for %s (%s exporter)", service_name, settings.tracing_exporter)
+
+
+def shutdown_tracing() -> None:
+    """Flush buffered spans; call once when the process stops."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def current_trace_id() -> str | None:
+    ctx = trace.get_current_span().get_span_context()
+    return format(ctx.trace_id, "032x") if ctx.is_valid else None
+
+
+def _record_error(span: Span, exc: BaseException) -> None:
+    span.set_status(Status(StatusCode.ERROR, type(exc).__name__))
+    span.record_exception(exc)
+
+
+# ---------------------------------------------------------------------------
+# Propagation into Arq jobs
+# ---------------------------------------------------------------------------
+
+def inject_context() -> dict[str, str]:
+    """The current trace context as W3C headers, for a job's kwargs."""
+    carrier: dict[str, str] = {}
+    inject(carrier)
+    return carrier
+
+
+@contextmanager
+def job_span(function: str, carrier: Mapping[str, str] | None, job_id: str | None) -> Iterator[Span]:
+    """Span for one job run, continuing the trace of the request that enqueued it."""
+    with tracer.start_as_current_span(
+        f"job {function}",
+        context=extract(carrier) if carrier else None,
+        kind=SpanKind.CONSUMER,
+        attributes={"messaging.system": "arq", "messaging.message.id": job_id or ""},
+    ) as span:
+        yield span
+
+
+# ---------------------------------------------------------------------------
+# LLM calls
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def llm_span(operation: str, model: str) -> Iterator[Span]:
+    """Span for one LLM call; pass the response's ``usage`` to ``record_llm_usage``."""
+    with tracer.start_as_current_span(
+        f"llm {operation}",
+        kind=SpanKind.CLIENT,
+        attributes={"gen_ai.operation.name": operation, "gen_ai.request.model": model},
+    ) as span:
+        yield span
+
+
+def record_llm_usage(span: Span, usage) -> None:
+    if usage is None:
+        return
+    span.set_attribute("gen_ai.usage.input_tokens", getattr(usage, "prompt_tokens", None) or 0)
+    span.set_attribute("gen_ai.usage.output_tokens", getattr(usage, "completion_tokens", None) or 0)
+
+
+# ---------------------------------------------------------------------------
+# SQL statements
+# ---------------------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    span = tracer.start_span(
+        f"db {verb}",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.query.text": statement[:_STATEMENT_CHARS],
+        },
+    )
+    conn.info.setdefault("tracing_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    spans = conn.info.get("tracing_spans")
+    if spans:
+        spans.pop().end()
+
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    spans = conn.info.get("tracing_spans") if conn is not None else None
+    if spans:
+        span = spans.pop()
+        _record_error(span, exception_context.original_exception)
+        span.end()
+
+
+def install(engine: Engine) -> None:
+    """Attach SQL span hooks to a (sync) engine when tracing is on; idempotent."""
+    if not enabled():
+        return
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
+
+
+# ---------------------------------------------------------------------------
+# Outbound HTTP
+# ---------------------------------------------------------------------------
+
+def instrument_httpx() -> None:
+    """Open a client span around every request sent through an httpx async transport.
+
+    Spans end at the response headers, like the outbound latency metric, so
+    time spent reading a streamed body is not covered; streamed chat replies
+    (``AIService.stream_response``) get no ``llm_span`` either.
+    """
+    from apps.api.observability.metrics import outbound_service
+
+    transport = httpx.AsyncHTTPTransport
+    if getattr(transport, "_mizan_traced", False):
+        return
+    original = transport.handle_async_request
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with tracer.start_as_current_span(
+            f"HTTP {request.method}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "http.request.method": request.method,
+                "server.address": request.url.host,
+                "url.path": request.url.path,
+                "peer.service": outbound_service(request.url.host),
+            },
+            record_exception=False,
+        ) as span:
+            try:
+                response = await original(self, request)
+            except Exception as exc:
+                _record_error(span, exc)
+                raise
+            span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status(Status(StatusCode.ERROR))
+            return response
+
+    transport.handle_async_request = handle_async_request
+    transport._mizan_traced = True
@@ -2,12 +2,13 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
 
 from apps.api.dependencies import CurrentUser, DbSession
 from apps.api.schemas.ai import (
     ChatMessageCreate,
+    ChatMessagePage,
     ChatMessageResponse,
     ChatSessionCreate,
     ChatSessionResponse,
@@ -37,9 +38,16 @@ async def delete_session(session_id: UUID, user: CurrentUser, service: AIService
     await service.delete_session(session_id, user.id)
 
 
-@router.get("/chat/sessions/{session_id}/messages", response_model=list[ChatMessageResponse])
-async def list_messages(session_id: UUID, user: CurrentUser, service: AIService = Depends(get_service)):
-    return await service.get_messages(session_id, user.id)
+@router.get("/chat/sessions/{session_id}/messages", response_model=ChatMessagePage)
+async def list_messages(
+    session_id: UUID,
+    user: CurrentUser,
+    limit: int = Query(50, ge=1, le=200),
+    before: str | None = None,
+    service: AIService = Depends(get_service),
+):
+    """Newest page of messages; pass ``next_cursor`` as ``before`` for older ones."""
+    return await service.get_messages(session_id, user.id, limit=limit, before=before)
 
 
 @router.post("/chat/sessions/{session_id}/messages", response_model=ChatMessageResponse, status_code=201)
@@ -1,16 +1,25 @@
-"""Jobs router — read-only endpoints for job status polling."""
+"""Jobs router — read-only endpoints for job status polling and streaming."""
 
 from uuid import UUID
 
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 
 from apps.api.dependencies import CurrentUser, DbSession
-from apps.api.schemas.job import JobListResponse, JobResponse
+from apps.api.schemas.job import JobListResponse, JobResponse, WorkerStatsResponse
+from apps.api.services.job_events import stream_job_events
 from apps.api.services.job_service import JobService
 
 router = APIRouter()
 
 
+@router.get("/stats", response_model=WorkerStatsResponse)
+async def get_worker_stats(db: DbSession, user: CurrentUser):
+    """Worker throughput and queue latency per job type."""
+    service = JobService(db)
+    return await service.get_worker_stats()
+
+
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(job_id: UUID, db: DbSession, user: CurrentUser):
     """Get a single job by ID."""
@@ -18,6 +27,20 @@ async def get_job(job_id: UUID, db: DbSession, user: CurrentUser):
     return await service.get_or_404(job_id)
 
 
+@router.get("/{job_id}/events", response_class=StreamingResponse)
+async def stream_job(job_id: UUID, db: DbSession, user: CurrentUser):
+    """Stream job progress as SSE until the job completes or fails."""
+    service = JobService(db)
+    await service.get_or_404(job_id)
+    # Release the pooled connection; the stream reads its snapshot separately
+    await db.commit()
+    return StreamingResponse(
+        stream_job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("", response_model=JobListResponse)
 async def list_jobs(
     db: DbSession,
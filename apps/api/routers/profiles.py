@@ -0,0 +1,45 @@
+"""Profiles router — admin access to stored request and job profiles."""
+
+from typing import Literal
+
+from fastapi import APIRouter, Query
+from fastapi.responses import HTMLResponse, Response
+
+from apps.api.auth import require_admin
+from apps.api.dependencies import AuthenticatedUser
+from apps.api.observability.profiling import list_profiles, render_profile
+from apps.api.schemas.profile import ProfileListResponse
+from packages.common.redis import get_arq_redis
+from packages.common.utils.error_handlers import not_found
+
+router = APIRouter()
+
+
+@router.get("", response_model=ProfileListResponse)
+async def get_profiles(
+    user: AuthenticatedUser = require_admin(),
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Stored profiles, newest first."""
+    redis = await get_arq_redis()
+    return {"data": await list_profiles(redis, limit)}
+
+
+@router.get("/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    user: AuthenticatedUser = require_admin(),
+    format: Literal["html", "speedscope"] = "html",
+):
+    """A stored profile as an interactive HTML page or speedscope JSON."""
+    redis = await get_arq_redis()
+    rendered = await render_profile(redis, profile_id, format)
+    if rendered is None:
+        raise not_found("Profile")
+    if format == "speedscope":
+        return Response(
+            content=rendered,
+            media_type="application/json",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'},
+        )
+    return HTMLResponse(rendered)
@@ -13,8 +13,6 @@ from apps.api.schemas.reports import (
     ReportsSummaryResponse,
 )
 from apps.api.services.report_ai_service import ReportAIService
-from apps.api.services.report_document_service import ReportDocumentService
-from apps.api.services.report_pdf_service import ReportPDFService
 from apps.api.services.report_service import ReportService, _commit_cache
 
 
@@ -89,6 +87,9 @@ async def generate_document(
     db: DbSession,
 ):
     """Generate a downloadable .docx report for selected projects."""
+    # python-docx is only loaded when a document is requested
+    from apps.api.services.report_document_service import ReportDocumentService
+
     svc = ReportDocumentService(db)
     buf = await svc.generate(body.product_ids, report_type=body.report_type, task_statuses=body.task_statuses, include_bugs=body.include_bugs)
     filename = "Bug_Report" if body.report_type == "bugs" else "Custom_Report" if body.report_type == "custom" else "Project_Status_Update"
@@ -106,6 +107,9 @@ async def generate_pdf(
     db: DbSession,
 ):
     """Generate a downloadable PDF report for selected projects."""
+    # fpdf2 is only loaded when a PDF is requested
+    from apps.api.services.report_pdf_service import ReportPDFService
+
     svc = ReportPDFService(db)
     buf = await svc.generate(body.product_ids, report_type=body.report_type, task_statuses=body.task_statuses, include_bugs=body.include_bugs)
     filename = "Bug_Report" if body.report_type == "bugs" else "Custom_Report" if body.report_type == "custom" else "Project_Status_Update"
@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from apps.api.dependencies import CurrentUser, DbSession
 from apps.api.schemas.scans import (
@@ -10,6 +10,7 @@ from apps.api.schemas.scans import (
     ScanHistoryResponse,
     ScanResultResponse,
     ScanTriggerResponse,
+    StageMetricsResponse,
 )
 from apps.api.services.scan_service import ScanService
 
@@ -20,17 +21,32 @@ def _get_service(db: DbSession) -> ScanService:
     return ScanService(db)
 
 
+@router.get("/metrics/stages", response_model=StageMetricsResponse)
+async def get_stage_metrics(
+    product_id: UUID | None = None,
+    limit: int = Query(200, ge=1, le=1000),
+    user: CurrentUser = None,
+    service: ScanService = Depends(_get_service),
+) -> StageMetricsResponse:
+    """Per-stage scan timing percentiles across recent scans."""
+    return await service.get_stage_metrics(product_id, limit)
+
+
 @router.post(
     "/{product_id}/high-level",
     response_model=ScanTriggerResponse,
 )
 async def trigger_high_level_scan(
     product_id: UUID,
+    force: bool = False,
     user: CurrentUser = None,
     service: ScanService = Depends(_get_service),
 ) -> ScanTriggerResponse:
-    """Trigger a high-level progress scan for a product."""
-    job = await service.trigger_high_level_scan(product_id, str(user.id))
+    """Trigger a high-level progress scan for a product.
+
+    Pass ``force=true`` to rescan even if the branch HEAD has not moved.
+    """
+    job = await service.trigger_high_level_scan(product_id, str(user.id), force=force)
     return ScanTriggerResponse(
         id=job.id,
         job_type=job.job_type,
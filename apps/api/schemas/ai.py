@@ -44,3 +44,14 @@ class ChatMessageResponse(BaseSchema):
     role: str
     content: str
     created_at: datetime
+
+
+class ChatMessagePage(BaseSchema):
+    """A page of chat messages, oldest first.
+
+    ``next_cursor`` fetches the page of older messages before this one; it is
+    null when this page reaches the start of the conversation.
+    """
+
+    data: list[ChatMessageResponse]
+    next_cursor: str | None = None
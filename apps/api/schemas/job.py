@@ -38,3 +38,33 @@ class JobListResponse(PaginatedResponse):
     """Paginated job list."""
 
     data: list[JobResponse]
+
+
+class LatencyPercentiles(BaseSchema):
+    """Percentiles over recent samples, in milliseconds."""
+
+    count: int
+    p50: float | None = None
+    p90: float | None = None
+    p99: float | None = None
+
+
+class JobTypeStats(BaseSchema):
+    """Throughput and latency for one worker job function."""
+
+    function: str
+    max_concurrent: int
+    priority: int
+    completed: int
+    failed: int
+    throughput_per_min: float
+    queue_latency_ms: LatencyPercentiles
+    run_ms: LatencyPercentiles
+
+
+class WorkerStatsResponse(BaseSchema):
+    """Queue depth plus per-job-type stats over a recent window."""
+
+    queue_depth: int
+    window_minutes: int
+    job_types: list[JobTypeStats]
@@ -63,6 +63,9 @@ class ProductResponse(ProductBase):
     start_date: datetime | None = None
     end_date: datetime | None = None
     tasks_locked: bool = False
+    latest_analysis_id: UUID | None = None
+    last_scan_at: datetime | None = None
+    last_scan_progress: float | None = None
     task_count: int = 0
     bug_count: int = 0
     bugs_fixed_count: int = 0
@@ -0,0 +1,22 @@
+"""Schemas for stored request and job profiles."""
+
+from datetime import datetime
+
+from apps.api.schemas.base import BaseSchema
+
+
+class ProfileSummary(BaseSchema):
+    """One stored profile, without its samples."""
+
+    id: str
+    kind: str
+    name: str
+    duration_ms: float
+    cpu_ms: float
+    created_at: datetime
+
+
+class ProfileListResponse(BaseSchema):
+    """Stored profiles, newest first."""
+
+    data: list[ProfileSummary]
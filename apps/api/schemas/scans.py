@@ -46,7 +46,9 @@ class ScanResultResponse(BaseSchema):
     product_id: UUID
     repository_url: str
     branch: str | None = None
+    commit_sha: str | None = None
     file_count: int | None = None
+    progress_pct: float | None = None
     functional_inventory: list | dict | None = None
     gap_analysis: dict | None = None
     created_at: datetime
@@ -63,6 +65,7 @@ class ScanHistoryItem(BaseSchema):
     scan_status: str
     files_changed: int = 0
     components_discovered: dict | None = None
+    stage_metrics: dict | None = None
     created_at: datetime
 
 
@@ -81,3 +84,21 @@ class ProgressSummaryResponse(BaseSchema):
     commit_sha: str | None = None
     scan_summary: dict | None = None
     active_job_id: str | None = None
+
+
+class StagePercentiles(BaseSchema):
+    """Distribution of one scan stage timing or counter."""
+
+    count: int
+    mean: float
+    p50: float | None = None
+    p90: float | None = None
+    p99: float | None = None
+
+
+class StageMetricsResponse(BaseSchema):
+    """Per-stage percentiles aggregated across recent scans."""
+
+    product_id: str | None = None
+    scan_count: int
+    stages: dict[str, StagePercentiles]
@@ -0,0 +1,141 @@
+"""Measure connection-pool wait for other requests while chats are streaming.
+
+Runs ``--chats`` concurrent ``AIService.stream_response`` calls against the
+configured database with a fake LLM that streams for ``--stream-seconds``,
+while a probe loop times how long a plain ``SELECT 1`` waits for a pooled
+connection. ``held`` mode reproduces the old behaviour by keeping one
+connection checked out per chat for the whole stream; ``released`` is the
+service as it is.
+
+Usage:
+    python -m apps.api.scripts.bench_chat_pool
+    python -m apps.api.scripts.bench_chat_pool --chats 60 --stream-seconds 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+import openai
+from sqlalchemy import delete, select, text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+from apps.api.config import settings
+from apps.api.models.ai import AIChatMessage, AIChatSession
+from apps.api.services.ai_service import AIService
+from packages.common.db.session import async_session_factory, engine
+
+_USER_ID = "bench-chat-pool"
+
+
+class _FakeStream:
+    """Chat completion stream yielding ``chunks`` deltas over ``seconds``."""
+
+    def __init__(self, seconds: float, chunks: int = 20) -> None:
+        self._delay = seconds / chunks
+        self._left = chunks
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._left:
+            raise StopAsyncIteration
+        self._left -= 1
+        await asyncio.sleep(self._delay)
+        delta = SimpleNamespace(content="token ")
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _fake_client(seconds: float):
+    async def create(**kwargs):
+        return _FakeStream(seconds)
+
+    completions = SimpleNamespace(create=create)
+    return lambda **kwargs: SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+async def _chat(session_id, held: bool) -> None:
+    async with async_session_factory() as db:
+        stream = AIService(db).stream_response(session_id, "How is the project going?", _USER_ID)
+        if held:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                async for _ in stream:
+                    pass
+        else:
+            async for _ in stream:
+                pass
+        await db.commit()
+
+
+async def _probe(stop: asyncio.Event, waits: list[float], timeouts: list[int]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            async with engine.connect() as conn:
+                waits.append(time.perf_counter() - start)
+                await conn.execute(text("SELECT 1"))
+        except PoolTimeout:
+            timeouts.append(1)
+        await asyncio.sleep(0.05)
+
+
+async def _run(mode: str, chats: int, session_ids: list) -> None:
+    stop = asyncio.Event()
+    waits: list[float] = []
+    timeouts: list[int] = []
+    probe = asyncio.create_task(_probe(stop, waits, timeouts))
+    start = time.perf_counter()
+    await asyncio.gather(*(_chat(sid, mode == "held") for sid in session_ids[:chats]))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+
+    waits_ms = sorted(w * 1000 for w in waits) or [0.0]
+    p95 = waits_ms[min(len(waits_ms) - 1, int(len(waits_ms) * 0.95))]
+    print(
+        f"{mode:<10}{elapsed:>10.2f}{len(waits):>8}{statistics.median(waits_ms):>12.1f}"
+        f"{p95:>12.1f}{waits_ms[-1]:>12.1f}{len(timeouts):>10}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chats", type=int, default=40)
+    parser.add_argument("--stream-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    settings.openrouter_api_key = settings.openrouter_api_key or "bench"
+    openai.AsyncOpenAI = _fake_client(args.stream_seconds)
+
+    async with async_session_factory() as db:
+        sessions = [AIChatSession(user_id=_USER_ID) for _ in range(args.chats)]
+        db.add_all(sessions)
+        await db.commit()
+        session_ids = [s.id for s in sessions]
+
+    print(
+        f"{args.chats} chats streaming {args.stream_seconds:.0f}s each, "
+        f"pool size {engine.pool.size()}\n"
+    )
+    print(
+        f"{'mode':<10}{'seconds':>10}{'probes':>8}{'wait p50 ms':>12}"
+        f"{'p95 ms':>12}{'max ms':>12}{'timeouts':>10}"
+    )
+    try:
+        for mode in ("held", "released"):
+            await _run(mode, args.chats, session_ids)
+    finally:
+        async with async_session_factory() as db:
+            ids = select(AIChatSession.id).where(AIChatSession.user_id == _USER_ID)
+            await db.execute(delete(AIChatMessage).where(AIChatMessage.session_id.in_(ids)))
+            await db.execute(delete(AIChatSession).where(AIChatSession.user_id == _USER_ID))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""Compare a plain shallow clone with the sparse, blob-filtered scan clone.
+
+Builds a local repository mixing source files with large binaries (media,
+vendored bundles), serves it over ``file://`` so partial-clone filters apply,
+and reports time, downloaded pack size and checked-out files for both modes.
+
+Usage:
+    python -m apps.api.scripts.bench_clone
+    python -m apps.api.scripts.bench_clone --binaries 40 --binary-mb 5
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from apps.api.config import settings
+from apps.api.scripts.bench_extraction import build_repo
+from apps.api.services.repo_clone_service import RepoCloneService
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def build_source(root: Path, files: int, binaries: int, binary_mb: int) -> None:
+    """Create a committed repo with source files plus large binaries."""
+    build_repo(root, files)
+    for i in range(binaries):
+        for rel in (f"assets/video_{i}.mp4", f"public/vendor_{i}.min.js"):
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(os.urandom(binary_mb * 2**20))
+    _git(root, "init", "-q", "-b", "main")
+    _git(root, "add", "-A")
+    _git(root, "-c", "user.name=bench", "-c", "user.email=bench@local", "commit", "-qm", "bench")
+    _git(root, "config", "uploadpack.allowFilter", "true")
+
+
+def _checkout_files(repo_dir: Path) -> int:
+    return sum(
+        len(files) for dirpath, _, files in os.walk(repo_dir)
+        if ".git" not in Path(dirpath).relative_to(repo_dir).parts
+    )
+
+
+async def _clone(url: str, dest: Path, sparse: bool) -> tuple[float, dict[str, int], int]:
+    settings.clone_sparse = sparse
+    start = time.perf_counter()
+    skipped = await RepoCloneService._run_git_clone(url, "main", str(dest))
+    elapsed = time.perf_counter() - start
+    report = await RepoCloneService._size_report(str(dest), skipped)
+    return elapsed, report, _checkout_files(dest)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2_000)
+    parser.add_argument("--binaries", type=int, default=20)
+    parser.add_argument("--binary-mb", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="mizanos_bench_"))
+    try:
+        source = tmp / "source"
+        build_source(source, args.files, args.binaries, args.binary_mb)
+        url = f"file://{source}"
+        print(f"Source: {args.files} code files, {args.binaries * 2} binaries of {args.binary_mb} MiB\n")
+        print(f"{'mode':<10}{'seconds':>10}{'pack MiB':>12}{'files':>10}{'skipped':>10}")
+        for name, sparse in (("full", False), ("sparse", True)):
+            elapsed, report, files = await _clone(url, tmp / name, sparse)
+            print(
+                f"{name:<10}{elapsed:>10.2f}{report['pack_bytes'] / 2**20:>12.1f}"
+                f"{files:>10}{report['oversized_blobs']:>10}"
+            )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""Benchmark artifact extraction on a synthetic repository.
+
+Generates a multi-stack repo (FastAPI routers, SQLAlchemy models, Pydantic
+schemas, Express routes, React components) and times ArtifactExtractor
+inline versus with the shared parse pool, checking both produce identical
+output.
+
+Usage:
+    python -m apps.api.scripts.bench_extraction
+    python -m apps.api.scripts.bench_extraction --files 20000 --workers 8
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from apps.api.services.artifact_extractor import ArtifactExtractor
+
+_PY_ROUTER = '''"""Router {i}."""
+from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.get("/items-{i}/{{item_id}}")
+async def get_item_{i}(item_id: int):
+    """Fetch an item."""
+    return {{"id": item_id}}
+
+
+@router.post("/items-{i}")
+async def create_item_{i}(body: dict):
+    return body
+'''
+
+_PY_MODEL = '''"""Model {i}."""
+from sqlalchemy.orm import Mapped, mapped_column
+from pydantic import BaseModel
+
+
+class Widget{i}(Base):
+    """A widget."""
+
+    __tablename__ = "widgets_{i}"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column()
+
+    def describe(self):
+        return self.name
+
+
+class Widget{i}Schema(BaseModel):
+    id: int
+    name: str
+'''
+
+_TS_ROUTES = '''import express from "express";
+const router = express.Router();
+
+router.get("/things-{i}", listThings{i});
+router.post("/things-{i}", createThing{i});
+
+export function listThings{i}(req, res) {{ res.json([]); }}
+export async function createThing{i}(req, res) {{ res.json({{}}); }}
+'''
+
+_TSX_COMPONENT = '''export function Card{i}({{ title }}: {{ title: string }}) {{
+  return <div className="card">{{title}}</div>;
+}}
+'''
+
+_TEMPLATES = [
+    ("backend/routers/router_{i}.py", _PY_ROUTER),
+    ("backend/models/model_{i}.py", _PY_MODEL),
+    ("server/routes/routes_{i}.ts", _TS_ROUTES),
+    ("web/src/components/Card{i}.tsx", _TSX_COMPONENT),
+]
+
+
+def build_repo(root: Path, file_count: int) -> None:
+    """Write ``file_count`` synthetic source files under ``root``."""
+    for i in range(file_count):
+        rel, template = _TEMPLATES[i % len(_TEMPLATES)]
+        path = root / rel.format(i=i)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(template.format(i=i))
+
+
+def _timed(extractor: ArtifactExtractor, root: Path) -> tuple[float, dict]:
+    start = time.perf_counter()
+    artifacts = extractor.extract(str(root))
+    return time.perf_counter() - start, artifacts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=0, help="0 = one per CPU")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="mizanos_bench_"))
+    try:
+        build_repo(tmp, args.files)
+        print(f"Synthetic repo: {args.files} files in {tmp}")
+
+        inline_s, inline = _timed(ArtifactExtractor(), tmp)
+        print(f"inline:   {inline_s:7.2f}s")
+
+        with ProcessPoolExecutor(
+            max_workers=args.workers or None, mp_context=get_context("spawn"),
+        ) as pool:
+            ArtifactExtractor(executor=pool).extract(str(tmp))  # warm up workers
+            pooled_s, pooled = _timed(ArtifactExtractor(executor=pool), tmp)
+        print(f"pooled:   {pooled_s:7.2f}s  ({inline_s / pooled_s:.1f}x)")
+
+        assert inline == pooled, "pooled extraction differs from inline output"
+        counts = {k: len(v) for k, v in pooled.items() if isinstance(v, list)}
+        print(f"artifacts: {counts}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
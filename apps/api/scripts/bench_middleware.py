@@ -0,0 +1,136 @@
+"""Compare BaseHTTPMiddleware with the pure ASGI logging/security middleware.
+
+Builds a small Starlette app with a JSON endpoint and an SSE endpoint, wraps
+it in the two middleware as ``main.py`` does — either the previous
+``BaseHTTPMiddleware`` versions (reproduced below) or the current pure ASGI
+ones — and drives it in-process through the ASGI interface, so only the
+middleware differs. Reports JSON requests/sec and SSE time to first byte.
+
+Usage:
+    python -m apps.api.scripts.bench_middleware
+    python -m apps.api.scripts.bench_middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Callable
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from apps.api.middleware.logging import LoggingMiddleware
+from apps.api.middleware.security_headers import SECURITY_HEADERS, SecurityHeadersMiddleware
+
+logger = logging.getLogger("mizan.api")
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start = time.perf_counter()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            "%s %s → %d (%.1fms)",
+            request.method, request.url.path, response.status_code, duration_ms,
+        )
+        return response
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+
+async def _json(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+async def _sse(request: Request) -> StreamingResponse:
+    async def events():
+        for i in range(20):
+            yield f"data: {i}\n\n"
+            await asyncio.sleep(0)
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def build_app(legacy: bool) -> Starlette:
+    app = Starlette(routes=[Route("/json", _json), Route("/sse", _sse)])
+    if legacy:
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.add_middleware(LegacyLoggingMiddleware)
+    else:
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(LoggingMiddleware)
+    return app
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+
+async def _request(app: Starlette, path: str) -> float:
+    """Run one request; return seconds until the first non-empty body chunk."""
+    start = time.perf_counter()
+    first_byte: float | None = None
+    sent = False
+
+    async def receive() -> dict:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # no disconnect until the response ends
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal first_byte
+        if message["type"] == "http.response.body" and message.get("body") and first_byte is None:
+            first_byte = time.perf_counter() - start
+
+    await app(_scope(path), receive, send)
+    return first_byte or 0.0
+
+
+async def _measure(app: Starlette, requests: int, sse_requests: int) -> tuple[float, float, float]:
+    for _ in range(100):  # warm up routing and middleware stack
+        await _request(app, "/json")
+    start = time.perf_counter()
+    for _ in range(requests):
+        await _request(app, "/json")
+    rps = requests / (time.perf_counter() - start)
+    ttfb = sorted([await _request(app, "/sse") for _ in range(sse_requests)])
+    return rps, statistics.median(ttfb) * 1e6, ttfb[int(len(ttfb) * 0.95)] * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--sse-requests", type=int, default=1_000)
+    args = parser.parse_args()
+    # Build every log record as in production, but print nothing
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    print(f"{'middleware':<12}{'json req/s':>12}{'sse ttfb p50 µs':>18}{'p95 µs':>10}")
+    for name, legacy in (("base_http", True), ("pure_asgi", False)):
+        rps, p50, p95 = await _measure(build_app(legacy), args.requests, args.sse_requests)
+        print(f"{name:<12}{rps:>12.0f}{p50:>18.0f}{p95:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,217 @@
+"""Micro-benchmark pattern families: per-pattern runners vs merged registry.
+
+For each family (routes, models, schemas, and all three together) times the
+per-pattern runners the extractor used before the registry (kept here as the
+baseline), which compile per call and re-read every file per pattern,
+against ``run_registry``, which scans each file once per glob group.
+Both run inline so the numbers isolate the scanning strategy; the registry
+is built without ``ast`` keys here so both sides must agree exactly.
+
+A final row times the Python patterns as a regex scan versus the ``ast``
+pass the extractor uses, and reports how many hits each finds.
+
+Usage:
+    python -m apps.api.scripts.bench_patterns
+    python -m apps.api.scripts.bench_patterns --files 5000 --repeat 5
+    python -m apps.api.scripts.bench_patterns --repo /path/to/checkout
+"""
+
+import argparse
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from apps.api.scripts.bench_extraction import build_repo
+from apps.api.services.extraction.function_patterns import FUNCTION_PATTERNS
+from apps.api.services.extraction.model_patterns import MODEL_PATTERNS
+from apps.api.services.extraction.pattern_registry import build_registry, run_registry
+from apps.api.services.extraction.pattern_runner import (
+    extract_docstring,
+    extract_field_with_types,
+    extract_method_names,
+    find_block_end,
+    iter_files,
+    safe_read,
+)
+from apps.api.services.extraction.route_patterns import ROUTE_PATTERNS
+from apps.api.services.extraction.schema_patterns import SCHEMA_PATTERNS
+
+_FAMILIES: dict[str, tuple[list[dict], str]] = {
+    "routes": (ROUTE_PATTERNS, "regex"),
+    "models": (MODEL_PATTERNS, "class"),
+    "schemas": (SCHEMA_PATTERNS, "class"),
+}
+
+
+def _regex_only(families: dict[str, tuple[list[dict], str]]) -> dict[str, tuple[list[dict], str]]:
+    return {
+        name: ([{k: v for k, v in spec.items() if k != "ast"} for spec in specs], kind)
+        for name, (specs, kind) in families.items()
+    }
+
+
+def _python_only(families: dict[str, tuple[list[dict], str]]) -> dict[str, tuple[list[dict], str]]:
+    return {
+        name: ([spec for spec in specs if spec.get("ast")], kind)
+        for name, (specs, kind) in families.items()
+    }
+
+
+# --- Per-pattern runners (the "before" side) ---
+
+
+def _run_regex_patterns(root: Path, patterns: list[dict]) -> list[dict]:
+    results: list[dict] = []
+    for pat in patterns:
+        files = [str(f.relative_to(root)) for f in iter_files(root, pat["file_glob"])]
+        results.extend(_regex_chunk(str(root), files, pat))
+    return results
+
+
+def _run_class_patterns(root: Path, patterns: list[dict]) -> list[dict]:
+    results: list[dict] = []
+    for pat in patterns:
+        files = [str(f.relative_to(root)) for f in iter_files(root, pat["file_glob"])]
+        results.extend(_class_chunk(str(root), files, pat))
+    return results
+
+
+def _regex_chunk(root: str, rel_paths: list[str], pat: dict) -> list[dict]:
+    compiled = re.compile(pat["regex"], re.MULTILINE)
+    handler_re = re.compile(pat["handler_lookahead"], re.MULTILINE) if pat.get("handler_lookahead") else None
+    base = Path(root)
+    results: list[dict] = []
+    for rel in rel_paths:
+        text = safe_read(base / rel)
+        if text is None:
+            continue
+        for match in compiled.finditer(text):
+            entry = {"file": rel}
+            for key, group_idx in pat.get("group_map", {}).items():
+                try:
+                    entry[key] = match.group(group_idx)
+                except IndexError:
+                    pass
+            # Look ahead for handler name
+            if handler_re:
+                after = text[match.end():match.end() + 300]
+                hm = handler_re.search(after)
+                if hm:
+                    entry["handler"] = hm.group(1)
+            results.append(entry)
+    return results
+
+
+def _class_chunk(root: str, rel_paths: list[str], pat: dict) -> list[dict]:
+    class_re = re.compile(pat["class_regex"], re.MULTILINE)
+    field_re = (
+        re.compile(pat["field_regex"], re.MULTILINE)
+        if pat.get("field_regex")
+        else None
+    )
+    type_re = pat.get("field_type_regex")
+    base = Path(root)
+    results: list[dict] = []
+    for rel in rel_paths:
+        text = safe_read(base / rel)
+        if text is None:
+            continue
+        for match in class_re.finditer(text):
+            name = match.group(1)
+            block_end = find_block_end(text, match.end())
+            block = text[match.end():block_end]
+
+            fields: list[str] = []
+            if field_re:
+                fields = [m.group(1) for m in field_re.finditer(block)][:20]
+
+            field_types = extract_field_with_types(block, field_re, type_re)
+            docstring = extract_docstring(block)
+            methods = extract_method_names(block)
+
+            results.append({
+                "name": name,
+                "fields": fields,
+                "field_types": field_types,
+                "docstring": docstring,
+                "methods": methods,
+                "file": rel,
+            })
+    return results
+
+
+def _hit_count(results: dict[str, list[dict]]) -> int:
+    return sum(len(v) for v in results.values())
+
+
+def _per_pattern(root: Path, families: dict[str, tuple[list[dict], str]]) -> dict[str, list[dict]]:
+    return {
+        name: _run_regex_patterns(root, specs) if kind == "regex" else _run_class_patterns(root, specs)
+        for name, (specs, kind) in families.items()
+    }
+
+
+def _best_of(repeat: int, fn) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _source_files(root: Path) -> int:
+    return sum(1 for p in root.rglob("*") if p.is_file())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--repo", type=Path, help="benchmark an existing checkout instead")
+    args = parser.parse_args()
+
+    tmp: Path | None = None
+    root = args.repo
+    if root is None:
+        tmp = Path(tempfile.mkdtemp(prefix="mizanos_bench_"))
+        build_repo(tmp, args.files)
+        root = tmp
+
+    try:
+        file_count = _source_files(root)
+        print(f"Repo: {root} ({file_count} files), best of {args.repeat}\n")
+        print(f"{'family':<10}{'before files/s':>16}{'after files/s':>16}{'speedup':>10}")
+
+        cases = {name: {name: spec} for name, spec in _FAMILIES.items()}
+        cases["all"] = _FAMILIES
+        for name, families in cases.items():
+            registry = build_registry(_regex_only(families))
+            before_s, before = _best_of(args.repeat, lambda: _per_pattern(root, families))
+            after_s, after = _best_of(args.repeat, lambda: run_registry(root, registry=registry))
+            assert all(before[k] == after.get(k, []) for k in before), f"{name}: outputs differ"
+            print(
+                f"{name:<10}{file_count / before_s:>16,.0f}{file_count / after_s:>16,.0f}"
+                f"{before_s / after_s:>9.1f}x"
+            )
+
+        python = _python_only({**_FAMILIES, "functions": (FUNCTION_PATTERNS, "function")})
+        regex_registry = build_registry(_regex_only(python))
+        ast_registry = build_registry(python)
+        regex_s, regex_hits = _best_of(args.repeat, lambda: run_registry(root, registry=regex_registry))
+        ast_s, ast_hits = _best_of(args.repeat, lambda: run_registry(root, registry=ast_registry))
+        print(
+            f"{'python':<10}{file_count / regex_s:>16,.0f}{file_count / ast_s:>16,.0f}"
+            f"{regex_s / ast_s:>9.1f}x  (regex vs ast; hits {_hit_count(regex_hits)}"
+            f" vs {_hit_count(ast_hits)})"
+        )
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
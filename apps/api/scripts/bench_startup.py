@@ -0,0 +1,88 @@
+"""Measure API cold start: importing ``apps.api.main`` and running its lifespan startup.
+
+Each run is a fresh interpreter, so nothing is cached in ``sys.modules``.
+The child times the import of the app module and then the lifespan up to
+the point the app would accept requests; ``--top`` also lists the
+third-party packages that cost the most import time (from
+``python -X importtime``). Missing JWT/encryption secrets are filled with
+dummies so the lifespan's checks pass.
+
+Usage:
+    python -m apps.api.scripts.bench_startup
+    python -m apps.api.scripts.bench_startup --runs 10 --top 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+_CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+from apps.api.main import app
+imported = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(json.dumps({"import_ms": (imported - start) * 1000, "lifespan_ms": (ready - imported) * 1000}))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET_KEY", "bench")
+    env.setdefault("CREDENTIAL_ENCRYPTION_KEY", "0" * 64)
+    return env
+
+
+def _run() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD], env=_env(), capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _import_costs(top: int) -> list[tuple[str, float]]:
+    """Self import time per top-level package, in milliseconds."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import apps.api.main"],
+        env=_env(), capture_output=True, text=True, check=True,
+    )
+    costs: Counter[str] = Counter()
+    for line in out.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        costs[parts[2].strip().split(".")[0]] += int(parts[0]) / 1000
+    return costs.most_common(top)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="heaviest packages to list (0 = skip)")
+    args = parser.parse_args()
+
+    results = [_run() for _ in range(args.runs)]
+    print(f"{'phase':<12}{'p50 ms':>10}{'min ms':>10}{'max ms':>10}")
+    for phase in ("import_ms", "lifespan_ms"):
+        values = [r[phase] for r in results]
+        print(f"{phase[:-3]:<12}{statistics.median(values):>10.0f}{min(values):>10.0f}{max(values):>10.0f}")
+    totals = [r["import_ms"] + r["lifespan_ms"] for r in results]
+    print(f"{'total':<12}{statistics.median(totals):>10.0f}{min(totals):>10.0f}{max(totals):>10.0f}")
+
+    if args.top:
+        print(f"\n{'package':<24}{'import ms':>10}")
+        for package, ms in _import_costs(args.top):
+            print(f"{package:<24}{ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
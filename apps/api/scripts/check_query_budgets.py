@@ -0,0 +1,82 @@
+"""Check that list and report loaders stay within their SQL statement budgets.
+
+Runs each loader against the configured database inside
+``assert_max_queries`` and prints the statements it executed. A budget is
+a fixed number of statements however many rows come back, so a loader
+that starts querying once per row fails here instead of slowing down in
+production. Exits non-zero when any loader is over budget.
+
+Usage:
+    python -m apps.api.scripts.check_query_budgets
+    python -m apps.api.scripts.check_query_budgets --verbose
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.api.models.milestone import Milestone
+from apps.api.models.product import Product
+from apps.api.observability import query_stats
+from apps.api.services.milestone_service import MilestoneService
+from apps.api.services.report_service import ReportService
+from apps.api.services.specification_service import SpecificationService
+from packages.common.db.session import async_session_factory, engine
+
+Loader = Callable[[AsyncSession], Awaitable[object]]
+
+
+async def _budgets(session: AsyncSession) -> list[tuple[str, int, Loader]]:
+    product_ids = list((await session.execute(
+        select(Product.id).where(Product.archived_at.is_(None))
+    )).scalars())
+    # The product with the most milestones exercises the task-count lookup
+    milestone_product = (await session.execute(
+        select(Milestone.product_id)
+        .group_by(Milestone.product_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )).scalar_one_or_none()
+
+    budgets: list[tuple[str, int, Loader]] = [
+        ("SpecificationService.get_library_features", 1,
+         lambda s: SpecificationService(s).get_library_features()),
+        ("ReportService.get_tasks_for_report", 6,
+         lambda s: ReportService(s).get_tasks_for_report(product_ids)),
+        ("ReportService.get_bugs_for_report", 1,
+         lambda s: ReportService(s).get_bugs_for_report(product_ids)),
+    ]
+    if milestone_product is not None:
+        budgets.append(("MilestoneService.list_milestones", 2,
+                        lambda s: MilestoneService(s).list_milestones(milestone_product)))
+    return budgets
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="list statements for every loader")
+    args = parser.parse_args()
+
+    failed = 0
+    async with async_session_factory() as session:
+        for name, limit, load in await _budgets(session):
+            try:
+                with query_stats.assert_max_queries(limit) as stats:
+                    await load(session)
+            except AssertionError as exc:
+                failed += 1
+                print(f"FAIL  {name}: {exc}")
+                continue
+            print(f"ok    {name}: {stats.count}/{limit} statements, {stats.duration_ms:.1f}ms")
+            if args.verbose:
+                print(stats.describe())
+    await engine.dispose()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
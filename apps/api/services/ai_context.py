@@ -2,34 +2,57 @@
 
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.api.config import settings
+from apps.api.services.context_retrieval import retrieve_context
+from apps.api.services.token_estimator import estimate_tokens
 
-async def gather_project_context(session: AsyncSession, product_id: UUID | None) -> str:
-    """Gather project data to inject into AI system prompt."""
+
+async def gather_project_context(
+    session: AsyncSession, product_id: UUID | None, query: str = "",
+) -> str:
+    """Gather project data to inject into AI system prompt.
+
+    Without a product, ``query`` (the user's question) selects which
+    portfolio details are included.
+    """
     if not product_id:
-        return await _gather_all_projects_context(session)
+        return await _gather_all_projects_context(session, query)
     return await _gather_single_project_context(session, product_id)
 
 
-async def _gather_all_projects_context(session: AsyncSession) -> str:
-    """Gather complete application context — all projects, team, tasks, bugs, scans."""
-    from apps.api.models.audit import RepositoryAnalysis
+def _fit_lines(lines: list[str], budget: int, noun: str) -> list[str]:
+    """Keep leading lines within ``budget`` tokens, noting how many were cut."""
+    kept: list[str] = []
+    used = 0
+    for i, line in enumerate(lines):
+        used += estimate_tokens(line) + 1
+        if used > budget:
+            return kept + [f"  ... {len(lines) - i} more {noun} not shown"]
+        kept.append(line)
+    return kept
+
+
+async def _gather_all_projects_context(session: AsyncSession, query: str) -> str:
+    """Gather application context — portfolio overview plus details relevant to ``query``.
+
+    The overview (team, per-project counts, member assignments) is capped at
+    half the context budget; the rest is filled with the task, bug,
+    knowledge, spec and scan snippets that best match the question.
+    """
     from apps.api.models.product import Product, ProductMember
     from apps.api.models.task import Task
     from apps.api.models.user import Profile
 
     sections: list[str] = []
+    overview_budget = settings.chat_context_token_budget // 2
 
     # --- Team Members ---
     profiles = list((await session.execute(
         select(Profile).where(Profile.status == "active")
     )).scalars().all())
-    members_by_role: dict[str, list[str]] = {}
-    for p in profiles:
-        role = p.role or "member"
-        members_by_role.setdefault(role, []).append(p.full_name or p.email or "Unknown")
 
     sections.append(f"TEAM: {len(profiles)} active members")
 
@@ -43,32 +66,24 @@ async def _gather_all_projects_context(session: AsyncSession) -> str:
     profile_map = {p.id: p for p in profiles}
 
     all_members = list((await session.execute(select(ProductMember))).scalars().all())
-    member_map: dict[str, list[tuple[str, str]]] = {}
-    for m in all_members:
-        pid = str(m.product_id)
-        profile = profile_map.get(m.profile_id)
-        name = (profile.full_name or profile.email or "Unknown") if profile else "Unknown"
-        member_map.setdefault(pid, []).append((name, m.role or "member"))
 
-    # Batch-load ALL tasks and scans
-    product_ids = [p.id for p in products]
-    all_tasks = list((await session.execute(
-        select(Task).where(Task.product_id.in_(product_ids), Task.is_draft == False)
-    )).scalars().all())
-    all_scans = list((await session.execute(
-        select(RepositoryAnalysis)
-        .where(RepositoryAnalysis.product_id.in_(product_ids))
-        .where(RepositoryAnalysis.functional_inventory.is_not(None))
-    )).scalars().all())
-
-    tasks_by_product: dict[str, list] = {}
-    for t in all_tasks:
-        tasks_by_product.setdefault(str(t.product_id), []).append(t)
-    scans_by_product: dict[str, RepositoryAnalysis] = {}
-    for s in sorted(all_scans, key=lambda x: x.created_at or x.id):
-        scans_by_product[str(s.product_id)] = s
-
-    proj_lines = [f"PROJECTS: {len(products)} total"]
+    # Per-project task and bug counts, aggregated in the database
+    is_done = Task.status.in_(("done", "live"))
+    counts = (await session.execute(
+        select(Task.product_id, Task.task_type, is_done, func.count())
+        .where(Task.is_draft == False)
+        .group_by(Task.product_id, Task.task_type, is_done)
+    )).all()
+    task_counts: dict[str, dict[str, int]] = {}
+    for pid, task_type, done, n in counts:
+        c = task_counts.setdefault(str(pid), {"tasks": 0, "done": 0, "bugs": 0})
+        if task_type == "task":
+            c["tasks"] += n
+            c["done"] += n if done else 0
+        elif task_type == "bug":
+            c["bugs"] += n
+
+    proj_lines: list[str] = []
     stages: dict[str, int] = {}
     total_tasks = 0
     total_done = 0
@@ -76,51 +91,28 @@ async def _gather_all_projects_context(session: AsyncSession) -> str:
 
     for p in products:
         stages[p.stage or "Unknown"] = stages.get(p.stage or "Unknown", 0) + 1
-        p_tasks = tasks_by_product.get(str(p.id), [])
-        tasks = [t for t in p_tasks if t.task_type == "task"]
-        bugs = [t for t in p_tasks if t.task_type == "bug"]
-        done = sum(1 for t in tasks if t.status in ("done", "live"))
-        total_tasks += len(tasks)
-        total_done += done
-        total_bugs += len(bugs)
+        c = task_counts.get(str(p.id), {"tasks": 0, "done": 0, "bugs": 0})
+        total_tasks += c["tasks"]
+        total_done += c["done"]
+        total_bugs += c["bugs"]
 
         scan_info = ""
-        scan = scans_by_product.get(str(p.id))
-        if scan and scan.gap_analysis and isinstance(scan.gap_analysis, dict):
-            scan_info = f" | Scan: {scan.gap_analysis.get('progress_pct', 0):.0f}%"
+        if p.latest_analysis_id and p.last_scan_progress is not None:
+            scan_info = f" | Scan: {p.last_scan_progress:.0f}%"
 
-        bug_info = f" | Bugs: {len(bugs)}" if bugs else ""
+        bug_info = f" | Bugs: {c['bugs']}" if c["bugs"] else ""
         proj_lines.append(
             f"  [{p.name}] Stage: {p.stage or 'N/A'} | "
-            f"Tasks: {done}/{len(tasks)}{bug_info}{scan_info}"
+            f"Tasks: {c['done']}/{c['tasks']}{bug_info}{scan_info}"
         )
 
-        # Pre-grouped tasks by status (AI reads facts, doesn't compute)
-        if tasks:
-            task_by_status: dict[str, list[str]] = {}
-            for t in tasks:
-                s = t.status or "backlog"
-                a = ""
-                if t.assignee_id:
-                    ap = profile_map.get(t.assignee_id)
-                    a = f" ({ap.full_name})" if ap and ap.full_name else ""
-                task_by_status.setdefault(s, []).append(f"{t.title}{a}")
-            for s, titles in task_by_status.items():
-                proj_lines.append(f"    Tasks[{s}]({len(titles)}): {', '.join(titles[:10])}{'...' if len(titles) > 10 else ''}")
-
-        # Pre-grouped bugs by status
-        if bugs:
-            bug_by_status: dict[str, list[str]] = {}
-            for b in bugs:
-                s = b.status or "reported"
-                bug_by_status.setdefault(s, []).append(b.title)
-            for s, titles in bug_by_status.items():
-                proj_lines.append(f"    Bugs[{s}]({len(titles)}): {', '.join(titles)}")
-
     stage_str = ", ".join(f"{k}: {v}" for k, v in sorted(stages.items()))
-    proj_lines.insert(1, f"Stages: {stage_str}")
-    proj_lines.insert(2, f"Total: {total_done}/{total_tasks} tasks done, {total_bugs} bugs")
-    sections.append("\n".join(proj_lines))
+    sections.append("\n".join([
+        f"PROJECTS: {len(products)} total",
+        f"Stages: {stage_str}",
+        f"Total: {total_done}/{total_tasks} tasks done, {total_bugs} bugs",
+        *_fit_lines(proj_lines, overview_budget // 2, "projects"),
+    ]))
 
     # --- Pre-computed Member-to-Project Summaries (prevents LLM miscounting) ---
     role_project_map: dict[str, dict[str, list[str]]] = {}
@@ -135,17 +127,36 @@ async def _gather_all_projects_context(session: AsyncSession) -> str:
             product_name_map.get(str(m.product_id), "Unknown")
         )
 
-    summary_lines = ["MEMBER-PROJECT SUMMARY (pre-computed, use these facts):"]
+    summary_lines: list[str] = []
     for role in sorted(role_project_map.keys()):
         members_in_role = role_project_map[role]
         sorted_members = sorted(members_in_role.items(), key=lambda x: -len(x[1]))
         summary_lines.append(f"  {role} ({len(members_in_role)} people):")
         for name, projs in sorted_members:
             summary_lines.append(f"    {name}: {len(projs)} projects — {', '.join(projs)}")
-    sections.append("\n".join(summary_lines))
+    sections.append("\n".join([
+        "MEMBER-PROJECT SUMMARY (pre-computed, use these facts):",
+        *_fit_lines(summary_lines, overview_budget // 2, "lines"),
+    ]))
+
+    # --- Details relevant to the question ---
+    used = sum(estimate_tokens(s) for s in sections)
+    snippets = await retrieve_context(
+        session,
+        query,
+        product_names={p.id: p.name for p in products},
+        person_names={p.id: p.full_name or p.email or "Unknown" for p in profiles},
+        token_budget=settings.chat_context_token_budget - used,
+        top_k=settings.chat_context_top_k,
+    )
+    if snippets:
+        sections.append(
+            "RELEVANT DETAILS (most relevant to the question first):\n"
+            + "\n".join(f"  {s}" for s in snippets)
+        )
 
     return (
-        "\n\n--- APPLICATION CONTEXT (complete knowledge) ---\n"
+        "\n\n--- APPLICATION CONTEXT ---\n"
         + "\n\n".join(sections)
         + "\n--- END ---\n"
     )
@@ -258,15 +269,12 @@ async def _gather_single_project_context(session: AsyncSession, product_id: UUID
 
     # Scan results
     scan_stmt = (
-        select(RepositoryAnalysis)
-        .where(RepositoryAnalysis.product_id == product_id)
-        .where(RepositoryAnalysis.functional_inventory.is_not(None))
-        .order_by(RepositoryAnalysis.created_at.desc())
-        .limit(1)
+        select(RepositoryAnalysis.gap_analysis)
+        .join(Product, Product.latest_analysis_id == RepositoryAnalysis.id)
+        .where(Product.id == product_id)
     )
-    scan = (await session.execute(scan_stmt)).scalar_one_or_none()
-    if scan and scan.gap_analysis and isinstance(scan.gap_analysis, dict):
-        ga = scan.gap_analysis
+    ga = (await session.execute(scan_stmt)).scalar_one_or_none()
+    if ga and isinstance(ga, dict):
         context_parts.append(
             f"\nCODE SCAN RESULTS:\n"
             f"Verified: {ga.get('verified', 0)}/{ga.get('total_tasks', 0)} tasks have matching code\n"
@@ -1,15 +1,42 @@
 """AI service with LLM integration and SSE streaming."""
 
+import base64
 import json
+import logging
 from collections.abc import AsyncIterator
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.models.ai import AIChatMessage, AIChatSession
+from apps.api.observability.tracing import llm_span, record_llm_usage
 from apps.api.services.ai_context import gather_project_context
-from apps.api.services.llm_config import get_llm_config, get_system_prompt
+from apps.api.services.chat_history import (
+    ANSWER_PLACEHOLDER,
+    build_history,
+    request_summary_refresh,
+    summary_section,
+)
+from apps.api.services.llm_config import LLMConfig, get_llm_config, get_system_prompt
+from packages.common.db.session import async_session_factory
+from packages.common.utils.error_handlers import bad_request
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_cursor(message: AIChatMessage) -> str:
+    raw = f"{message.created_at.isoformat()}|{message.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(message_id)
+    except ValueError:
+        raise bad_request("Invalid cursor")
 
 
 class AIService:
@@ -36,39 +63,50 @@ class AIService:
         await self.session.refresh(chat_session)
         return chat_session
 
-    async def get_messages(self, session_id: UUID, user_id: str) -> list[AIChatMessage]:
-        session_stmt = select(AIChatSession).where(
+    async def get_messages(
+        self, session_id: UUID, user_id: str, limit: int = 50, before: str | None = None,
+    ) -> dict:
+        """One page of a session's messages, oldest first, ending before ``before``.
+
+        Keyset pagination on (created_at, id): each page is one index range
+        scan, whatever the session's length.
+        """
+        session_stmt = select(AIChatSession.id).where(
             AIChatSession.id == session_id,
             AIChatSession.user_id == user_id,
         )
-        session_result = await self.session.execute(session_stmt)
-        if not session_result.scalar_one_or_none():
-            return []
+        if (await self.session.execute(session_stmt)).scalar_one_or_none() is None:
+            return {"data": [], "next_cursor": None}
 
         stmt = (
             select(AIChatMessage)
             .where(AIChatMessage.session_id == session_id)
-            .order_by(AIChatMessage.created_at)
+            .order_by(AIChatMessage.created_at.desc(), AIChatMessage.id.desc())
+            .limit(limit + 1)
         )
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        if before:
+            created_at, message_id = _decode_cursor(before)
+            stmt = stmt.where(
+                tuple_(AIChatMessage.created_at, AIChatMessage.id) < (created_at, message_id)
+            )
+        rows = list((await self.session.execute(stmt)).scalars().all())
+        page = rows[:limit]
+        next_cursor = _encode_cursor(page[-1]) if len(rows) > limit else None
+        page.reverse()
+        return {"data": page, "next_cursor": next_cursor}
 
     async def delete_session(self, session_id: UUID, user_id: str) -> None:
         """Delete a chat session and all its messages."""
-        session_stmt = select(AIChatSession).where(
+        session_stmt = select(AIChatSession.id).where(
             AIChatSession.id == session_id,
             AIChatSession.user_id == user_id,
         )
-        result = await self.session.execute(session_stmt)
-        chat_session = result.scalar_one_or_none()
-        if not chat_session:
+        if (await self.session.execute(session_stmt)).scalar_one_or_none() is None:
             return
-        msg_stmt = select(AIChatMessage).where(AIChatMessage.session_id == session_id)
-        msgs = (await self.session.execute(msg_stmt)).scalars().all()
-        for msg in msgs:
-            await self.session.delete(msg)
-        await self.session.delete(chat_session)
-        await self.session.flush()
+        await self.session.execute(
+            delete(AIChatMessage).where(AIChatMessage.session_id == session_id)
+        )
+        await self.session.execute(delete(AIChatSession).where(AIChatSession.id == session_id))
 
     @staticmethod
     def _build_user_content(
@@ -82,18 +120,6 @@ class AIService:
             parts.append({"type": "image_url", "image_url": {"url": img}})
         return parts
 
-    async def _load_history(self, session_id: UUID, limit: int = 10) -> list[AIChatMessage]:
-        """Load recent conversation history for a session."""
-        stmt = (
-            select(AIChatMessage)
-            .where(AIChatMessage.session_id == session_id)
-            .order_by(AIChatMessage.created_at.desc())
-            .limit(limit)
-        )
-        history = list((await self.session.execute(stmt)).scalars().all())
-        history.reverse()
-        return history
-
     @staticmethod
     def _format_llm_error(err: Exception) -> str:
         """Map LLM exceptions to user-friendly messages."""
@@ -108,6 +134,53 @@ class AIService:
             return "⚠️ The AI took too long to respond. Please try again."
         return f"⚠️ AI error: {str(err)[:200]}"
 
+    async def _load_llm_setup(self) -> tuple[LLMConfig | None, str, str]:
+        """Return (config, chat system prompt, error); config is None on error."""
+        try:
+            config = await get_llm_config(self.session)
+        except ValueError as e:
+            return None, "", str(e)
+        return config, await get_system_prompt(self.session, "chat"), ""
+
+    @staticmethod
+    def _build_messages(
+        system_prompt: str, history: list[AIChatMessage], user_content: str | list[dict],
+    ) -> list[dict]:
+        messages: list[dict] = [{"role": "system", "content": system_prompt}]
+        # Only include USER messages from history (not assistant responses)
+        # This prevents the model from repeating its previous answers
+        for msg in history:
+            if msg.content and msg.content.strip() and msg.role == "user":
+                messages.append({"role": "user", "content": msg.content})
+                # Add placeholder for assistant to maintain conversation structure
+                messages.append({"role": "assistant", "content": ANSWER_PLACEHOLDER})
+        # Add current user message at the end (no placeholder after it)
+        messages.append({"role": "user", "content": user_content})
+        return messages
+
+    async def _prepare_turn(
+        self, chat_session: AIChatSession, content: str,
+    ) -> tuple[LLMConfig | None, str, list[AIChatMessage], str]:
+        """Read everything the LLM call needs and commit the user message.
+
+        Returns (config, system prompt, history, error). The commit hands the
+        request's connection back to the pool, so the LLM call — often tens
+        of seconds — does not hold one.
+        """
+        # Load history BEFORE saving current message (so current isn't included)
+        history = await build_history(self.session, chat_session)
+        if history.needs_summary:
+            await request_summary_refresh(chat_session.id)
+        project_context = await gather_project_context(
+            self.session, chat_session.product_id, query=content,
+        )
+        config, system_prompt, error = await self._load_llm_setup()
+
+        self.session.add(AIChatMessage(session_id=chat_session.id, role="user", content=content))
+        await self.session.commit()
+        system_prompt += summary_section(history.summary) + project_context
+        return config, system_prompt, history.turns, error
+
     async def send_and_respond(
         self,
         session_id: UUID,
@@ -116,9 +189,6 @@ class AIService:
         images: list[str] | None = None,
     ) -> AIChatMessage:
         """Send a message and get a non-streaming AI response."""
-        import logging
-        logger = logging.getLogger(__name__)
-
         session_stmt = select(AIChatSession).where(
             AIChatSession.id == session_id,
             AIChatSession.user_id == user_id,
@@ -127,46 +197,29 @@ class AIService:
         if not chat_session:
             raise ValueError("Session not found")
 
-        # Load history BEFORE saving current message (so current isn't included)
-        history = await self._load_history(session_id)
-        project_context = await gather_project_context(self.session, chat_session.product_id)
-
-        # Now save the current user message
-        user_msg = AIChatMessage(session_id=session_id, role="user", content=content)
-        self.session.add(user_msg)
-        await self.session.flush()
-
-        full_response = ""
-        try:
-            import openai
-
-            config = await get_llm_config(self.session)
-            system_prompt = await get_system_prompt(self.session, "chat")
-            system_prompt += project_context
-            client = openai.AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
-
-            messages: list[dict] = [{"role": "system", "content": system_prompt}]
-            # Only include USER messages from history (not assistant responses)
-            # This prevents the model from repeating its previous answers
-            for msg in history:
-                if msg.content and msg.content.strip() and msg.role == "user":
-                    messages.append({"role": "user", "content": msg.content})
-                    # Add placeholder for assistant to maintain conversation structure
-                    messages.append({"role": "assistant", "content": "(answered)"})
-
-            user_content = self._build_user_content(content, images)
-            messages.append({"role": "user", "content": user_content})
-
-            response = await client.chat.completions.create(
-                model=config.model, messages=messages, max_tokens=config.max_tokens,
-            )
-            full_response = response.choices[0].message.content or ""
-
-        except ValueError as e:
-            full_response = str(e)
-        except Exception as e:
-            logger.exception("LLM response error")
-            full_response = self._format_llm_error(e)
+        config, system_prompt, history, full_response = await self._prepare_turn(
+            chat_session, content,
+        )
+        if config is not None:
+            try:
+                import openai
+
+                client = openai.AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
+                messages = self._build_messages(
+                    system_prompt, history, self._build_user_content(content, images),
+                )
+                with llm_span("chat", config.model) as span:
+                    response = await client.chat.completions.create(
+                        model=config.model, messages=messages, max_tokens=config.max_tokens,
+                    )
+                    record_llm_usage(span, response.usage)
+                full_response = response.choices[0].message.content or ""
+
+            except ValueError as e:
+                full_response = str(e)
+            except Exception as e:
+                logger.exception("LLM response error")
+                full_response = self._format_llm_error(e)
 
         assistant_msg = AIChatMessage(
             session_id=session_id, role="assistant", content=full_response
@@ -179,7 +232,11 @@ class AIService:
     async def stream_response(
         self, session_id: UUID, content: str, user_id: str
     ) -> AsyncIterator[str]:
-        """Stream AI response as SSE events."""
+        """Stream AI response as SSE events.
+
+        The request session is only used before the stream starts; the
+        assistant message is saved afterwards with a short-lived session.
+        """
         session_stmt = select(AIChatSession).where(
             AIChatSession.id == session_id,
             AIChatSession.user_id == user_id,
@@ -190,58 +247,39 @@ class AIService:
             yield "data: [DONE]\n\n"
             return
 
-        # Load history BEFORE saving current message (so current isn't included)
-        history = await self._load_history(session_id)
-        project_context = await gather_project_context(self.session, chat_session.product_id)
-
-        # Now save the current user message
-        user_msg = AIChatMessage(session_id=session_id, role="user", content=content)
-        self.session.add(user_msg)
-        await self.session.flush()
-
-        full_response = ""
-        try:
-            import openai
-
-            config = await get_llm_config(self.session)
-            system_prompt = await get_system_prompt(self.session, "chat")
-            system_prompt += project_context
-
-            messages: list[dict[str, str]] = [{"role": "system", "content": system_prompt}]
-            # Only include USER messages from history (not assistant responses)
-            # This prevents the model from repeating its previous answers
-            for msg in history:
-                if msg.content and msg.content.strip() and msg.role == "user":
-                    messages.append({"role": "user", "content": msg.content})
-                    messages.append({"role": "assistant", "content": "(answered)"})
-
-            # Add current user message at the end (no placeholder after it)
-            messages.append({"role": "user", "content": content})
-
-            client = openai.AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
-            stream = await client.chat.completions.create(
-                model=config.model, messages=messages, max_tokens=config.max_tokens, stream=True,
-            )
-
-            async for chunk in stream:
-                delta = chunk.choices[0].delta.content
-                if delta:
-                    full_response += delta
-                    yield f"data: {json.dumps(delta)}\n\n"
-
-        except ValueError as e:
-            full_response = str(e)
-            yield f"data: {json.dumps(full_response)}\n\n"
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).exception("LLM streaming error")
-            full_response = self._format_llm_error(e)
-            yield f"data: {json.dumps(full_response)}\n\n"
-
-        assistant_msg = AIChatMessage(
-            session_id=session_id, role="assistant", content=full_response
+        config, system_prompt, history, full_response = await self._prepare_turn(
+            chat_session, content,
         )
-        self.session.add(assistant_msg)
-        await self.session.flush()
+        if config is None:
+            yield f"data: {json.dumps(full_response)}\n\n"
+        else:
+            try:
+                import openai
+
+                messages = self._build_messages(system_prompt, history, content)
+                client = openai.AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
+                stream = await client.chat.completions.create(
+                    model=config.model, messages=messages, max_tokens=config.max_tokens, stream=True,
+                )
+
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        full_response += delta
+                        yield f"data: {json.dumps(delta)}\n\n"
+
+            except ValueError as e:
+                full_response = str(e)
+                yield f"data: {json.dumps(full_response)}\n\n"
+            except Exception as e:
+                logger.exception("LLM streaming error")
+                full_response = self._format_llm_error(e)
+                yield f"data: {json.dumps(full_response)}\n\n"
+
+        async with async_session_factory() as session:
+            session.add(AIChatMessage(
+                session_id=session_id, role="assistant", content=full_response,
+            ))
+            await session.commit()
 
         yield "data: [DONE]\n\n"
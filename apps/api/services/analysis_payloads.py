@@ -0,0 +1,76 @@
+"""Compressed, content-addressed storage for large repository analysis payloads.
+
+A scan's file tree and task evidence are far bigger than anything the
+dashboards read, and the file tree rarely changes between scans. They are
+stored once per distinct content as zlib-compressed JSON in
+``analysis_payloads``, keyed by the SHA-256 of the canonical JSON, and
+``RepositoryAnalysis`` only keeps the hash.
+"""
+
+import hashlib
+import json
+import zlib
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.api.models.audit import AnalysisPayload, RepositoryAnalysis
+
+_COMPRESSION_LEVEL = 6
+
+
+def encode_payload(value: Any) -> tuple[str, bytes, int]:
+    """Return (sha256, compressed bytes, uncompressed size) for ``value``."""
+    raw = json.dumps(value, separators=(",", ":"), sort_keys=True, default=str).encode()
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, _COMPRESSION_LEVEL), len(raw)
+
+
+def decode_payload(data: bytes) -> Any:
+    return json.loads(zlib.decompress(data))
+
+
+async def store_payload(session: AsyncSession, value: Any) -> str | None:
+    """Store ``value`` unless identical content exists; return its hash."""
+    if value is None:
+        return None
+    sha, data, size = encode_payload(value)
+    await session.execute(
+        insert(AnalysisPayload)
+        .values(sha256=sha, data=data, size_bytes=size)
+        .on_conflict_do_nothing(index_elements=["sha256"])
+    )
+    return sha
+
+
+async def load_payloads(session: AsyncSession, shas: Iterable[str | None]) -> dict[str, Any]:
+    """Decoded payloads by hash, in one query; missing hashes are left out."""
+    wanted = {sha for sha in shas if sha}
+    if not wanted:
+        return {}
+    rows = await session.execute(
+        select(AnalysisPayload.sha256, AnalysisPayload.data)
+        .where(AnalysisPayload.sha256.in_(wanted))
+    )
+    return {sha: decode_payload(data) for sha, data in rows}
+
+
+async def load_payload(session: AsyncSession, sha: str | None) -> Any:
+    if not sha:
+        return None
+    return (await load_payloads(session, [sha])).get(sha)
+
+
+async def delete_orphaned_payloads(session: AsyncSession) -> int:
+    """Delete payloads no analysis references any more. Returns the count."""
+    stmt = (
+        delete(AnalysisPayload)
+        .where(
+            ~exists().where(RepositoryAnalysis.structure_map_sha == AnalysisPayload.sha256),
+            ~exists().where(RepositoryAnalysis.functional_inventory_sha == AnalysisPayload.sha256),
+        )
+        .returning(AnalysisPayload.sha256)
+    )
+    return len((await session.execute(stmt)).all())
@@ -6,12 +6,15 @@ from datetime import datetime, timezone, timedelta
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.api.models.audit import ScanTaskVerdict
 from apps.api.models.product import Product
-from packages.common.db.session import async_session_factory
+from apps.api.services.analysis_payloads import delete_orphaned_payloads
 
 logger = logging.getLogger(__name__)
 
 RETENTION_DAYS = 30
+# Scan verdict checkpoints outlive any retry of their job well before this
+VERDICT_RETENTION_HOURS = 24
 
 
 async def backfill_archived_at(session: AsyncSession) -> None:
@@ -54,8 +57,22 @@ async def delete_expired_archives(session: AsyncSession) -> None:
     logger.info("Deleted %d expired archived products.", len(expired))
 
 
-async def run_archive_cleanup() -> None:
-    """Run archive cleanup on startup."""
-    async with async_session_factory() as session:
-        await delete_expired_archives(session)
-        await session.commit()
+async def delete_stale_verdicts(session: AsyncSession) -> int:
+    """Delete scan verdict checkpoints left by jobs that died without cleaning up."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=VERDICT_RETENTION_HOURS)
+    result = await session.execute(
+        delete(ScanTaskVerdict).where(ScanTaskVerdict.created_at < cutoff)
+    )
+    return result.rowcount or 0
+
+
+async def run_archive_cleanup(session: AsyncSession) -> None:
+    """Delete expired archives, unreferenced analysis payloads and stale scan verdicts."""
+    await delete_expired_archives(session)
+    orphaned = await delete_orphaned_payloads(session)
+    if orphaned:
+        logger.info("Deleted %d unreferenced analysis payloads.", orphaned)
+    verdicts = await delete_stale_verdicts(session)
+    if verdicts:
+        logger.info("Deleted %d stale scan verdicts.", verdicts)
+    await session.commit()
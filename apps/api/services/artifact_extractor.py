@@ -1,27 +1,31 @@
 """Artifact extractor — orchestrates multi-stack extraction."""
 
+import functools
+from collections.abc import Callable
+from concurrent.futures import Executor
 from pathlib import Path
 
+from apps.api.services.extraction.blob_cache import BlobCache, read_blob_shas
+from apps.api.services.extraction.pattern_registry import run_registry
 from apps.api.services.extraction.pattern_runner import (
+    MAX_FILE_BYTES,
     iter_files,
-    run_class_patterns,
-    run_regex_patterns,
+    run_function_patterns,
     should_skip,
 )
-from apps.api.services.extraction.route_patterns import (
-    FILE_ROUTE_PATTERNS,
-    ROUTE_PATTERNS,
-)
-from apps.api.services.extraction.model_patterns import MODEL_PATTERNS
-from apps.api.services.extraction.schema_patterns import SCHEMA_PATTERNS
+from apps.api.services.extraction.route_patterns import FILE_ROUTE_PATTERNS
 from apps.api.services.extraction.component_patterns import (
     COMPONENT_PATTERNS,
     PAGE_PATTERNS,
 )
-from apps.api.services.extraction.dependency_parsers import parse_all_dependencies
+from apps.api.services.extraction.dependency_parsers import (
+    DEPENDENCY_FILENAMES,
+    DEPENDENCY_SKIP_DIRS,
+    parse_all_dependencies,
+)
 from apps.api.services.extraction.migration_patterns import MIGRATION_PATTERNS
 from apps.api.services.extraction.config_patterns import CONFIG_ENTRIES
-from apps.api.services.extraction.pattern_runner import expand_globs
+from apps.api.services.extraction.pattern_runner import SKIP_DIRS, expand_globs
 
 _CODE_EXTS = {
     ".py", ".ts", ".tsx", ".js", ".jsx",
@@ -32,23 +36,67 @@ _CODE_EXTS = {
 }
 
 
+def sparse_checkout_patterns() -> list[str]:
+    """Non-cone sparse-checkout patterns covering every file the extractors read."""
+    names = [f"*{ext}" for ext in sorted(_CODE_EXTS)]
+    names += DEPENDENCY_FILENAMES
+    for pat in MIGRATION_PATTERNS:
+        names += [glob.rsplit("/", 1)[-1] for glob in expand_globs(pat["glob"])]
+    for pat in FILE_ROUTE_PATTERNS:
+        names += expand_globs(pat["file_glob"])
+    # Config presence is only checked at the repo root
+    names += [f"/{cfg['path']}" for cfg in CONFIG_ENTRIES]
+    # Only directories no extractor descends into
+    names += [f"!**/{d}/**" for d in sorted((SKIP_DIRS & DEPENDENCY_SKIP_DIRS) - {".git"})]
+    return list(dict.fromkeys(names))
+
+
 class ArtifactExtractor:
     """Extracts surface-level code artifacts without reading function internals."""
 
+    def __init__(
+        self, executor: Executor | None = None, cache: BlobCache | None = None,
+    ) -> None:
+        # Optional process pool for per-file parsing; None runs inline
+        self.executor = executor
+        # Optional blob-SHA cache; only blobs never seen before are parsed
+        self.cache = cache
+        self._blob_shas: dict[str, str] = {}
+        # Code files skipped for exceeding MAX_FILE_BYTES, set by the last run
+        self.oversized_files: list[str] = []
+
     def extract(self, repo_path: str) -> dict:
+        return {key: produce() for key, produce in self.stages(repo_path)}
+
+    def stages(self, repo_path: str) -> list[tuple[str, Callable[[], object]]]:
+        """Artifact categories in output order, each computed when called.
+
+        Lets a caller keep the categories finished before a limit was hit.
+        """
         root = Path(repo_path)
-        return {
-            "file_tree": self._extract_file_tree(root),
-            "routes": self._extract_routes(root),
-            "models": run_class_patterns(root, MODEL_PATTERNS),
-            "schemas": run_class_patterns(root, SCHEMA_PATTERNS),
-            "components": self._extract_components(root),
-            "pages": self._extract_pages(root),
-            "functions": self._extract_functions(root),
-            "dependencies": parse_all_dependencies(root),
-            "migrations": self._extract_migrations(root),
-            "configs": self._extract_configs(root),
-        }
+        self._blob_shas = read_blob_shas(root) if self.cache else {}
+        self.oversized_files = []
+
+        # Routes, models, schemas and functions come from one merged scan per
+        # file group, run on first use
+        @functools.cache
+        def scanned() -> dict[str, list[dict]]:
+            return run_registry(
+                root, self.executor, cache=self.cache, blob_shas=self._blob_shas,
+            )
+
+        return [
+            ("file_tree", lambda: self._extract_file_tree(root)),
+            ("routes", lambda: self._extract_routes(root, scanned().get("routes", []))),
+            ("models", lambda: scanned().get("models", [])),
+            ("schemas", lambda: scanned().get("schemas", [])),
+            ("components", lambda: self._extract_components(root)),
+            ("pages", lambda: self._extract_pages(root)),
+            ("functions", lambda: self._extract_functions(root, scanned().get("functions", []))),
+            ("dependencies", lambda: parse_all_dependencies(root)),
+            ("migrations", lambda: self._extract_migrations(root)),
+            ("configs", lambda: self._extract_configs(root)),
+        ]
 
     def _extract_file_tree(self, root: Path, max_depth: int = 4) -> list[str]:
         """Flat list of relative code file paths (filtered, limited depth)."""
@@ -63,9 +111,9 @@ class ArtifactExtractor:
                 result.append(str(rel))
         return result
 
-    def _extract_routes(self, root: Path) -> list[dict]:
-        """Find routes via regex patterns + file-presence conventions."""
-        routes = run_regex_patterns(root, ROUTE_PATTERNS)
+    def _extract_routes(self, root: Path, regex_routes: list[dict]) -> list[dict]:
+        """Combine regex-matched routes with file-presence conventions."""
+        routes = list(regex_routes)
         for pat in FILE_ROUTE_PATTERNS:
             routes.extend(self._find_file_routes(root, pat))
         return routes
@@ -129,30 +177,25 @@ class ArtifactExtractor:
                         results.append({"name": f.stem, "file": rel})
         return results
 
-    def _extract_functions(self, root: Path) -> list[dict]:
-        """Extract top-level function signatures from code files."""
-        import re
-        results: list[dict] = []
-        func_re = re.compile(
-            r"^(?:export\s+)?(?:async\s+)?(?:def|function)\s+(\w+)\s*\(([^)]{0,200})\)",
-            re.MULTILINE,
+    def _extract_functions(self, root: Path, py_functions: list[dict]) -> list[dict]:
+        """Extract top-level function signatures from code files.
+
+        Python functions come from the registry's AST pass; other languages
+        are matched here. Results are ordered by file path.
+        """
+        files = [
+            f for f in sorted(root.rglob("*"))
+            if not should_skip(f) and f.is_file() and f.suffix in _CODE_EXTS
+        ]
+        self.oversized_files = [
+            str(f.relative_to(root)) for f in files if f.stat().st_size > MAX_FILE_BYTES
+        ]
+        functions = run_function_patterns(
+            root, [f for f in files if f.suffix != ".py"], executor=self.executor,
+            cache=self.cache, blob_shas=self._blob_shas,
         )
-        for f in sorted(root.rglob("*")):
-            if should_skip(f) or not f.is_file() or f.suffix not in _CODE_EXTS:
-                continue
-            try:
-                text = f.read_text(errors="replace")
-            except OSError:
-                continue
-            for m in func_re.finditer(text):
-                name = m.group(1)
-                if name.startswith("_") or name in ("__init__", "setUp", "tearDown"):
-                    continue
-                sig = m.group(0).strip()[:200]
-                results.append({"name": name, "file": str(f.relative_to(root)), "signature": sig})
-                if len(results) >= 300:
-                    return results
-        return results
+        order = {str(f.relative_to(root)): i for i, f in enumerate(files)}
+        return sorted(functions + py_functions, key=lambda fn: order.get(fn["file"], len(order)))
 
     def _extract_configs(self, root: Path) -> list[dict]:
         """Check for presence of known config files."""
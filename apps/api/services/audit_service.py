@@ -42,18 +42,20 @@ class AuditService(BaseService[Audit]):
         from apps.api.models.audit import RepositoryAnalysis
         from apps.api.models.product import Product
         from apps.api.models.task import Task
+        from apps.api.services.analysis_payloads import load_payload
 
         issues: dict[str, list] = {"critical": [], "warnings": []}
 
         # Fetch latest scan result (with functional_inventory from Code Progress Scan)
         scan_stmt = (
             select(RepositoryAnalysis)
-            .where(RepositoryAnalysis.product_id == product_id)
-            .where(RepositoryAnalysis.functional_inventory.is_not(None))
-            .order_by(RepositoryAnalysis.created_at.desc())
-            .limit(1)
+            .join(Product, Product.latest_analysis_id == RepositoryAnalysis.id)
+            .where(Product.id == product_id)
         )
         scan = (await self.repo.session.execute(scan_stmt)).scalar_one_or_none()
+        scan_evidence = (
+            await load_payload(self.repo.session, scan.functional_inventory_sha) if scan else None
+        ) or []
 
         # Also fetch latest analysis (from Analyze button, has tech_stack)
         analysis_stmt = (
@@ -75,7 +77,7 @@ class AuditService(BaseService[Audit]):
         # --- Style score: code organization & structure ---
         style = 0.0
         if scan:
-            evidence = scan.functional_inventory or []
+            evidence = scan_evidence
             if isinstance(evidence, list) and evidence:
                 confidences = [e.get("confidence", 0) for e in evidence if isinstance(e, dict)]
                 style = round((sum(confidences) / len(confidences)) * 100, 1) if confidences else 0
@@ -134,7 +136,7 @@ class AuditService(BaseService[Audit]):
             checks_passed += 1  # Has scan data
             if scan.file_count and scan.file_count > 10:
                 checks_passed += 1
-            fi = scan.functional_inventory
+            fi = scan_evidence
             if isinstance(fi, list) and len(fi) > 0:
                 with_artifacts = sum(
                     1 for e in fi
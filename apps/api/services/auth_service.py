@@ -5,8 +5,6 @@ import uuid as uuid_mod
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token as google_id_token
 from jose import jwt
 from passlib.context import CryptContext
 from sqlalchemy import func, select
@@ -282,6 +280,9 @@ class AuthService:
         if not settings.google_oauth_client_id:
             raise bad_request("Google Sign-In is not configured on this server.")
 
+        from google.auth.transport import requests as google_requests
+        from google.oauth2 import id_token as google_id_token
+
         try:
             id_info = google_id_token.verify_oauth2_token(
                 id_token_str,
@@ -0,0 +1,182 @@
+"""Token-budgeted chat history with a rolling summary of older turns.
+
+Recent messages are replayed verbatim, newest first, until
+``chat_history_token_budget`` (less the summary) is spent. Turns that fall
+out of that window are folded into ``AIChatSession.history_summary`` by a
+background job, so a chat turn never waits on summarization and the summary
+is reused until further turns overflow the window.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.api.config import settings
+from apps.api.jobs.limits import enqueue_options
+from apps.api.models.ai import AIChatMessage, AIChatSession
+from apps.api.services.token_estimator import estimate_tokens
+from packages.common.redis import get_arq_redis
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_JOB = "summarize_chat_history_job"
+# Stands in for assistant replies, which are not replayed (see AIService)
+ANSWER_PLACEHOLDER = "(answered)"
+# Most messages replayed verbatim, whatever the token budget allows
+_FETCH_LIMIT = 50
+# Oldest unsummarized messages folded per job run
+_FOLD_LIMIT = 200
+# Characters of each message shown to the summarizer
+_TRANSCRIPT_CHARS = 1500
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and "
+    "Mizan, a product lifecycle assistant. Update the current summary with "
+    "the new messages. Keep the projects, people, tasks, decisions and open "
+    "questions the user cared about; drop greetings and repetition. Reply "
+    "with the updated summary only, as short plain-text sentences."
+)
+
+
+@dataclass
+class ChatHistory:
+    """What a chat turn replays: the summary and the verbatim window."""
+
+    summary: str | None
+    # Messages in the verbatim window, oldest first
+    turns: list[AIChatMessage] = field(default_factory=list)
+    # Older messages exist that the summary does not cover yet
+    needs_summary: bool = False
+
+
+def _turn_tokens(msg: AIChatMessage) -> int:
+    if msg.role != "user":
+        return 0
+    return estimate_tokens(msg.content or "") + estimate_tokens(ANSWER_PLACEHOLDER) + 8
+
+
+def _window(newest_first: list[AIChatMessage], budget: int) -> int:
+    """How many of the newest messages fit ``budget`` tokens, stopping at the first that doesn't."""
+    used = 0
+    for i, msg in enumerate(newest_first):
+        used += _turn_tokens(msg)
+        if used > budget:
+            return i
+    return len(newest_first)
+
+
+async def build_history(session: AsyncSession, chat_session: AIChatSession) -> ChatHistory:
+    """Split the messages the summary does not cover into the verbatim window and overflow."""
+    stmt = (
+        select(AIChatMessage)
+        .where(AIChatMessage.session_id == chat_session.id)
+        .order_by(AIChatMessage.created_at.desc(), AIChatMessage.id.desc())
+        # One more than the window holds, to tell whether older messages exist
+        .limit(_FETCH_LIMIT + 1)
+    )
+    if chat_session.summary_until is not None:
+        stmt = stmt.where(AIChatMessage.created_at > chat_session.summary_until)
+    newest_first = list((await session.execute(stmt)).scalars().all())
+
+    summary = chat_session.history_summary
+    budget = settings.chat_history_token_budget - estimate_tokens(summary or "")
+    keep = min(_window(newest_first, budget), _FETCH_LIMIT)
+    return ChatHistory(
+        summary=summary,
+        turns=list(reversed(newest_first[:keep])),
+        needs_summary=keep < len(newest_first),
+    )
+
+
+async def request_summary_refresh(session_id: UUID) -> None:
+    """Queue a summary refresh for a chat session. Never raises.
+
+    The job id is per session, so turns arriving while a refresh is queued
+    or running do not queue another.
+    """
+    try:
+        redis = await get_arq_redis()
+        await redis.enqueue_job(
+            SUMMARY_JOB, str(session_id),
+            _job_id=f"chat-summary:{session_id}", **enqueue_options(SUMMARY_JOB),
+        )
+    except Exception:
+        logger.debug("Failed to queue summary refresh for chat %s", session_id, exc_info=True)
+
+
+def _transcript(messages: list[AIChatMessage]) -> str:
+    lines = []
+    for msg in messages:
+        text = (msg.content or "").strip()
+        if len(text) > _TRANSCRIPT_CHARS:
+            text = text[:_TRANSCRIPT_CHARS] + " [...]"
+        lines.append(f"{msg.role.upper()}: {text}")
+    return "\n\n".join(lines)
+
+
+async def summarize_history(
+    session: AsyncSession, session_id: UUID, client: "AsyncOpenAI", model: str,
+) -> bool:
+    """Fold messages older than the verbatim window into the summary.
+
+    Returns False when there was nothing to fold. The caller commits.
+    """
+    chat_session = await session.get(AIChatSession, session_id)
+    if chat_session is None:
+        return False
+    history = await build_history(session, chat_session)
+    if not history.needs_summary:
+        return False
+
+    stmt = (
+        select(AIChatMessage)
+        .where(AIChatMessage.session_id == session_id)
+        .order_by(AIChatMessage.created_at, AIChatMessage.id)
+        .limit(_FOLD_LIMIT)
+    )
+    if chat_session.summary_until is not None:
+        stmt = stmt.where(AIChatMessage.created_at > chat_session.summary_until)
+    if history.turns:
+        stmt = stmt.where(AIChatMessage.created_at < history.turns[0].created_at)
+    fold = list((await session.execute(stmt)).scalars().all())
+    if not fold:
+        return False
+
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": (
+                f"Current summary:\n{chat_session.history_summary or '(none)'}\n\n"
+                f"New messages:\n{_transcript(fold)}"
+            )},
+        ],
+        max_tokens=settings.chat_summary_max_tokens,
+        temperature=0.2,
+    )
+    summary = (response.choices[0].message.content or "").strip()
+    if not summary:
+        return False
+
+    chat_session.history_summary = summary
+    chat_session.summary_until = fold[-1].created_at
+    await session.flush()
+    logger.info("Chat %s: folded %d messages into the history summary", session_id, len(fold))
+    return True
+
+
+def summary_section(summary: str | None) -> str:
+    """System-prompt section carrying the summary of earlier turns."""
+    if not summary:
+        return ""
+    return (
+        "\n\n--- EARLIER IN THIS CONVERSATION (summary, background only) ---\n"
+        f"{summary}\n--- END ---\n"
+    )
@@ -0,0 +1,342 @@
+"""Relevance-ranked retrieval of portfolio snippets for AI chat.
+
+Tasks, bugs, knowledge entries, specification features and each product's
+latest scan summary are indexed as one short snippet each in an in-process
+BM25 index. A chat question retrieves the top-ranked snippets that fit a
+token budget, so the prompt stays bounded however large the portfolio grows.
+
+The index is refreshed incrementally before each search: only rows updated
+since the last refresh (with an overlap for transactions that committed
+late) are re-read. At most once a minute, live row counts are compared with
+the index and ids are only read for a kind whose count went down. The whole
+index is rebuilt in the background periodically or when a project or person
+is renamed, and swapped in once built; searches meanwhile use the old one.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.api.models.audit import RepositoryAnalysis
+from apps.api.models.knowledge import KnowledgeEntry
+from apps.api.models.product import Product
+from apps.api.models.specification import SpecificationFeature
+from apps.api.models.task import Task
+from apps.api.services.token_estimator import estimate_tokens
+from packages.common.db.session import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it its me "
+    "my of on or our show tell than that the their them there these this to us "
+    "was we what when where which who why will with you your".split()
+)
+_WATERMARK_OVERLAP = timedelta(minutes=5)
+_FULL_REBUILD_SECONDS = 900
+_PRUNE_SECONDS = 60
+_DESCRIPTION_CHARS = 240
+_KNOWLEDGE_CHARS = 600
+
+
+def _stem(token: str) -> str:
+    # Plural folding only: "bugs" matches "bug", "payments" matches "payment"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    return [_stem(t) for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over snippets that can be added, replaced and removed."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._snippets: dict[str, str] = {}
+        self._lengths: dict[str, int] = {}
+        self._terms: dict[str, list[str]] = {}
+        self._postings: dict[str, dict[str, int]] = defaultdict(dict)
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._snippets)
+
+    def keys(self) -> set[str]:
+        return set(self._snippets)
+
+    def upsert(self, key: str, text: str, snippet: str) -> None:
+        """Index ``text`` under ``key``; searches return ``snippet`` for it."""
+        self.remove(key)
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self._postings[term][key] = tf
+        length = sum(terms.values())
+        self._snippets[key] = snippet
+        self._terms[key] = list(terms)
+        self._lengths[key] = length
+        self._total_length += length
+
+    def remove(self, key: str) -> None:
+        if key not in self._snippets:
+            return
+        del self._snippets[key]
+        self._total_length -= self._lengths.pop(key)
+        for term in self._terms.pop(key):
+            docs = self._postings[term]
+            del docs[key]
+            if not docs:
+                del self._postings[term]
+
+    def search(self, query: str, limit: int) -> list[tuple[float, str]]:
+        """Best (score, snippet) pairs for ``query``, highest first."""
+        n = len(self._snippets)
+        if not n:
+            return []
+        avg_length = self._total_length / n or 1.0
+        scores: dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for key, tf in docs.items():
+                norm = 1 - self.b + self.b * self._lengths[key] / avg_length
+                scores[key] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(score, self._snippets[key]) for key, score in best]
+
+
+class PortfolioIndex:
+    """BM25 index over the portfolio, kept current from the database."""
+
+    def __init__(self) -> None:
+        self.index = BM25Index()
+        self._lock = asyncio.Lock()
+        self._watermarks: dict[str, datetime] = {}
+        self._names_signature = ""
+        self._built_at = 0.0
+        self._pruned_at = 0.0
+        self._rebuilding: asyncio.Task | None = None
+
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        product_names: dict[UUID, str],
+        person_names: dict[UUID, str],
+        limit: int,
+    ) -> list[tuple[float, str]]:
+        signature = hashlib.sha256(
+            repr((sorted(product_names.items()), sorted(person_names.items()))).encode()
+        ).hexdigest()
+        async with self._lock:
+            if not self._names_signature:
+                # First search: the initial load is itself the full build
+                self._names_signature = signature
+                self._built_at = time.monotonic()
+            elif self._rebuilding is None and (
+                signature != self._names_signature
+                or time.monotonic() - self._built_at > _FULL_REBUILD_SECONDS
+            ):
+                self._rebuilding = asyncio.create_task(
+                    self._rebuild(product_names, person_names, signature),
+                )
+            await self._refresh(session, product_names, person_names)
+        return self.index.search(query, limit)
+
+    async def _rebuild(
+        self, product_names: dict[UUID, str], person_names: dict[UUID, str], signature: str,
+    ) -> None:
+        """Build a fresh index on its own session and swap it in."""
+        try:
+            fresh = PortfolioIndex()
+            async with async_session_factory() as session:
+                await fresh._refresh(session, product_names, person_names)
+            async with self._lock:
+                self.index = fresh.index
+                self._watermarks = fresh._watermarks
+                self._pruned_at = fresh._pruned_at
+                self._names_signature = signature
+                self._built_at = time.monotonic()
+        except Exception:
+            logger.warning("Failed to rebuild the portfolio index", exc_info=True)
+        finally:
+            self._rebuilding = None
+
+    async def _refresh(
+        self,
+        session: AsyncSession,
+        product_names: dict[UUID, str],
+        person_names: dict[UUID, str],
+    ) -> None:
+        await self._refresh_tasks(session, product_names, person_names)
+        await self._refresh_knowledge(session, product_names)
+        await self._refresh_features(session, product_names)
+        await self._refresh_scans(session, product_names)
+        if time.monotonic() - self._pruned_at > _PRUNE_SECONDS:
+            await self._prune(session, "task", Task.id, Task.is_draft == False)
+            await self._prune(session, "knowledge", KnowledgeEntry.id)
+            await self._prune(session, "feature", SpecificationFeature.id)
+            self._pruned_at = time.monotonic()
+
+    def _since(self, kind: str, column):
+        mark = self._watermarks.get(kind)
+        return column >= mark - _WATERMARK_OVERLAP if mark else true()
+
+    def _advance(self, kind: str, stamps: Iterable[datetime | None]) -> None:
+        latest = max((s for s in stamps if s), default=None)
+        if latest and (kind not in self._watermarks or latest > self._watermarks[kind]):
+            self._watermarks[kind] = latest
+
+    def _drop_missing(self, kind: str, live_ids: Iterable[UUID]) -> None:
+        live = {f"{kind}:{i}" for i in live_ids}
+        for key in self.index.keys():
+            if key.startswith(f"{kind}:") and key not in live:
+                self.index.remove(key)
+
+    async def _prune(self, session: AsyncSession, kind: str, id_column, *where) -> None:
+        """Drop deleted rows of ``kind``, reading ids only when the live count went down.
+
+        A deletion offset by a late-committed insert goes unnoticed until the
+        next full rebuild.
+        """
+        indexed = sum(1 for key in self.index.keys() if key.startswith(f"{kind}:"))
+        live = (await session.execute(select(func.count(id_column)).where(*where))).scalar_one()
+        if live >= indexed:
+            return
+        self._drop_missing(kind, (await session.execute(select(id_column).where(*where))).scalars())
+
+    async def _refresh_tasks(
+        self,
+        session: AsyncSession,
+        product_names: dict[UUID, str],
+        person_names: dict[UUID, str],
+    ) -> None:
+        live = Task.is_draft == False
+        rows = (await session.execute(
+            select(
+                Task.id, Task.product_id, Task.assignee_id, Task.task_type, Task.title,
+                Task.description, Task.status, Task.priority, Task.pillar, Task.phase,
+                Task.updated_at,
+            )
+            .where(live, self._since("task", Task.updated_at))
+        )).all()
+        for t in rows:
+            project = product_names.get(t.product_id, "Unknown project")
+            label = "Bug" if t.task_type == "bug" else "Task"
+            assignee = person_names.get(t.assignee_id) if t.assignee_id else None
+            details = ", ".join(x for x in (t.status, t.priority) if x)
+            snippet = f"[{project}] {label} ({details}): {t.title}"
+            if assignee:
+                snippet += f" — assigned to {assignee}"
+            description = (t.description or "").strip()
+            text = f"{snippet} {t.pillar or ''} {t.phase or ''} {description}"
+            if description:
+                snippet += f" — {description[:_DESCRIPTION_CHARS]}"
+            self.index.upsert(f"task:{t.id}", text, snippet)
+        self._advance("task", (t.updated_at for t in rows))
+
+    async def _refresh_knowledge(
+        self, session: AsyncSession, product_names: dict[UUID, str],
+    ) -> None:
+        rows = (await session.execute(
+            select(
+                KnowledgeEntry.id, KnowledgeEntry.product_id, KnowledgeEntry.title,
+                KnowledgeEntry.category, KnowledgeEntry.content, KnowledgeEntry.file_name,
+                KnowledgeEntry.updated_at,
+            )
+            .where(self._since("knowledge", KnowledgeEntry.updated_at))
+        )).all()
+        for k in rows:
+            scope = product_names.get(k.product_id, "Unknown project") if k.product_id else "General"
+            content = (k.content or "").strip()
+            snippet = f"[{scope}] Knowledge ({k.category}): {k.title}"
+            text = f"{snippet} {k.file_name or ''} {content}"
+            if content:
+                snippet += f" — {content[:_KNOWLEDGE_CHARS]}"
+            self.index.upsert(f"knowledge:{k.id}", text, snippet)
+        self._advance("knowledge", (k.updated_at for k in rows))
+
+    async def _refresh_features(
+        self, session: AsyncSession, product_names: dict[UUID, str],
+    ) -> None:
+        rows = (await session.execute(
+            select(
+                SpecificationFeature.id, SpecificationFeature.product_id,
+                SpecificationFeature.name, SpecificationFeature.description,
+                SpecificationFeature.status, SpecificationFeature.priority,
+                SpecificationFeature.reusable_category, SpecificationFeature.updated_at,
+            )
+            .where(self._since("feature", SpecificationFeature.updated_at))
+        )).all()
+        for f in rows:
+            project = product_names.get(f.product_id, "Unknown project")
+            description = (f.description or "").strip()
+            snippet = f"[{project}] Spec feature ({f.status}, {f.priority}): {f.name}"
+            text = f"{snippet} {f.reusable_category or ''} {description}"
+            if description:
+                snippet += f" — {description[:_DESCRIPTION_CHARS]}"
+            self.index.upsert(f"feature:{f.id}", text, snippet)
+        self._advance("feature", (f.updated_at for f in rows))
+
+    async def _refresh_scans(
+        self, session: AsyncSession, product_names: dict[UUID, str],
+    ) -> None:
+        # One small summary per product; cheaper to re-read than to track
+        rows = (await session.execute(
+            select(Product.id, RepositoryAnalysis.gap_analysis)
+            .join(RepositoryAnalysis, Product.latest_analysis_id == RepositoryAnalysis.id)
+        )).all()
+        for product_id, ga in rows:
+            if not isinstance(ga, dict):
+                continue
+            project = product_names.get(product_id, "Unknown project")
+            snippet = (
+                f"[{project}] Code scan: {ga.get('verified', 0)}/{ga.get('total_tasks', 0)} "
+                f"tasks verified, {ga.get('partial', 0)} partial, "
+                f"{ga.get('no_evidence', 0)} no evidence, "
+                f"progress {ga.get('progress_pct', 0):.0f}%"
+            )
+            self.index.upsert(f"scan:{product_id}", f"{snippet} code scan repository progress", snippet)
+        self._drop_missing("scan", (product_id for product_id, _ in rows))
+
+
+_portfolio_index = PortfolioIndex()
+
+
+async def retrieve_context(
+    session: AsyncSession,
+    query: str,
+    product_names: dict[UUID, str],
+    person_names: dict[UUID, str],
+    token_budget: int,
+    top_k: int,
+) -> list[str]:
+    """Snippets most relevant to ``query``, best first, within ``token_budget``."""
+    if not query.strip() or token_budget <= 0:
+        return []
+    hits = await _portfolio_index.search(session, query, product_names, person_names, top_k)
+    selected: list[str] = []
+    used = 0
+    for _, snippet in hits:
+        cost = estimate_tokens(snippet) + 1
+        if used + cost > token_budget:
+            continue
+        selected.append(snippet)
+        used += cost
+    return selected
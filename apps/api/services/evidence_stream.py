@@ -0,0 +1,86 @@
+"""Incremental parser for streamed progress-matcher responses.
+
+The matcher asks for ``{"scan_summary": {...}, "task_evidence": [{...}, ...]}``.
+Fed the completion chunk by chunk, ``EvidenceStream`` returns each
+``task_evidence`` entry as soon as its closing brace arrives, so verdicts can
+be stored while the rest of the response is still being generated. Text
+before the array (code fences, the summary) is skipped, and consumed text is
+dropped as it goes.
+"""
+
+import json
+import re
+
+_ARRAY_START_RE = re.compile(r'"task_evidence"\s*:\s*\[')
+
+
+class EvidenceStream:
+    """Yields complete ``task_evidence`` objects from a chunked JSON response."""
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0  # next unscanned index in _buf
+        self._in_array = False
+        self._closed = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._start: int | None = None  # index of the open object's "{"
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Add a chunk of response text; return objects completed by it."""
+        if self._closed:
+            return []
+        self._buf += chunk
+        if not self._in_array:
+            match = _ARRAY_START_RE.search(self._buf)
+            if match is None:
+                # The key may be split across chunks; keep a short tail only
+                self._buf = self._buf[-64:]
+                return []
+            self._buf = self._buf[match.end():]
+            self._in_array = True
+
+        found: list[dict] = []
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            char = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif char == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0 and self._start is not None:
+                    found += _load_object(buf[self._start:i + 1])
+                    self._start = None
+            elif char == "]" and self._depth == 0:
+                self._closed = True
+                break
+            i += 1
+
+        # Keep only the object still being received
+        keep_from = self._start if self._start is not None else i
+        self._buf = buf[keep_from:]
+        self._pos = i - keep_from
+        if self._start is not None:
+            self._start = 0
+        return found
+
+
+def _load_object(text: str) -> list[dict]:
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return []
+    return [value] if isinstance(value, dict) else []
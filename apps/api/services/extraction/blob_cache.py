@@ -0,0 +1,156 @@
+"""Blob-SHA keyed cache of per-file extraction results.
+
+Git blob SHAs are content hashes, so a file's parse results can be reused
+across commits, branches and even products that share code. Results are
+stored in a local SQLite file keyed by ``(blob_sha, kind)``, where ``kind``
+names the extractor and the version of its patterns.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import subprocess
+import time
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable
+
+from apps.api.services.extraction.pattern_runner import fan_out
+
+logger = logging.getLogger(__name__)
+
+_SQL_BATCH = 500
+_PRUNE_AFTER_DAYS = 30
+
+
+def read_blob_shas(repo_dir: Path) -> dict[str, str]:
+    """Map each tracked file's relative path to its blob SHA (empty if not a repo)."""
+    try:
+        proc = subprocess.run(
+            ["git", "ls-files", "-s", "-z"],
+            cwd=repo_dir, capture_output=True, timeout=60, check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    shas: dict[str, str] = {}
+    for record in proc.stdout.decode(errors="replace").split("\0"):
+        # "<mode> <sha> <stage>\t<path>"
+        meta, _, path = record.partition("\t")
+        parts = meta.split()
+        if path and len(parts) == 3:
+            shas[path] = parts[1]
+    return shas
+
+
+class BlobCache:
+    """SQLite-backed store of per-blob extraction results.
+
+    One instance per extraction run; the connection is used from a single
+    thread. WAL mode lets concurrent scans in the same worker share the file.
+    """
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS extraction_cache ("
+            " blob_sha TEXT NOT NULL, kind TEXT NOT NULL, payload TEXT NOT NULL,"
+            " last_used INTEGER NOT NULL, PRIMARY KEY (blob_sha, kind))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_extraction_cache_last_used"
+            " ON extraction_cache (last_used)"
+        )
+        self._conn.execute(
+            "DELETE FROM extraction_cache WHERE last_used < ?",
+            (int(time.time()) - _PRUNE_AFTER_DAYS * 86400,),
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, kind: str, shas: list[str]) -> dict[str, list[dict]]:
+        """Return cached results for the given blob SHAs and refresh their use time."""
+        found: dict[str, list[dict]] = {}
+        unique = list(dict.fromkeys(shas))
+        for i in range(0, len(unique), _SQL_BATCH):
+            batch = unique[i:i + _SQL_BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT blob_sha, payload FROM extraction_cache"
+                f" WHERE kind = ? AND blob_sha IN ({marks})",
+                (kind, *batch),
+            ).fetchall()
+            found.update((sha, json.loads(payload)) for sha, payload in rows)
+        if found:
+            now = int(time.time())
+            self._conn.executemany(
+                "UPDATE extraction_cache SET last_used = ? WHERE kind = ? AND blob_sha = ?",
+                [(now, kind, sha) for sha in found],
+            )
+            self._conn.commit()
+        return found
+
+    def put_many(self, kind: str, entries: dict[str, list[dict]]) -> None:
+        """Store results for the given blob SHAs."""
+        if not entries:
+            return
+        now = int(time.time())
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO extraction_cache (blob_sha, kind, payload, last_used)"
+            " VALUES (?, ?, ?, ?)",
+            [(sha, kind, json.dumps(hits), now) for sha, hits in entries.items()],
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def cached_fan_out(
+    chunk_fn: Callable[[str, list[str], dict], list[dict]],
+    root: Path,
+    files: list[Path],
+    params: dict,
+    executor: Executor | None,
+    cache: BlobCache | None,
+    kind: str,
+    blob_shas: dict[str, str],
+) -> list[dict]:
+    """``fan_out`` that only parses blobs missing from ``cache``.
+
+    ``chunk_fn`` must return every hit for every file it is given, each with
+    a ``"file"`` key. Output order is identical to an uncached ``fan_out``.
+    """
+    if cache is None or not blob_shas:
+        return fan_out(chunk_fn, root, files, params, executor)
+
+    rel_paths = [str(f.relative_to(root)) for f in files]
+    cached = cache.get_many(kind, [blob_shas[r] for r in rel_paths if r in blob_shas])
+    missing = [
+        (f, rel) for f, rel in zip(files, rel_paths)
+        if blob_shas.get(rel) not in cached
+    ]
+    cache.hits += len(rel_paths) - len(missing)
+    cache.misses += len(missing)
+
+    fresh: dict[str, list[dict]] = {}
+    for hit in fan_out(chunk_fn, root, [f for f, _ in missing], params, executor):
+        fresh.setdefault(hit["file"], []).append(hit)
+    cache.put_many(kind, {
+        blob_shas[rel]: [{**hit, "file": None} for hit in fresh.get(rel, [])]
+        for _, rel in missing
+        if rel in blob_shas
+    })
+
+    results: list[dict] = []
+    for rel in rel_paths:
+        sha = blob_shas.get(rel)
+        if sha in cached:
+            results.extend({**hit, "file": rel} for hit in cached[sha])
+        else:
+            results.extend(fresh.get(rel, []))
+    return results
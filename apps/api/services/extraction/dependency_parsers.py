@@ -5,7 +5,7 @@ import re
 from pathlib import Path
 
 
-_SKIP_DIRS = {"node_modules", ".git", ".venv", "venv", "dist", "build", ".next", ".nuxt"}
+DEPENDENCY_SKIP_DIRS = {"node_modules", ".git", ".venv", "venv", "dist", "build", ".next", ".nuxt"}
 
 
 def parse_all_dependencies(root: Path) -> dict[str, dict]:
@@ -13,7 +13,7 @@ def parse_all_dependencies(root: Path) -> dict[str, dict]:
     deps: dict[str, dict] = {}
     for entry in _SOURCES:
         for filepath in root.rglob(entry["filename"]):
-            if any(part in _SKIP_DIRS for part in filepath.parts):
+            if any(part in DEPENDENCY_SKIP_DIRS for part in filepath.parts):
                 continue
             try:
                 parsed = entry["parser"](filepath)
@@ -151,3 +151,5 @@ _SOURCES: list[dict] = [
     {"filename": "pom.xml", "ecosystem": "java", "parser": _parse_pom_xml},
     {"filename": "build.gradle", "ecosystem": "java", "parser": _parse_build_gradle},
 ]
+
+DEPENDENCY_FILENAMES: list[str] = [entry["filename"] for entry in _SOURCES]
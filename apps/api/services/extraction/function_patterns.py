@@ -0,0 +1,21 @@
+"""Function signature pattern definitions."""
+
+# Top-level function declaration; group(1) = name, group(2) = parameters.
+FUNCTION_REGEX = (
+    r"^(?:export\s+)?(?:async\s+)?(?:def|function)\s+(\w+)\s*\(([^)]{0,200})\)"
+)
+
+# Names never reported as public functions.
+SKIPPED_FUNCTION_NAMES = {"__init__", "setUp", "tearDown"}
+
+# Python functions are read from the AST in the registry's *.py scan;
+# FUNCTION_REGEX is the fallback for files that do not parse.
+# Each entry: name, file_glob, regex, ast.
+FUNCTION_PATTERNS: list[dict] = [
+    {
+        "name": "python",
+        "file_glob": "*.py",
+        "regex": FUNCTION_REGEX,
+        "ast": "functions",
+    },
+]
@@ -4,6 +4,8 @@
 # class_regex must have group(1) = class/model name.
 # field_regex group(1) = field name (applied within class block).
 # field_type_regex group(1) = field name, group(2) = type (for enriched extraction).
+# Optional "ast": "class" matches class_regex against the header of each top-level
+# class of a parsed Python module and field regexes against its body statements.
 MODEL_PATTERNS: list[dict] = [
     # --- Python ORMs ---
     {
@@ -12,6 +14,7 @@ MODEL_PATTERNS: list[dict] = [
         "class_regex": r"^class\s+(\w+)\(.*(?:Base|Model).*\):",
         "field_regex": r"^\s+(\w+):\s+Mapped\[",
         "field_type_regex": r"^\s+(\w+):\s+Mapped\[([^\]]+)\]",
+        "ast": "class",
     },
     {
         "name": "django",
@@ -19,6 +22,7 @@ MODEL_PATTERNS: list[dict] = [
         "class_regex": r"^class\s+(\w+)\(.*models\.Model.*\):",
         "field_regex": r"^\s+(\w+)\s*=\s*models\.\w+",
         "field_type_regex": r"^\s+(\w+)\s*=\s*models\.(\w+)",
+        "ast": "class",
     },
     # --- JavaScript / TypeScript ORMs ---
     {
@@ -0,0 +1,56 @@
+"""Process pool for CPU-bound per-file parsing during extraction.
+
+Scans create it inside the isolated extraction process, so workers are shut
+down with it; they get their share of the extraction memory limit.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def limit_memory(limit_mb: int) -> None:
+    """Cap this process's address space at ``limit_mb`` (0 = no cap)."""
+    if not limit_mb:
+        return
+    import resource
+
+    limit = limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def parse_workers() -> int:
+    """Configured pool size (``extraction_workers``, or one per CPU)."""
+    from apps.api.config import settings
+
+    return settings.extraction_workers or os.cpu_count() or 1
+
+
+def get_parse_pool(
+    max_workers: int | None = None, memory_limit_mb: int = 0,
+) -> ProcessPoolExecutor:
+    """Get or create the shared parse pool.
+
+    Uses the ``spawn`` start method so children never inherit the parent's
+    event loop, DB connections or threads. Each worker caps itself at
+    ``memory_limit_mb`` when given.
+    """
+    global _pool  # noqa: PLW0603
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=max_workers or parse_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=limit_memory,
+            initargs=(memory_limit_mb,),
+        )
+    return _pool
+
+
+def shutdown_parse_pool() -> None:
+    """Shut down the shared parse pool (worker shutdown hook)."""
+    global _pool  # noqa: PLW0603
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
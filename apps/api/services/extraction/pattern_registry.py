@@ -0,0 +1,288 @@
+"""Precompiled pattern registry — one merged scan per file glob group.
+
+All route/model/schema patterns are compiled once at import and grouped by
+``file_glob``. Each group gets a merged alternation of its patterns, so a
+file's text is read and scanned once per group instead of once per pattern.
+
+The merged scan only locates candidate offsets: several patterns can match
+at the same offset (e.g. a ``BaseModel`` class is both a SQLAlchemy and a
+Pydantic hit), so at every hit each pattern in the group is probed with an
+anchored ``match`` there, which also yields its own numbered groups. Per-pattern ``last_end`` bookkeeping keeps the
+non-overlapping semantics of a dedicated ``finditer``. Output is identical to
+running each pattern separately, provided no pattern can start a match
+strictly inside another pattern's match span in the same group (true for the
+line-oriented patterns shipped here; keep it true when adding patterns).
+
+Python patterns marked with an ``ast`` key skip the text scan: each ``.py``
+file is parsed once with ``ast`` and those patterns are matched against the
+parsed decorators, class headers and top-level functions. Files that fail to
+parse fall back to the regex scan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+
+from apps.api.services.extraction.blob_cache import BlobCache, cached_fan_out
+from apps.api.services.extraction.function_patterns import (
+    FUNCTION_PATTERNS,
+    SKIPPED_FUNCTION_NAMES,
+)
+from apps.api.services.extraction.model_patterns import MODEL_PATTERNS
+from apps.api.services.extraction.pattern_runner import (
+    extract_docstring,
+    extract_field_with_types,
+    extract_method_names,
+    find_block_end,
+    iter_files,
+    safe_read,
+)
+from apps.api.services.extraction.python_ast import PY_AST_VERSION, PythonModule, parse_python
+from apps.api.services.extraction.route_patterns import ROUTE_PATTERNS
+from apps.api.services.extraction.schema_patterns import SCHEMA_PATTERNS
+
+# Family name -> (patterns, kind). "regex" patterns use group_map/handler_lookahead,
+# "class" patterns use class_regex/field_regex/field_type_regex, "function"
+# patterns use regex with group(1) = function name.
+DEFAULT_FAMILIES: dict[str, tuple[list[dict], str]] = {
+    "routes": (ROUTE_PATTERNS, "regex"),
+    "models": (MODEL_PATTERNS, "class"),
+    "schemas": (SCHEMA_PATTERNS, "class"),
+    "functions": (FUNCTION_PATTERNS, "function"),
+}
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """A pattern spec with all of its regexes compiled."""
+
+    family: str
+    order: int  # declaration index within the family
+    kind: str
+    spec: dict
+    regex: re.Pattern
+    handler_re: re.Pattern | None = None
+    field_re: re.Pattern | None = None
+    type_re: re.Pattern | None = None
+
+
+@dataclass(frozen=True)
+class PatternGroup:
+    """Patterns sharing a file glob, plus their merged alternation."""
+
+    file_glob: str
+    patterns: tuple[CompiledPattern, ...]
+    merged: re.Pattern
+
+    @property
+    def uses_ast(self) -> bool:
+        return any(c.spec.get("ast") for c in self.patterns)
+
+
+def _compile(family: str, order: int, kind: str, spec: dict) -> CompiledPattern:
+    def opt(key: str) -> re.Pattern | None:
+        return re.compile(spec[key], re.MULTILINE) if spec.get(key) else None
+
+    return CompiledPattern(
+        family=family,
+        order=order,
+        kind=kind,
+        spec=spec,
+        regex=re.compile(spec["class_regex" if kind == "class" else "regex"], re.MULTILINE),
+        handler_re=opt("handler_lookahead"),
+        field_re=opt("field_regex"),
+        type_re=opt("field_type_regex"),
+    )
+
+
+def build_registry(
+    families: dict[str, tuple[list[dict], str]] = DEFAULT_FAMILIES,
+) -> dict[str, PatternGroup]:
+    """Compile ``families`` into merged groups keyed by file glob."""
+    grouped: dict[str, list[CompiledPattern]] = {}
+    for family, (specs, kind) in families.items():
+        for order, spec in enumerate(specs):
+            grouped.setdefault(spec["file_glob"], []).append(_compile(family, order, kind, spec))
+
+    return {
+        glob: PatternGroup(
+            file_glob=glob,
+            patterns=tuple(compiled),
+            merged=re.compile(
+                "|".join(f"(?:{c.regex.pattern})" for c in compiled),
+                re.MULTILINE,
+            ),
+        )
+        for glob, compiled in grouped.items()
+    }
+
+
+REGISTRY: dict[str, PatternGroup] = build_registry()
+
+# Changes whenever any default pattern changes, invalidating cached blob results
+REGISTRY_VERSION = hashlib.sha1(
+    json.dumps(DEFAULT_FAMILIES, sort_keys=True, default=str).encode()
+).hexdigest()[:12]
+
+
+def run_registry(
+    root: Path,
+    executor: Executor | None = None,
+    registry: dict[str, PatternGroup] | None = None,
+    cache: BlobCache | None = None,
+    blob_shas: dict[str, str] | None = None,
+) -> dict[str, list[dict]]:
+    """Scan each file once per glob group; return results per family.
+
+    Within a family, results are ordered pattern by pattern and file by file,
+    exactly as the per-pattern runners produce them. With ``cache`` and
+    ``blob_shas``, only blobs without cached results are read.
+    """
+    registry = REGISTRY if registry is None else registry
+    # Custom registries travel with the work unit; the default is rebuilt at import
+    shipped = None if registry is REGISTRY else registry
+    if shipped is not None:
+        cache = None
+
+    buckets: dict[tuple[str, int], list[dict]] = {}
+    for glob in registry:
+        files = list(iter_files(root, glob))
+        params = {"glob": glob, "registry": shipped}
+        kind = f"registry:{REGISTRY_VERSION}:{PY_AST_VERSION}:{glob}"
+        hits = cached_fan_out(
+            _group_chunk, root, files, params, executor, cache, kind, blob_shas or {},
+        )
+        for hit in hits:
+            buckets.setdefault((glob, hit.pop("_pattern")), []).append(hit)
+
+    slots = sorted(
+        (compiled.family, compiled.order, glob, idx)
+        for glob, group in registry.items()
+        for idx, compiled in enumerate(group.patterns)
+    )
+    results: dict[str, list[dict]] = {}
+    for family, _, glob, idx in slots:
+        results.setdefault(family, []).extend(buckets.get((glob, idx), []))
+    return results
+
+
+def _group_chunk(root: str, rel_paths: list[str], params: dict) -> list[dict]:
+    """Scan files with one group's merged regex; hits carry their pattern index."""
+    group = (params["registry"] or REGISTRY)[params["glob"]]
+    base = Path(root)
+    results: list[dict] = []
+    for rel in rel_paths:
+        text = safe_read(base / rel)
+        if text is None:
+            continue
+        module = parse_python(text) if group.uses_ast and rel.endswith(".py") else None
+        # Per-file hits per pattern, emitted pattern by pattern to match serial order
+        per_pattern: list[list[dict]] = [[] for _ in group.patterns]
+        scanned = list(range(len(group.patterns)))
+        if module is not None:
+            scanned = [i for i, c in enumerate(group.patterns) if not c.spec.get("ast")]
+            for idx, compiled in enumerate(group.patterns):
+                if compiled.spec.get("ast"):
+                    per_pattern[idx] = _ast_entries(compiled, module, rel)
+        if scanned:
+            _scan_text(group, scanned, text, rel, per_pattern)
+        for idx, entries in enumerate(per_pattern):
+            for entry in entries:
+                entry["_pattern"] = idx
+                results.append(entry)
+    return results
+
+
+def _scan_text(
+    group: PatternGroup, scanned: list[int], text: str, rel: str,
+    per_pattern: list[list[dict]],
+) -> None:
+    last_end = [0] * len(group.patterns)
+    for merged in group.merged.finditer(text):
+        start = merged.start()
+        for idx in scanned:
+            if start < last_end[idx]:
+                continue
+            compiled = group.patterns[idx]
+            m = compiled.regex.match(text, start)
+            if m is None:
+                continue
+            last_end[idx] = max(m.end(), start + 1)
+            entry = _build_entry(compiled, m, text, rel)
+            if entry is not None:
+                per_pattern[idx].append(entry)
+
+
+def _group_entry(compiled: CompiledPattern, match: re.Match, rel: str) -> dict:
+    entry = {"file": rel}
+    for key, group_idx in compiled.spec.get("group_map", {}).items():
+        try:
+            entry[key] = match.group(group_idx)
+        except IndexError:
+            pass
+    return entry
+
+
+def _build_entry(compiled: CompiledPattern, match: re.Match, text: str, rel: str) -> dict | None:
+    if compiled.kind == "regex":
+        entry = _group_entry(compiled, match, rel)
+        if compiled.handler_re:
+            hm = compiled.handler_re.search(text[match.end():match.end() + 300])
+            if hm:
+                entry["handler"] = hm.group(1)
+        return entry
+
+    if compiled.kind == "function":
+        name = match.group(1)
+        if name.startswith("_") or name in SKIPPED_FUNCTION_NAMES:
+            return None
+        return {"name": name, "file": rel, "signature": match.group(0).strip()[:200]}
+
+    block_end = find_block_end(text, match.end())
+    block = text[match.end():block_end]
+    fields = [m.group(1) for m in compiled.field_re.finditer(block)][:20] if compiled.field_re else []
+    return {
+        "name": match.group(1),
+        "fields": fields,
+        "field_types": extract_field_with_types(block, compiled.field_re, compiled.type_re),
+        "docstring": extract_docstring(block),
+        "methods": extract_method_names(block),
+        "file": rel,
+    }
+
+
+def _ast_entries(compiled: CompiledPattern, module: PythonModule, rel: str) -> list[dict]:
+    """Entries for an ``ast`` pattern, shaped exactly like its regex entries."""
+    mode = compiled.spec["ast"]
+    entries: list[dict] = []
+    if mode == "decorator":
+        for source, handler in module.decorators:
+            m = compiled.regex.match(source)
+            if m is None:
+                continue
+            entry = _group_entry(compiled, m, rel)
+            if compiled.handler_re:
+                entry["handler"] = handler
+            entries.append(entry)
+    elif mode == "class":
+        for cls in module.classes:
+            m = compiled.regex.match(cls.header)
+            if m is None:
+                continue
+            fields = [f.group(1) for f in compiled.field_re.finditer(cls.body)][:20] if compiled.field_re else []
+            entries.append({
+                "name": m.group(1),
+                "fields": fields,
+                "field_types": extract_field_with_types(cls.body, compiled.field_re, compiled.type_re),
+                "docstring": cls.docstring,
+                "methods": cls.methods,
+                "file": rel,
+            })
+    elif mode == "functions":
+        entries = [{"name": f["name"], "file": rel, "signature": f["signature"]} for f in module.functions]
+    return entries
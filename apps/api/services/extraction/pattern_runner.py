@@ -3,7 +3,19 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
+from concurrent.futures import Executor
+from itertools import repeat
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from apps.api.services.extraction.function_patterns import (
+    FUNCTION_REGEX,
+    SKIPPED_FUNCTION_NAMES,
+)
+
+if TYPE_CHECKING:
+    from apps.api.services.extraction.blob_cache import BlobCache
 
 SKIP_DIRS = {
     "node_modules", ".git", "__pycache__", ".venv", "venv",
@@ -11,6 +23,13 @@ SKIP_DIRS = {
     ".cache", "coverage", ".turbo", ".tox", "egg-info",
 }
 
+# Below this many files a pattern runs inline; pool dispatch costs more than it saves
+PARALLEL_MIN_FILES = 200
+# Files per work unit sent to a pool worker
+PARSE_CHUNK_SIZE = 250
+# Larger files (minified bundles, generated code, data dumps) are not parsed
+MAX_FILE_BYTES = 512 * 1024
+
 
 def should_skip(path: Path) -> bool:
     """Check if any path component is in the skip list."""
@@ -34,9 +53,11 @@ def iter_files(root: Path, glob_str: str):
                 yield f
 
 
-def safe_read(path: Path) -> str | None:
-    """Read file text, returning None on error."""
+def safe_read(path: Path, max_bytes: int = MAX_FILE_BYTES) -> str | None:
+    """Read file text, returning None on error or when larger than ``max_bytes``."""
     try:
+        if path.stat().st_size > max_bytes:
+            return None
         return path.read_text(errors="replace")
     except OSError:
         return None
@@ -89,7 +110,7 @@ def extract_method_names(block: str) -> list[str]:
 def extract_field_with_types(block: str, field_re, type_re=None) -> list[str]:
     """Extract fields with type annotations if available."""
     if type_re:
-        compiled = re.compile(type_re, re.MULTILINE)
+        compiled = re.compile(type_re, re.MULTILINE) if isinstance(type_re, str) else type_re
         matches = compiled.findall(block)
         return [f"{name}: {typ}" for name, typ in matches][:20]
     if field_re:
@@ -98,67 +119,82 @@ def extract_field_with_types(block: str, field_re, type_re=None) -> list[str]:
     return []
 
 
-def run_regex_patterns(root: Path, patterns: list[dict]) -> list[dict]:
-    """Run regex-based patterns against matching files."""
+def fan_out(
+    chunk_fn: Callable[[str, list[str], dict], list[dict]],
+    root: Path,
+    files: list[Path],
+    pat: dict,
+    executor: Executor | None,
+) -> list[dict]:
+    """Apply ``chunk_fn`` to files in chunks, in a pool when worthwhile.
+
+    Results are concatenated in file order, so output is identical to a
+    serial run regardless of which worker finishes first.
+    """
+    rel_paths = [str(f.relative_to(root)) for f in files]
+    if executor is None or len(rel_paths) < PARALLEL_MIN_FILES:
+        return chunk_fn(str(root), rel_paths, pat)
+
+    chunks = [
+        rel_paths[i:i + PARSE_CHUNK_SIZE]
+        for i in range(0, len(rel_paths), PARSE_CHUNK_SIZE)
+    ]
     results: list[dict] = []
-    for pat in patterns:
-        compiled = re.compile(pat["regex"], re.MULTILINE)
-        handler_re = re.compile(pat["handler_lookahead"], re.MULTILINE) if pat.get("handler_lookahead") else None
-        for f in iter_files(root, pat["file_glob"]):
-            text = safe_read(f)
-            if text is None:
-                continue
-            for match in compiled.finditer(text):
-                entry = {"file": str(f.relative_to(root))}
-                for key, group_idx in pat.get("group_map", {}).items():
-                    try:
-                        entry[key] = match.group(group_idx)
-                    except IndexError:
-                        pass
-                # Look ahead for handler name
-                if handler_re:
-                    after = text[match.end():match.end() + 300]
-                    hm = handler_re.search(after)
-                    if hm:
-                        entry["handler"] = hm.group(1)
-                results.append(entry)
+    for chunk_result in executor.map(chunk_fn, repeat(str(root)), chunks, repeat(pat)):
+        results.extend(chunk_result)
     return results
 
 
-def run_class_patterns(root: Path, patterns: list[dict]) -> list[dict]:
-    """Run class+field regex patterns for models/schemas with enriched data."""
+# --- Chunk workers (top-level so they can be pickled into a process pool) ---
+
+
+_FUNC_RE = re.compile(FUNCTION_REGEX, re.MULTILINE)
+
+
+# Bump when _FUNC_RE or _function_chunk output changes (invalidates blob cache)
+FUNCTIONS_VERSION = "1"
+
+
+def _function_chunk(root: str, rel_paths: list[str], pat: dict) -> list[dict]:
+    # limit=None parses every file completely (needed for per-blob caching)
+    limit = pat["limit"]
+    base = Path(root)
     results: list[dict] = []
-    for pat in patterns:
-        class_re = re.compile(pat["class_regex"], re.MULTILINE)
-        field_re = (
-            re.compile(pat["field_regex"], re.MULTILINE)
-            if pat.get("field_regex")
-            else None
-        )
-        type_re = pat.get("field_type_regex")
-        for f in iter_files(root, pat["file_glob"]):
-            text = safe_read(f)
-            if text is None:
+    for rel in rel_paths:
+        text = safe_read(base / rel)
+        if text is None:
+            continue
+        for m in _FUNC_RE.finditer(text):
+            name = m.group(1)
+            if name.startswith("_") or name in SKIPPED_FUNCTION_NAMES:
                 continue
-            for match in class_re.finditer(text):
-                name = match.group(1)
-                block_end = find_block_end(text, match.end())
-                block = text[match.end():block_end]
-
-                fields: list[str] = []
-                if field_re:
-                    fields = [m.group(1) for m in field_re.finditer(block)][:20]
-
-                field_types = extract_field_with_types(block, field_re, type_re)
-                docstring = extract_docstring(block)
-                methods = extract_method_names(block)
-
-                results.append({
-                    "name": name,
-                    "fields": fields,
-                    "field_types": field_types,
-                    "docstring": docstring,
-                    "methods": methods,
-                    "file": str(f.relative_to(root)),
-                })
+            sig = m.group(0).strip()[:200]
+            results.append({"name": name, "file": rel, "signature": sig})
+            if limit is not None and len(results) >= limit:
+                return results
     return results
+
+
+def run_function_patterns(
+    root: Path,
+    files: list[Path],
+    limit: int | None = None,
+    executor: Executor | None = None,
+    cache: BlobCache | None = None,
+    blob_shas: dict[str, str] | None = None,
+) -> list[dict]:
+    """Extract top-level function signatures from files, optionally capped at ``limit``.
+
+    With a blob ``cache``, files are parsed completely so their results can
+    be stored; otherwise parsing stops once ``limit`` is reached.
+    """
+    if cache is None or not blob_shas:
+        return fan_out(_function_chunk, root, files, {"limit": limit}, executor)[:limit]
+
+    from apps.api.services.extraction.blob_cache import cached_fan_out
+
+    hits = cached_fan_out(
+        _function_chunk, root, files, {"limit": None}, executor,
+        cache, f"functions:{FUNCTIONS_VERSION}", blob_shas,
+    )
+    return hits[:limit]
@@ -0,0 +1,111 @@
+"""Single-pass ``ast`` parse of Python sources for the pattern registry.
+
+A module is parsed once and exposes what the Python patterns need: every
+function decorator as one line of source (so multi-line decorators match
+like single-line ones), each top-level class header and body statement, and
+public top-level function signatures. Patterns keep their regexes; they are
+just matched against these pieces instead of the raw file text, which keeps
+comments, strings and nested code out of the results.
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass, field
+
+from apps.api.services.extraction.function_patterns import SKIPPED_FUNCTION_NAMES
+
+# Bump when the output derived from a parsed module changes (invalidates blob cache)
+PY_AST_VERSION = "1"
+
+_WS_RE = re.compile(r"\s*\n\s*")
+
+
+@dataclass
+class PythonClass:
+    """A top-level class as the class patterns see it."""
+
+    name: str
+    header: str  # "class Name(<bases>):" on one line
+    body: str  # simple body statements, one indented line each
+    docstring: str
+    methods: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PythonModule:
+    """Pieces of a parsed module, in source order."""
+
+    decorators: list[tuple[str, str]] = field(default_factory=list)  # (source, handler)
+    classes: list[PythonClass] = field(default_factory=list)
+    functions: list[dict] = field(default_factory=list)  # name, signature
+
+
+def parse_python(text: str) -> PythonModule | None:
+    """Parse ``text``; ``None`` when it is not valid Python for this interpreter."""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError, RecursionError):
+        return None
+    lines = text.split("\n")
+    module = PythonModule()
+
+    decorated: list[tuple[int, int, str, str]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for dec in node.decorator_list:
+                source = "@" + _flat(_segment(lines, dec))
+                decorated.append((dec.lineno, dec.col_offset, source, node.name))
+    module.decorators = [(source, name) for _, _, source, name in sorted(decorated)]
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            module.classes.append(_class(lines, node))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name.startswith("_") or node.name in SKIPPED_FUNCTION_NAMES:
+                continue
+            prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+            module.functions.append({
+                "name": node.name,
+                "signature": f"{prefix} {node.name}({ast.unparse(node.args)})"[:200],
+            })
+    return module
+
+
+def _class(lines: list[str], node: ast.ClassDef) -> PythonClass:
+    bases = ", ".join(_flat(_segment(lines, b)) for b in [*node.bases, *node.keywords])
+    header = f"class {node.name}({bases}):" if bases else f"class {node.name}:"
+    body = [
+        "    " + _flat(_segment(lines, stmt))
+        for stmt in node.body
+        if isinstance(stmt, (ast.Assign, ast.AnnAssign, ast.AugAssign))
+    ]
+    docstring = ast.get_docstring(node, clean=False) or ""
+    return PythonClass(
+        name=node.name,
+        header=header,
+        body="\n".join(body),
+        docstring=docstring.strip()[:200],
+        methods=[
+            stmt.name for stmt in node.body
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ][:10],
+    )
+
+
+def _segment(lines: list[str], node: ast.AST) -> str:
+    """Source text of ``node``; like ``ast.get_source_segment`` without re-splitting."""
+    first, last = node.lineno - 1, node.end_lineno - 1
+    # Column offsets are UTF-8 byte offsets
+    if first == last:
+        return lines[first].encode()[node.col_offset:node.end_col_offset].decode()
+    return "\n".join([
+        lines[first].encode()[node.col_offset:].decode(),
+        *lines[first + 1:last],
+        lines[last].encode()[:node.end_col_offset].decode(),
+    ])
+
+
+def _flat(source: str) -> str:
+    return _WS_RE.sub(" ", source)
@@ -2,6 +2,8 @@
 
 # Regex-based route patterns.
 # Each entry: name, file_glob, regex, group_map (output key -> capture group index).
+# Optional "ast": "decorator" matches regex against each decorator of a parsed
+# Python function instead of the raw text; regex is the fallback on syntax errors.
 ROUTE_PATTERNS: list[dict] = [
     # --- Python ---
     {
@@ -10,6 +12,7 @@ ROUTE_PATTERNS: list[dict] = [
         "regex": r'@(?:router|app)\.(get|post|put|patch|delete)\(\s*["\']([^"\']+)',
         "group_map": {"method": 1, "path": 2},
         "handler_lookahead": r"(?:async\s+)?def\s+(\w+)",
+        "ast": "decorator",
     },
     {
         "name": "flask",
@@ -18,6 +21,7 @@ ROUTE_PATTERNS: list[dict] = [
                  r'(?:.*methods\s*=\s*\[([^\]]+)\])?',
         "group_map": {"path": 1, "method": 2},
         "handler_lookahead": r"(?:async\s+)?def\s+(\w+)",
+        "ast": "decorator",
     },
     {
         "name": "django",
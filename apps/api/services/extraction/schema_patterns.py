@@ -1,6 +1,8 @@
 """Schema and validation extraction patterns."""
 
 # Each entry: name, file_glob, class_regex, field_regex, field_type_regex (optional).
+# Optional "ast": "class" matches class_regex against the header of each top-level
+# class of a parsed Python module and field regexes against its body statements.
 SCHEMA_PATTERNS: list[dict] = [
     # --- Python ---
     {
@@ -9,6 +11,7 @@ SCHEMA_PATTERNS: list[dict] = [
         "class_regex": r"^class\s+(\w+)\(.*(?:BaseModel|BaseSchema).*\):",
         "field_regex": r"^\s+(\w+):\s+",
         "field_type_regex": r"^\s+(\w+):\s+(\S+)",
+        "ast": "class",
     },
     {
         "name": "marshmallow",
@@ -16,6 +19,7 @@ SCHEMA_PATTERNS: list[dict] = [
         "class_regex": r"^class\s+(\w+)\(.*(?:Schema|ma\.Schema).*\):",
         "field_regex": r"^\s+(\w+)\s*=\s*(?:fields|ma)\.\w+",
         "field_type_regex": r"^\s+(\w+)\s*=\s*(?:fields|ma)\.(\w+)",
+        "ast": "class",
     },
     # --- JavaScript / TypeScript ---
     {
@@ -19,20 +19,17 @@ from packages.common.utils.error_handlers import bad_request, not_found
 class GitHubPatService(BaseService[GitHubPat]):
     """Manage encrypted GitHub Personal Access Tokens."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, http: httpx.AsyncClient | None = None) -> None:
         super().__init__(GitHubPat, session)
+        self.http = http
 
     async def verify_token(self, raw_token: str) -> dict:
         """Verify a GitHub token by calling the /user API."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"Bearer {raw_token}",
-                    "Accept": "application/vnd.github+json",
-                },
-                timeout=15,
-            )
+        if self.http is not None:
+            resp = await self._get_user(self.http, raw_token)
+        else:
+            async with httpx.AsyncClient() as client:
+                resp = await self._get_user(client, raw_token)
         if resp.status_code != 200:
             return {"valid": False}
 
@@ -46,6 +43,17 @@ class GitHubPatService(BaseService[GitHubPat]):
             "scopes": scopes or None,
         }
 
+    @staticmethod
+    async def _get_user(client: httpx.AsyncClient, raw_token: str) -> httpx.Response:
+        return await client.get(
+            "https://api.github.com/user",
+            headers={
+                "Authorization": f"Bearer {raw_token}",
+                "Accept": "application/vnd.github+json",
+            },
+            timeout=15,
+        )
+
     @staticmethod
     def _hash_token(raw_token: str) -> str:
         """Produce a deterministic SHA-256 hex digest for duplicate detection."""
@@ -0,0 +1,188 @@
+"""Artifact extraction in a child process with memory and time limits.
+
+A pathological repository (huge generated files, deeply nested sources,
+runaway regex backtracking) must not take the worker down with it. The
+extractor runs in a ``spawn`` child placed in its own process group; the
+child and its parse-pool workers split ``extraction_memory_limit_mb`` between
+them as per-process address-space caps (``RLIMIT_AS``), so the group as a
+whole stays within the limit. Each artifact category is sent back as soon as
+it is done, so when a category runs out of memory, the stage times out or
+the child dies, the scan still gets every category finished before that,
+plus warnings saying what is missing. A run that returns no stage list or no
+file tree is ``failed``; one missing other categories is ``partial``.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import Connection
+
+from apps.api.config import settings
+from apps.api.services.extraction.parse_pool import limit_memory, parse_workers
+from apps.api.services.extraction.pattern_runner import MAX_FILE_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Smallest address-space share worth giving one process; the parse pool is
+# shrunk (down to parsing inline) so that no share falls below it
+_MIN_PROCESS_MB = 512
+
+
+class ExtractionResult:
+    """Artifacts from one isolated run, with warnings when it was cut short."""
+
+    def __init__(self) -> None:
+        self.artifacts: dict = {}
+        self.warnings: list[str] = []
+        self.counters: dict[str, int] = {}
+        self.stage_names: list[str] = []
+
+    @property
+    def failed(self) -> bool:
+        """Nothing usable came back: no stage list, or no file tree."""
+        return not self.stage_names or "file_tree" not in self.artifacts
+
+    @property
+    def partial(self) -> bool:
+        return any(name not in self.artifacts for name in self.stage_names)
+
+
+def run_isolated_extraction(repo_dir: str) -> ExtractionResult:
+    """Extract artifacts from ``repo_dir`` in a limited child process (blocking)."""
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    proc = ctx.Process(
+        target=_child_main,
+        args=(repo_dir, sender, settings.extraction_memory_limit_mb),
+        name="mizanos-extract",
+    )
+    proc.start()
+    # Only the child writes; closing our copy makes recv() see EOF if it dies
+    sender.close()
+
+    result = ExtractionResult()
+    timeout = settings.extraction_timeout_seconds
+    deadline = time.monotonic() + timeout
+    finished = False
+    try:
+        finished = _collect(receiver, result, deadline, timeout, proc)
+    finally:
+        receiver.close()
+        _stop(proc, graceful=finished)
+
+    missing = [name for name in result.stage_names if name not in result.artifacts]
+    if not result.stage_names:
+        result.warnings.append("No artifacts extracted")
+    elif missing:
+        result.warnings.append(f"Artifacts not extracted: {', '.join(missing)}")
+    for warning in result.warnings:
+        logger.warning("Extraction of %s: %s", repo_dir, warning)
+    return result
+
+
+def _collect(
+    receiver: Connection, result: ExtractionResult, deadline: float,
+    timeout: int, proc: multiprocessing.Process,
+) -> bool:
+    """Read messages from the child until it is done, dies or runs out of time.
+
+    Returns True when the child reported every stage.
+    """
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not receiver.poll(remaining):
+            result.warnings.append(f"Extraction timed out after {timeout}s")
+            return False
+        try:
+            kind, key, value = receiver.recv()
+        except EOFError:
+            proc.join(timeout=1)
+            result.warnings.append(
+                f"Extraction process exited unexpectedly (exit code {proc.exitcode})",
+            )
+            return False
+        if kind == "stages":
+            result.stage_names = value
+        elif kind == "artifact":
+            result.artifacts[key] = value
+        elif kind == "warning":
+            result.warnings.append(value)
+        elif kind == "counters":
+            result.counters.update(value)
+        elif kind == "done":
+            return True
+
+
+def _stop(proc: multiprocessing.Process, graceful: bool) -> None:
+    """Kill the child's whole process group, after a short wait if it finished."""
+    if graceful:
+        proc.join(timeout=5)
+    try:
+        # The group also holds the child's parse-pool workers
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        # Not its own group leader yet (it had not reached setpgid), so it
+        # has no parse workers either
+        proc.kill()
+    proc.join(timeout=5)
+    if proc.is_alive():
+        logger.error("Extraction process %s did not exit after SIGKILL", proc.pid)
+
+
+def _memory_plan(limit_mb: int) -> tuple[int, int]:
+    """Parse-pool size and per-process cap keeping the child and its workers within ``limit_mb``."""
+    workers = parse_workers()
+    if not limit_mb:
+        return workers, 0
+    workers = max(0, min(workers, limit_mb // _MIN_PROCESS_MB - 1))
+    return workers, limit_mb // (workers + 1)
+
+
+def _child_main(repo_dir: str, conn: Connection, memory_limit_mb: int) -> None:
+    """Child entry point: run each extraction stage and stream results back."""
+    os.setpgid(0, 0)
+    workers, process_limit_mb = _memory_plan(memory_limit_mb)
+    limit_memory(process_limit_mb)
+
+    from apps.api.services.artifact_extractor import ArtifactExtractor
+    from apps.api.services.extraction.blob_cache import BlobCache
+    from apps.api.services.extraction.parse_pool import get_parse_pool, shutdown_parse_pool
+
+    cache = BlobCache(settings.extraction_cache_path) if settings.extraction_cache_path else None
+    executor = get_parse_pool(workers, process_limit_mb) if workers else None
+    extractor = ArtifactExtractor(executor=executor, cache=cache)
+    try:
+        stages = extractor.stages(repo_dir)
+        conn.send(("stages", None, [name for name, _ in stages]))
+        for name, produce in stages:
+            try:
+                # Pickling happens before anything is written, so a failed
+                # send leaves the pipe usable
+                conn.send(("artifact", name, produce()))
+            except MemoryError:
+                conn.send((
+                    "warning", None,
+                    f"{name}: memory limit of {process_limit_mb} MiB reached",
+                ))
+            except Exception as exc:
+                # e.g. BrokenProcessPool when a parse worker hits the limit
+                conn.send(("warning", None, f"{name}: {type(exc).__name__}: {exc}"[:300]))
+
+        if extractor.oversized_files:
+            conn.send((
+                "warning", None,
+                f"{len(extractor.oversized_files)} files over "
+                f"{MAX_FILE_BYTES // 1024} KiB were not parsed",
+            ))
+        counters = {"oversized_files": len(extractor.oversized_files)}
+        if cache is not None:
+            counters.update(cache_hits=cache.hits, cache_misses=cache.misses)
+        conn.send(("counters", None, counters))
+        conn.send(("done", None, None))
+    finally:
+        shutdown_parse_pool()
+        if cache is not None:
+            cache.close()
+        conn.close()
@@ -0,0 +1,87 @@
+"""Job progress events — Redis pub/sub fan-out for live job status."""
+
+import json
+import logging
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from apps.api.models.job import Job
+from packages.common.db.session import async_session_factory
+from packages.common.redis import get_arq_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "mizan:job-events"
+TERMINAL_STATUSES = {"completed", "failed"}
+_KEEPALIVE_SECONDS = 15.0
+
+
+def job_channel(job_id: UUID | str) -> str:
+    """Redis pub/sub channel name for a job."""
+    return f"{CHANNEL_PREFIX}:{job_id}"
+
+
+async def publish_job_event(job_id: UUID, event: dict) -> None:
+    """Publish a progress/status event for a job. Never raises."""
+    try:
+        redis = await get_arq_redis()
+        await redis.publish(job_channel(job_id), json.dumps(event, default=str))
+    except Exception:
+        logger.debug("Failed to publish event for job %s", job_id, exc_info=True)
+
+
+def job_snapshot(job: Job) -> dict:
+    """Event payload describing a job's persisted state."""
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "progress": job.progress,
+        "progress_message": job.progress_message,
+        "error_message": job.error_message,
+    }
+
+
+async def _load_snapshot(job_id: UUID) -> dict | None:
+    async with async_session_factory() as session:
+        job = await session.get(Job, job_id)
+        return job_snapshot(job) if job else None
+
+
+async def stream_job_events(job_id: UUID) -> AsyncIterator[str]:
+    """Yield SSE frames: the current DB state, then live events until terminal.
+
+    Subscribes before reading the snapshot so no event published in between
+    is lost; the snapshot uses its own short-lived session so no pooled
+    connection is held while streaming. Sends keepalive comments while idle.
+    """
+    redis = await get_arq_redis()
+    pubsub = redis.pubsub()
+    await pubsub.subscribe(job_channel(job_id))
+    try:
+        snapshot = await _load_snapshot(job_id)
+        if snapshot is None:
+            return
+        yield f"data: {json.dumps(snapshot, default=str)}\n\n"
+        if snapshot["status"] in TERMINAL_STATUSES:
+            return
+
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=_KEEPALIVE_SECONDS,
+            )
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            data = message["data"]
+            if isinstance(data, bytes):
+                data = data.decode()
+            yield f"data: {data}\n\n"
+            try:
+                status = json.loads(data).get("status")
+            except (json.JSONDecodeError, AttributeError):
+                status = None
+            if status in TERMINAL_STATUSES:
+                return
+    finally:
+        await pubsub.unsubscribe(job_channel(job_id))
+        await pubsub.aclose()
@@ -7,6 +7,8 @@ from uuid import UUID
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.api.jobs.limits import enqueue_options, job_limit
+from apps.api.jobs.stats import load_worker_stats
 from apps.api.models.job import Job
 from apps.api.services.base_service import BaseService
 from packages.common.redis import get_arq_redis
@@ -43,7 +45,9 @@ class JobService(BaseService[Job]):
         await self.repo.session.refresh(job)
 
         redis = await get_arq_redis()
-        arq_job = await redis.enqueue_job(arq_function, str(job.id))
+        arq_job = await redis.enqueue_job(
+            arq_function, str(job.id), **enqueue_options(arq_function),
+        )
         if arq_job:
             job.arq_job_id = arq_job.job_id
             await self.repo.session.flush()
@@ -112,3 +116,17 @@ class JobService(BaseService[Job]):
         stmt = stmt.order_by(Job.created_at.desc()).offset(offset).limit(limit)
         result = await self.repo.session.execute(stmt)
         return list(result.scalars().all()), total
+
+    async def get_worker_stats(self) -> dict:
+        """Queue depth, throughput and queue latency per registered job type."""
+        # The worker module pulls in the job code and its SDKs; only load it here
+        from apps.api.jobs.worker import WorkerSettings
+
+        redis = await get_arq_redis()
+        functions = [function.name for function in WorkerSettings.functions]
+        stats = await load_worker_stats(redis, functions)
+        for entry in stats["job_types"]:
+            limit = job_limit(entry["function"])
+            entry["max_concurrent"] = limit.max_concurrent
+            entry["priority"] = limit.priority
+        return stats
@@ -1,6 +1,10 @@
 """Lovable project extractor — scans source to produce a LovableManifest."""
 
+import fnmatch
+import os
 import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from apps.api.schemas.lovable_manifest import (
@@ -18,18 +22,82 @@ _FILTER_METHODS = {"eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike",
 
 _FILTER_RE = re.compile(r'\.(' + '|'.join(_FILTER_METHODS) + r')\(')
 
+# Manifests per commit SHA — a commit's tree never changes, so neither does its manifest
+_MANIFEST_CACHE_SIZE = 16
+_manifest_cache: OrderedDict[str, LovableManifest] = OrderedDict()
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text()
+    except (UnicodeDecodeError, PermissionError):
+        return None
+
+
+@dataclass
+class SourceTree:
+    """Every file the extractors consume, walked and read once.
+
+    ``src_files`` holds ``src/**/*.ts*`` outside ``node_modules`` and
+    ``sql_files`` holds ``supabase/migrations/**/*.sql``, both in ``rglob``
+    order. Unreadable files are kept with ``None`` content so that
+    extractors which only need paths still see them.
+    """
+
+    root: Path
+    src_files: list[tuple[Path, str | None]] = field(default_factory=list)
+    sql_files: list[tuple[Path, str | None]] = field(default_factory=list)
+    _index: dict[Path, str | None] | None = field(default=None, repr=False)
+
+    @classmethod
+    def load(cls, source_path: Path) -> "SourceTree":
+        tree = cls(root=source_path)
+        tree.src_files = cls._walk(source_path / "src", "*.ts*", prune="node_modules")
+        tree.sql_files = cls._walk(source_path / "supabase" / "migrations", "*.sql")
+        return tree
+
+    @staticmethod
+    def _walk(
+        base: Path, pattern: str, prune: str | None = None,
+    ) -> list[tuple[Path, str | None]]:
+        files: list[tuple[Path, str | None]] = []
+        # os.walk top-down visits directories and files in the same order as rglob
+        for dirpath, dirnames, filenames in os.walk(base):
+            if prune:
+                dirnames[:] = [d for d in dirnames if d != prune]
+            for name in filenames:
+                if fnmatch.fnmatchcase(name, pattern):
+                    path = Path(dirpath) / name
+                    files.append((path, _read(path)))
+        return files
+
+    def ts_sources(self):
+        """Yield ``(path, content)`` for readable src/**/*.ts* files."""
+        for path, content in self.src_files:
+            if content is not None:
+                yield path, content
+
+    def text(self, path: Path) -> str:
+        """Content of a src file, reading it directly if it was not walked."""
+        if self._index is None:
+            self._index = dict(self.src_files)
+        content = self._index.get(path)
+        return content if content is not None else path.read_text()
+
 
 class LovableExtractor:
     """Extracts structured manifest from a Lovable/Supabase project."""
 
     # ── Table extraction ────────────────────────────────────────────
 
-    def extract_tables(self, source_path: Path) -> list[ExtractedTable]:
+    def extract_tables(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedTable]:
         """Parse src/integrations/supabase/types.ts for table definitions."""
         types_file = source_path / "src" / "integrations" / "supabase" / "types.ts"
         if not types_file.exists():
             return []
-        content = types_file.read_text()
+        content = (tree or SourceTree.load(source_path)).text(types_file)
         tables = []
         table_pattern = re.compile(
             r'(\w+):\s*\{[^}]*Row:\s*\{([^}]+)\}', re.DOTALL
@@ -49,7 +117,9 @@ class LovableExtractor:
 
     # ── Query extraction (enriched with filters) ────────────────────
 
-    def extract_queries(self, source_path: Path) -> list[ExtractedQuery]:
+    def extract_queries(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedQuery]:
         """Grep .ts/.tsx files for .from() Supabase query calls with filters."""
         queries = []
         src_dir = source_path / "src"
@@ -58,13 +128,8 @@ class LovableExtractor:
         pattern = re.compile(
             r'\.from\(["\'](\w+)["\']\)\s*\.(select|insert|update|delete|upsert)\(([^)]*)\)'
         )
-        for ts_file in src_dir.rglob("*.ts*"):
-            if "node_modules" in str(ts_file):
-                continue
-            try:
-                content = ts_file.read_text()
-            except (UnicodeDecodeError, PermissionError):
-                continue
+        tree = tree or SourceTree.load(source_path)
+        for ts_file, content in tree.ts_sources():
             for match in pattern.finditer(content):
                 # Look ahead for chained filter calls
                 rest = content[match.end():match.end() + 500]
@@ -80,20 +145,17 @@ class LovableExtractor:
 
     # ── RPC extraction ──────────────────────────────────────────────
 
-    def extract_rpc_calls(self, source_path: Path) -> list[ExtractedRPC]:
+    def extract_rpc_calls(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedRPC]:
         """Grep for .rpc("fn_name") calls."""
         rpcs: list[ExtractedRPC] = []
         src_dir = source_path / "src"
         if not src_dir.exists():
             return []
         rpc_re = re.compile(r'\.rpc\(["\'](\w+)["\'](?:,\s*(\{[^}]*\}))?\)')
-        for ts_file in src_dir.rglob("*.ts*"):
-            if "node_modules" in str(ts_file):
-                continue
-            try:
-                content = ts_file.read_text()
-            except (UnicodeDecodeError, PermissionError):
-                continue
+        tree = tree or SourceTree.load(source_path)
+        for ts_file, content in tree.ts_sources():
             for match in rpc_re.finditer(content):
                 rpcs.append(ExtractedRPC(
                     function_name=match.group(1),
@@ -104,7 +166,9 @@ class LovableExtractor:
 
     # ── Storage extraction ──────────────────────────────────────────
 
-    def extract_storage_buckets(self, source_path: Path) -> list[ExtractedStorageBucket]:
+    def extract_storage_buckets(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedStorageBucket]:
         """Grep for .storage.from("bucket") calls."""
         buckets_map: dict[str, ExtractedStorageBucket] = {}
         src_dir = source_path / "src"
@@ -113,13 +177,8 @@ class LovableExtractor:
         storage_re = re.compile(
             r'\.storage\s*\.from\(["\'](\w+)["\']\)\s*\.(upload|download|getPublicUrl|remove|list|createSignedUrl)\('
         )
-        for ts_file in src_dir.rglob("*.ts*"):
-            if "node_modules" in str(ts_file):
-                continue
-            try:
-                content = ts_file.read_text()
-            except (UnicodeDecodeError, PermissionError):
-                continue
+        tree = tree or SourceTree.load(source_path)
+        for ts_file, content in tree.ts_sources():
             for match in storage_re.finditer(content):
                 bucket = match.group(1)
                 operation = match.group(2)
@@ -136,7 +195,7 @@ class LovableExtractor:
     # ── Realtime extraction ─────────────────────────────────────────
 
     def extract_realtime_subscriptions(
-        self, source_path: Path,
+        self, source_path: Path, tree: SourceTree | None = None,
     ) -> list[ExtractedRealtimeSubscription]:
         """Grep for .channel().on() realtime subscriptions."""
         subs: list[ExtractedRealtimeSubscription] = []
@@ -150,13 +209,8 @@ class LovableExtractor:
             r'\.on\(\s*["\']?(\w+)["\']?\s*,'
             r'\s*\{[^}]*(?:table:\s*["\'](\w+)["\'])?[^}]*(?:event:\s*["\'](\w+)["\'])?[^}]*\}'
         )
-        for ts_file in src_dir.rglob("*.ts*"):
-            if "node_modules" in str(ts_file):
-                continue
-            try:
-                content = ts_file.read_text()
-            except (UnicodeDecodeError, PermissionError):
-                continue
+        tree = tree or SourceTree.load(source_path)
+        for ts_file, content in tree.ts_sources():
             for ch_match in channel_re.finditer(content):
                 channel_name = ch_match.group(1)
                 rest = content[ch_match.end():ch_match.end() + 500]
@@ -173,7 +227,9 @@ class LovableExtractor:
 
     # ── Environment variable extraction ──────────────────────────────
 
-    def extract_env_vars(self, source_path: Path) -> list[ExtractedEnvVar]:
+    def extract_env_vars(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedEnvVar]:
         """Grep for process.env.* and import.meta.env.* references."""
         env_vars_map: dict[str, ExtractedEnvVar] = {}
         src_dir = source_path / "src"
@@ -182,13 +238,8 @@ class LovableExtractor:
         env_re = re.compile(
             r'(?:process\.env\.([\w]+)|import\.meta\.env\.([\w]+))'
         )
-        for ts_file in src_dir.rglob("*.ts*"):
-            if "node_modules" in str(ts_file):
-                continue
-            try:
-                content = ts_file.read_text()
-            except (UnicodeDecodeError, PermissionError):
-                continue
+        tree = tree or SourceTree.load(source_path)
+        for ts_file, content in tree.ts_sources():
             for match in env_re.finditer(content):
                 proc_name = match.group(1)
                 meta_name = match.group(2)
@@ -204,7 +255,9 @@ class LovableExtractor:
 
     # ── Existing extractors ─────────────────────────────────────────
 
-    def extract_edge_functions(self, source_path: Path) -> list[ExtractedEdgeFunction]:
+    def extract_edge_functions(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedEdgeFunction]:
         """Scan supabase/functions/ + grep for .functions.invoke() calls."""
         functions: list[ExtractedEdgeFunction] = []
         fn_dir = source_path / "supabase" / "functions"
@@ -217,13 +270,8 @@ class LovableExtractor:
         caller_map: dict[str, list[str]] = {name: [] for name in fn_names}
         src_dir = source_path / "src"
         if src_dir.exists():
-            for ts_file in src_dir.rglob("*.ts*"):
-                if "node_modules" in str(ts_file):
-                    continue
-                try:
-                    content = ts_file.read_text()
-                except (UnicodeDecodeError, PermissionError):
-                    continue
+            tree = tree or SourceTree.load(source_path)
+            for ts_file, content in tree.ts_sources():
                 for match in invoke_pattern.finditer(content):
                     name = match.group(1)
                     fn_names.add(name)
@@ -236,20 +284,17 @@ class LovableExtractor:
             ))
         return functions
 
-    def extract_auth_patterns(self, source_path: Path) -> list[ExtractedAuth]:
+    def extract_auth_patterns(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedAuth]:
         """Grep for supabase.auth.* calls."""
         patterns: list[ExtractedAuth] = []
         auth_re = re.compile(r'supabase\.auth\.(\w+)\(([^)]*)\)')
         src_dir = source_path / "src"
         if not src_dir.exists():
             return []
-        for ts_file in src_dir.rglob("*.ts*"):
-            if "node_modules" in str(ts_file):
-                continue
-            try:
-                content = ts_file.read_text()
-            except (UnicodeDecodeError, PermissionError):
-                continue
+        tree = tree or SourceTree.load(source_path)
+        for ts_file, content in tree.ts_sources():
             for match in auth_re.finditer(content):
                 patterns.append(ExtractedAuth(
                     pattern=f"auth.{match.group(1)}",
@@ -258,13 +303,15 @@ class LovableExtractor:
                 ))
         return patterns
 
-    def extract_routes(self, source_path: Path) -> list[ExtractedRoute]:
+    def extract_routes(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedRoute]:
         """Parse App.tsx for <Route> elements."""
         routes: list[ExtractedRoute] = []
         app_file = source_path / "src" / "App.tsx"
         if not app_file.exists():
             return []
-        content = app_file.read_text()
+        content = (tree or SourceTree.load(source_path)).text(app_file)
         route_re = re.compile(
             r'<Route\s+[^>]*path=["\']([^"\']+)["\'][^>]*element=\{<(\w+)'
         )
@@ -277,20 +324,19 @@ class LovableExtractor:
             ))
         return routes
 
-    def extract_components(self, source_path: Path) -> list[ExtractedComponent]:
+    def extract_components(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedComponent]:
         """List .tsx component files with LOC and Supabase deps."""
         components: list[ExtractedComponent] = []
         comp_dir = source_path / "src" / "components"
         if not comp_dir.exists():
             return []
-        for tsx_file in comp_dir.rglob("*.tsx"):
-            if "node_modules" in str(tsx_file):
-                continue
-            try:
-                content = tsx_file.read_text()
-                loc = len(content.splitlines())
-            except (UnicodeDecodeError, PermissionError):
+        tree = tree or SourceTree.load(source_path)
+        for tsx_file, content in tree.ts_sources():
+            if tsx_file.suffix != ".tsx" or not tsx_file.is_relative_to(comp_dir):
                 continue
+            loc = len(content.splitlines())
             supabase_deps = list(set(
                 m.group(1) for m in re.finditer(r'\.from\(["\'](\w+)["\']\)', content)
             ))
@@ -302,18 +348,17 @@ class LovableExtractor:
             ))
         return components
 
-    def extract_hooks(self, source_path: Path) -> list[ExtractedHook]:
+    def extract_hooks(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedHook]:
         """Categorize hooks as query/mutation/utility."""
         hooks: list[ExtractedHook] = []
         hooks_dir = source_path / "src" / "hooks"
         if not hooks_dir.exists():
             hooks_dir = source_path / "src"
-        for ts_file in hooks_dir.rglob("use*.ts*"):
-            if "node_modules" in str(ts_file):
-                continue
-            try:
-                content = ts_file.read_text()
-            except (UnicodeDecodeError, PermissionError):
+        tree = tree or SourceTree.load(source_path)
+        for ts_file, content in tree.ts_sources():
+            if not ts_file.name.startswith("use") or not ts_file.is_relative_to(hooks_dir):
                 continue
             if "useQuery" in content or ".select(" in content:
                 hook_type = "query"
@@ -336,7 +381,9 @@ class LovableExtractor:
             ))
         return hooks
 
-    def extract_rls_policies(self, source_path: Path) -> list[ExtractedRLSPolicy]:
+    def extract_rls_policies(
+        self, source_path: Path, tree: SourceTree | None = None,
+    ) -> list[ExtractedRLSPolicy]:
         """Parse SQL migration files for CREATE POLICY statements."""
         policies: list[ExtractedRLSPolicy] = []
         migrations_dir = source_path / "supabase" / "migrations"
@@ -347,10 +394,9 @@ class LovableExtractor:
             r'(?:AS\s+\w+\s+)?FOR\s+(\w+)\s+.*?(?:USING|WITH CHECK)\s*\((.+?)\)\s*;',
             re.DOTALL | re.IGNORECASE,
         )
-        for sql_file in migrations_dir.rglob("*.sql"):
-            try:
-                content = sql_file.read_text()
-            except (UnicodeDecodeError, PermissionError):
+        tree = tree or SourceTree.load(source_path)
+        for _, content in tree.sql_files:
+            if content is None:
                 continue
             for match in policy_re.finditer(content):
                 policies.append(ExtractedRLSPolicy(
@@ -431,26 +477,38 @@ class LovableExtractor:
 
     # ── Orchestrator ────────────────────────────────────────────────
 
-    def extract_manifest(self, source_path_str: str) -> LovableManifest:
-        """Orchestrate full extraction."""
+    def extract_manifest(
+        self, source_path_str: str, commit_sha: str | None = None,
+    ) -> LovableManifest:
+        """Orchestrate full extraction.
+
+        The source tree is walked and read once and shared by every
+        extractor. When ``commit_sha`` is given the manifest is memoized
+        under it, so rescanning an unchanged commit skips extraction.
+        """
+        if commit_sha and commit_sha in _manifest_cache:
+            _manifest_cache.move_to_end(commit_sha)
+            return _manifest_cache[commit_sha].model_copy(deep=True)
+
         source_path = Path(source_path_str)
-        tables = self.extract_tables(source_path)
-        queries = self.extract_queries(source_path)
-        edge_functions = self.extract_edge_functions(source_path)
-        rls_policies = self.extract_rls_policies(source_path)
-        routes = self.extract_routes(source_path)
-        components = self.extract_components(source_path)
-        hooks = self.extract_hooks(source_path)
-        auth_patterns = self.extract_auth_patterns(source_path)
-        rpc_calls = self.extract_rpc_calls(source_path)
-        storage_buckets = self.extract_storage_buckets(source_path)
-        realtime_subs = self.extract_realtime_subscriptions(source_path)
-        env_vars = self.extract_env_vars(source_path)
+        tree = SourceTree.load(source_path)
+        tables = self.extract_tables(source_path, tree)
+        queries = self.extract_queries(source_path, tree)
+        edge_functions = self.extract_edge_functions(source_path, tree)
+        rls_policies = self.extract_rls_policies(source_path, tree)
+        routes = self.extract_routes(source_path, tree)
+        components = self.extract_components(source_path, tree)
+        hooks = self.extract_hooks(source_path, tree)
+        auth_patterns = self.extract_auth_patterns(source_path, tree)
+        rpc_calls = self.extract_rpc_calls(source_path, tree)
+        storage_buckets = self.extract_storage_buckets(source_path, tree)
+        realtime_subs = self.extract_realtime_subscriptions(source_path, tree)
+        env_vars = self.extract_env_vars(source_path, tree)
 
         domain_table_map = self._deduce_domains(tables, queries)
         domains = sorted(domain_table_map.keys())
 
-        return LovableManifest(
+        manifest = LovableManifest(
             tables=tables,
             queries=queries,
             edge_functions=edge_functions,
@@ -479,3 +537,8 @@ class LovableExtractor:
                 total_env_vars=len(env_vars),
             ),
         )
+        if commit_sha:
+            _manifest_cache[commit_sha] = manifest.model_copy(deep=True)
+            while len(_manifest_cache) > _MANIFEST_CACHE_SIZE:
+                _manifest_cache.popitem(last=False)
+        return manifest
@@ -22,18 +22,23 @@ class MilestoneService:
         )
         result = await self.session.execute(stmt)
         milestones = list(result.scalars().all())
+        if not milestones:
+            return []
 
-        output = []
-        for m in milestones:
-            count_stmt = select(func.count()).select_from(Task).where(
-                Task.milestone_id == m.id, Task.is_draft == False
-            )
-            task_count = (await self.session.execute(count_stmt)).scalar_one()
-            output.append({
+        count_stmt = (
+            select(Task.milestone_id, func.count())
+            .where(Task.milestone_id.in_([m.id for m in milestones]), Task.is_draft == False)
+            .group_by(Task.milestone_id)
+        )
+        task_counts = dict((await self.session.execute(count_stmt)).all())
+
+        return [
+            {
                 **{c.key: getattr(m, c.key) for c in m.__table__.columns},
-                "task_count": task_count,
-            })
-        return output
+                "task_count": task_counts.get(m.id, 0),
+            }
+            for m in milestones
+        ]
 
     async def get_milestone(self, milestone_id: UUID) -> Milestone:
         m = await self.session.get(Milestone, milestone_id)
@@ -3,16 +3,26 @@
 import asyncio
 import json
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
 
 from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.api.config import settings
+from apps.api.observability.tracing import llm_span, record_llm_usage
+from apps.api.services.evidence_stream import EvidenceStream
 from apps.api.services.llm_config import get_llm_config
 from apps.api.services.scan_prompts import (
     HIGH_LEVEL_SYSTEM_PROMPT,
     HIGH_LEVEL_USER_TEMPLATE,
     TASK_EVIDENCE_SCHEMA,
 )
+from apps.api.services.token_estimator import estimate_tokens
+
+if TYPE_CHECKING:
+    from apps.api.jobs.resources import LLMGateway
 
 logger = logging.getLogger(__name__)
 
@@ -30,44 +40,76 @@ _CATEGORY_LIMITS = {
     "pages": 50, "migrations": 20, "configs": 10,
 }
 
-BATCH_SIZE = 20
+# Output JSON runs ~120 tokens per task; completions are capped at 4096
+_OUTPUT_TOKENS_PER_TASK = 120
+_OUTPUT_TOKEN_OVERHEAD = 256
+_MAX_OUTPUT_TOKENS = 4096
+MAX_BATCH_TASKS = (_MAX_OUTPUT_TOKENS - _OUTPUT_TOKEN_OVERHEAD) // _OUTPUT_TOKENS_PER_TASK
+# Task tokens per batch when the artifacts alone fill the prompt budget
+_MIN_TASK_TOKENS = 2000
+# Seconds allowed for one batch's whole streamed response
+_BATCH_TIMEOUT = 180.0
+
+VerdictCallback = Callable[[dict], Awaitable[None]]
+
+
+def _dump(value) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
 
 
 class ProgressMatcherService:
     """Sends tasks + artifacts to an LLM for evidence matching."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, llm: "LLMGateway | None" = None,
+        on_verdict: VerdictCallback | None = None,
+    ) -> None:
         self.session = session
-
-    async def match(self, tasks: list[dict], artifacts: dict) -> dict:
-        """Call LLM to match tasks against extracted artifacts."""
+        # Worker-wide client pool; without it each batch builds its own client
+        self.llm = llm
+        # Awaited with each task's evidence as soon as it is streamed in
+        self.on_verdict = on_verdict
+        # Per-batch latency and token usage, read by the scan job for metrics
+        self.batch_stats: list[dict] = []
+        # Evidence received so far, by task_id
+        self.evidence: dict[str, dict] = {}
+
+    async def match(
+        self, tasks: list[dict], artifacts: dict, known: dict[str, dict] | None = None,
+    ) -> dict:
+        """Call LLM to match tasks against extracted artifacts.
+
+        Tasks with evidence in ``known`` (e.g. stored by an interrupted run
+        of the same job) are not sent again but count in the summary.
+        """
         if not tasks:
             return _DEFAULT_RESULT
 
-        llm_cfg = await get_llm_config(self.session)
-        trimmed = self._budget_artifacts(artifacts)
-
-        if len(tasks) <= BATCH_SIZE:
-            return await self._match_batch(tasks, trimmed, llm_cfg)
-
-        # Batch for large task lists — run in parallel
-        batches = [tasks[i:i + BATCH_SIZE] for i in range(0, len(tasks), BATCH_SIZE)]
-        logger.info("Splitting %d tasks into %d batches (parallel)", len(tasks), len(batches))
-
-        results = await asyncio.gather(
-            *(self._match_batch(batch, trimmed, llm_cfg) for batch in batches),
-            return_exceptions=True,
-        )
-
-        all_evidence: list[dict] = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.warning("Batch %d failed: %s", i, result)
-                continue
-            all_evidence.extend(result.get("task_evidence", []))
-
-        summary = _compute_summary(all_evidence, len(tasks))
-        return {"scan_summary": summary, "task_evidence": all_evidence}
+        self.evidence = dict(known or {})
+        pending = [t for t in tasks if t["task_id"] not in self.evidence]
+        if pending:
+            llm_cfg = await get_llm_config(self.session)
+            trimmed = self._budget_artifacts(artifacts)
+            batches = self._pack_batches(self._compact_tasks(pending), trimmed)
+            if len(batches) > 1:
+                # Batch for large task lists — run in parallel
+                logger.info("Packed %d tasks into %d batches (parallel)", len(pending), len(batches))
+
+            results = await asyncio.gather(
+                *(self._match_batch(batch, trimmed, llm_cfg) for batch in batches),
+                return_exceptions=True,
+            )
+            errors = [r for r in results if isinstance(r, Exception)]
+            for error in errors:
+                logger.warning("Batch failed: %r", error)
+            # Verdicts streamed before a failure are kept; fail only when
+            # nothing at all came back
+            if errors and len(errors) == len(batches) and len(self.evidence) == len(known or {}):
+                raise errors[0]
+
+        evidence = [self.evidence[t["task_id"]] for t in tasks if t["task_id"] in self.evidence]
+        summary = _compute_summary(evidence, len(tasks))
+        return {"scan_summary": summary, "task_evidence": evidence}
 
     @staticmethod
     def _compact_tasks(tasks: list[dict]) -> list[dict]:
@@ -83,15 +125,41 @@ class ProgressMatcherService:
             for t in tasks
         ]
 
-    async def _match_batch(self, tasks: list[dict], artifacts: dict, llm_cfg) -> dict:
-        """Match a single batch of tasks against artifacts."""
-        compact_tasks = self._compact_tasks(tasks)
-        tasks_json = json.dumps(compact_tasks, separators=(",", ":"), default=str)
-        truncation_note = self._truncation_note(artifacts)
-
-        _dump = lambda v: json.dumps(v, separators=(",", ":"))
+    def _pack_batches(self, tasks: list[dict], artifacts: dict) -> list[list[dict]]:
+        """Pack tasks, in order, into as few batches as fit the prompt budget.
 
-        user_msg = HIGH_LEVEL_USER_TEMPLATE.format(
+        Every batch repeats the system prompt and artifacts; what is left of
+        the budget goes to task JSON. Batches are also capped at the task
+        count whose output fits in one completion.
+        """
+        fixed = estimate_tokens(
+            HIGH_LEVEL_SYSTEM_PROMPT + TASK_EVIDENCE_SCHEMA
+            + self._user_message([], artifacts),
+        )
+        budget = settings.scan_prompt_token_budget - fixed
+        if budget < _MIN_TASK_TOKENS:
+            logger.warning(
+                "Artifacts use ~%d of %d prompt tokens; batches will exceed the budget",
+                fixed, settings.scan_prompt_token_budget,
+            )
+            budget = _MIN_TASK_TOKENS
+
+        batches: list[list[dict]] = []
+        current: list[dict] = []
+        used = 0
+        for task in tasks:
+            cost = estimate_tokens(_dump(task)) + 1
+            if current and (used + cost > budget or len(current) >= MAX_BATCH_TASKS):
+                batches.append(current)
+                current, used = [], 0
+            current.append(task)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _user_message(self, tasks: list[dict], artifacts: dict) -> str:
+        return HIGH_LEVEL_USER_TEMPLATE.format(
             task_count=len(tasks),
             file_count=len(artifacts.get("file_tree", [])),
             route_count=len(artifacts.get("routes", [])),
@@ -99,8 +167,8 @@ class ProgressMatcherService:
             schema_count=len(artifacts.get("schemas", [])),
             component_count=len(artifacts.get("components", [])),
             function_count=len(artifacts.get("functions", [])),
-            truncation_note=truncation_note,
-            tasks_json=tasks_json,
+            truncation_note=self._truncation_note(artifacts),
+            tasks_json=_dump(tasks),
             routes_json=_dump(artifacts.get("routes", [])),
             models_json=_dump(artifacts.get("models", [])),
             schemas_json=_dump(artifacts.get("schemas", [])),
@@ -109,31 +177,109 @@ class ProgressMatcherService:
             file_tree_json="\n".join(artifacts.get("file_tree", [])),
         )
 
-        system_msg = HIGH_LEVEL_SYSTEM_PROMPT + TASK_EVIDENCE_SCHEMA
-        client = AsyncOpenAI(
-            api_key=llm_cfg.api_key,
-            base_url=llm_cfg.base_url,
-            timeout=120.0,
+    async def _match_batch(self, tasks: list[dict], artifacts: dict, llm_cfg) -> None:
+        """Match one batch of compacted tasks, adding to ``self.evidence``.
+
+        When a response is cut off or isn't valid JSON, the tasks it left
+        without a verdict are retried as two half-size batches, down to
+        single tasks.
+        """
+        raw, truncated = await self._stream_batch(tasks, artifacts, llm_cfg)
+        missing = [t for t in tasks if t["task_id"] not in self.evidence]
+        if not missing or len(tasks) == 1:
+            return
+        if not truncated and self._load_json(raw) is not None:
+            # A complete response that skipped tasks; asking again won't help
+            return
+        logger.info(
+            "Batch of %d tasks returned unusable JSON; retrying %d without a verdict",
+            len(tasks), len(missing),
         )
+        mid = max(len(missing) // 2, 1)
+        await asyncio.gather(*(
+            self._match_batch(part, artifacts, llm_cfg)
+            for part in (missing[:mid], missing[mid:]) if part
+        ))
+
+    async def _stream_batch(
+        self, tasks: list[dict], artifacts: dict, llm_cfg,
+    ) -> tuple[str, bool]:
+        """Stream a completion, recording each verdict as it arrives.
+
+        Returns the full text and whether it hit max_tokens.
+        """
+        user_msg = self._user_message(tasks, artifacts)
+        system_msg = HIGH_LEVEL_SYSTEM_PROMPT + TASK_EVIDENCE_SCHEMA
+        if self.llm is not None:
+            client = self.llm.client(llm_cfg.api_key, llm_cfg.base_url)
+        else:
+            client = AsyncOpenAI(
+                api_key=llm_cfg.api_key,
+                base_url=llm_cfg.base_url,
+                timeout=120.0,
+            )
 
-        # Lean max_tokens: ~120 tokens per task for output JSON
-        scan_max_tokens = min(max(llm_cfg.max_tokens, len(tasks) * 120 + 256), 4096)
-
-        response = await asyncio.wait_for(
-            client.chat.completions.create(
-                model=llm_cfg.model,
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": user_msg},
-                ],
-                temperature=0.2,
-                max_tokens=scan_max_tokens,
-            ),
-            timeout=180.0,
+        scan_max_tokens = min(
+            max(llm_cfg.max_tokens, len(tasks) * _OUTPUT_TOKENS_PER_TASK + _OUTPUT_TOKEN_OVERHEAD),
+            _MAX_OUTPUT_TOKENS,
         )
 
-        raw = response.choices[0].message.content or ""
-        return self._parse_response(raw, len(tasks))
+        batch_ids = {t["task_id"] for t in tasks}
+        parser = EvidenceStream()
+        parts: list[str] = []
+        finish_reason = None
+        usage = None
+        stats = {
+            "tasks": len(tasks),
+            "estimated_prompt_tokens": estimate_tokens(system_msg + user_msg),
+        }
+        self.batch_stats.append(stats)
+
+        started = time.perf_counter()
+        with llm_span("chat", llm_cfg.model) as span:
+            span.set_attribute("mizan.scan.batch_tasks", len(tasks))
+            try:
+                async with asyncio.timeout(_BATCH_TIMEOUT):
+                    stream = await client.chat.completions.create(
+                        model=llm_cfg.model,
+                        messages=[
+                            {"role": "system", "content": system_msg},
+                            {"role": "user", "content": user_msg},
+                        ],
+                        temperature=0.2,
+                        max_tokens=scan_max_tokens,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                    )
+                    async for chunk in stream:
+                        usage = chunk.usage or usage
+                        if not chunk.choices:
+                            continue
+                        choice = chunk.choices[0]
+                        finish_reason = choice.finish_reason or finish_reason
+                        delta = choice.delta.content
+                        if not delta:
+                            continue
+                        parts.append(delta)
+                        for item in parser.feed(delta):
+                            await self._record(item, batch_ids)
+            finally:
+                stats.update(
+                    latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                    prompt_tokens=getattr(usage, "prompt_tokens", None),
+                    completion_tokens=getattr(usage, "completion_tokens", None),
+                )
+                record_llm_usage(span, usage)
+        return "".join(parts), finish_reason == "length"
+
+    async def _record(self, item: dict, batch_ids: set[str]) -> None:
+        """Keep one streamed verdict, ignoring ids outside the batch and repeats."""
+        task_id = str(item.get("task_id", ""))
+        if task_id not in batch_ids or task_id in self.evidence:
+            return
+        self.evidence[task_id] = item
+        if self.on_verdict is not None:
+            await self.on_verdict(item)
 
     @staticmethod
     def _budget_artifacts(artifacts: dict) -> dict:
@@ -164,33 +310,18 @@ class ProgressMatcherService:
         return ""
 
     @staticmethod
-    def _parse_response(raw: str, total_tasks: int) -> dict:
-        """Parse the LLM JSON response, falling back gracefully."""
+    def _load_json(raw: str) -> dict | None:
+        """Parse a JSON object from ``raw``, ignoring Markdown code fences."""
         cleaned = raw.strip()
         if cleaned.startswith("```"):
             cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else cleaned[3:]
         if cleaned.endswith("```"):
             cleaned = cleaned[:-3]
-        cleaned = cleaned.strip()
-
         try:
-            result = json.loads(cleaned)
+            result = json.loads(cleaned.strip())
         except json.JSONDecodeError:
-            logger.warning("Failed to parse LLM scan response as JSON")
-            return {
-                "scan_summary": {
-                    "total_tasks": total_tasks, "verified": 0,
-                    "partial": 0, "no_evidence": total_tasks, "progress_pct": 0.0,
-                },
-                "task_evidence": [],
-                "raw_response": raw[:500],
-            }
-
-        if "scan_summary" not in result:
-            result["scan_summary"] = _compute_summary(
-                result.get("task_evidence", []), total_tasks,
-            )
-        return result
+            return None
+        return result if isinstance(result, dict) else None
 
 
 def _compute_summary(evidence: list[dict], total: int) -> dict:
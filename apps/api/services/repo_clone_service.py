@@ -1,27 +1,47 @@
-"""Repo clone service — authenticated or public shallow cloning."""
+"""Repo clone service — authenticated or public shallow cloning.
+
+Scan clones are partial: blobs above ``clone_blob_limit`` are filtered out
+server-side and a non-cone sparse checkout materializes only the files the
+artifact extractors read.
+"""
 
 import asyncio
 import logging
+import re
 import shutil
 import tempfile
 from uuid import UUID
 
+import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.models.product import Product
+from apps.api.services.artifact_extractor import sparse_checkout_patterns
 from apps.api.services.github_pat_service import GitHubPatService
 from packages.common.utils.error_handlers import bad_request, not_found
 
 logger = logging.getLogger(__name__)
 
 _CLONE_TIMEOUT = 120  # seconds
+_LS_REMOTE_TIMEOUT = 30  # seconds
+_SPARSE_SPECIAL = re.compile(r"([\\*?\[!#])")
+
+
+def _sparse_escape(path: str) -> str:
+    """Escape a literal path for use as a sparse-checkout pattern."""
+    return _SPARSE_SPECIAL.sub(r"\\\1", path)
 
 
 class RepoCloneService:
     """Clone a product's linked GitHub repo, with or without PAT."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, http: httpx.AsyncClient | None = None) -> None:
         self.session = session
+        # Shared client for GitHub token checks (worker-wide pool when given)
+        self.http = http
+        self._clone_urls: dict[UUID, str] = {}
+        # Size report of the most recent shallow_clone (pack bytes, skipped blobs)
+        self.last_clone_report: dict[str, int] = {}
 
     async def shallow_clone(self, product_id: UUID) -> tuple[str, str]:
         """Clone repo (depth=1) into a temp dir. Returns (tmp_dir, commit_sha)."""
@@ -36,8 +56,9 @@ class RepoCloneService:
         tmp_dir = tempfile.mkdtemp(prefix="mizanos_scan_")
 
         try:
-            await self._run_git_clone(clone_url, branch, tmp_dir)
+            skipped = await self._run_git_clone(clone_url, branch, tmp_dir)
             commit_sha = await self._get_commit_sha(tmp_dir)
+            self.last_clone_report = await self._size_report(tmp_dir, skipped)
         except RuntimeError as exc:
             self.cleanup(tmp_dir)
             raise bad_request(self._friendly_error(str(exc), product)) from exc
@@ -46,14 +67,44 @@ class RepoCloneService:
             raise
 
         if product.github_pat_id:
-            pat_svc = GitHubPatService(self.session)
+            pat_svc = GitHubPatService(self.session, http=self.http)
             await pat_svc.update_last_used(product.github_pat_id)
 
-        logger.info("Cloned %s@%s → %s", product.repository_url, branch, commit_sha[:8])
+        logger.info(
+            "Cloned %s@%s → %s (pack %.1f MiB, %d oversized blobs skipped)",
+            product.repository_url, branch, commit_sha[:8],
+            self.last_clone_report["pack_bytes"] / 2**20,
+            self.last_clone_report["oversized_blobs"],
+        )
         return tmp_dir, commit_sha
 
+    async def resolve_remote_head(self, product_id: UUID) -> str | None:
+        """Look up the tracked branch's HEAD SHA via `git ls-remote` (no clone).
+
+        Returns None when the lookup fails so callers fall back to a full scan.
+        """
+        product = await self.session.get(Product, product_id)
+        if not product or not product.repository_url:
+            return None
+
+        branch = product.tracked_branch or "main"
+        clone_url = await self._resolve_clone_url(product)
+        try:
+            return await self._run_git_ls_remote(clone_url, branch)
+        except RuntimeError as exc:
+            logger.warning("ls-remote failed for %s@%s: %s", product.repository_url, branch, exc)
+            return None
+
     async def _resolve_clone_url(self, product: Product) -> str:
-        """Build clone URL — authenticated if PAT exists, public otherwise."""
+        """Build clone URL — authenticated if PAT exists, public otherwise.
+
+        Memoized per product so a pre-check followed by a clone verifies the PAT once.
+        """
+        if product.id not in self._clone_urls:
+            self._clone_urls[product.id] = await self._build_clone_url(product)
+        return self._clone_urls[product.id]
+
+    async def _build_clone_url(self, product: Product) -> str:
         from apps.api.config import settings
 
         repo_url = product.repository_url.rstrip("/")
@@ -61,7 +112,7 @@ class RepoCloneService:
             repo_url += ".git"
 
         if product.github_pat_id:
-            pat_svc = GitHubPatService(self.session)
+            pat_svc = GitHubPatService(self.session, http=self.http)
             try:
                 raw_token = await pat_svc.decrypt_token(product.github_pat_id)
                 verification = await pat_svc.verify_token(raw_token)
@@ -82,28 +133,119 @@ class RepoCloneService:
         return repo_url
 
     @staticmethod
-    async def _run_git_clone(clone_url: str, branch: str, dest: str) -> None:
+    def _git_env() -> dict[str, str]:
         # Prevent git from prompting for credentials (hangs in containers)
-        env = {
+        return {
             **__import__("os").environ,
             "GIT_TERMINAL_PROMPT": "0",
             "GIT_ASKPASS": "",
             "GIT_SSH_COMMAND": "ssh -o BatchMode=yes",
         }
+
+    @classmethod
+    async def _run_git_ls_remote(cls, clone_url: str, branch: str) -> str | None:
         proc = await asyncio.create_subprocess_exec(
-            "git", "clone", "--depth", "1", "--branch", branch, clone_url, dest,
+            "git", "ls-remote", clone_url, f"refs/heads/{branch}",
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             stdin=asyncio.subprocess.DEVNULL,
-            env=env,
+            env=cls._git_env(),
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=_LS_REMOTE_TIMEOUT)
+        except asyncio.TimeoutError:
+            proc.kill()
+            raise RuntimeError("git ls-remote timed out")
+        if proc.returncode != 0:
+            raise RuntimeError(f"git ls-remote failed: {stderr.decode().strip()}")
+        line = stdout.decode().strip().split("\n", 1)[0]
+        return line.split()[0] if line else None
+
+    @classmethod
+    async def _run_git_clone(cls, clone_url: str, branch: str, dest: str) -> int:
+        """Clone ``branch`` into ``dest``; returns how many oversized files were left out."""
+        from apps.api.config import settings
+
+        if not settings.clone_sparse:
+            await cls._run_git(
+                "clone", "--depth", "1", "--branch", branch, clone_url, dest,
+                action="git clone",
+            )
+            return 0
+
+        clone_args = ["clone", "--depth", "1", "--branch", branch, "--no-checkout"]
+        if settings.clone_blob_limit:
+            clone_args.append(f"--filter=blob:limit={settings.clone_blob_limit}")
+        await cls._run_git(*clone_args, clone_url, dest, action="git clone")
+
+        # Filtered-out blobs would be fetched lazily on checkout; exclude them instead
+        oversized = await cls._missing_blob_paths(dest) if settings.clone_blob_limit else []
+        patterns = sparse_checkout_patterns() + [f"!/{_sparse_escape(p)}" for p in oversized]
+        await cls._run_git(
+            "sparse-checkout", "set", "--no-cone", "--stdin",
+            cwd=dest, stdin="\n".join(patterns) + "\n", action="git sparse-checkout",
+        )
+        await cls._run_git("checkout", branch, cwd=dest, action="git checkout")
+        return len(oversized)
+
+    @classmethod
+    async def _missing_blob_paths(cls, repo_dir: str) -> list[str]:
+        """Paths at HEAD whose blobs the partial clone did not download."""
+        missing = await cls._run_git(
+            "rev-list", "--objects", "--missing=print", "HEAD",
+            cwd=repo_dir, action="git rev-list",
+        )
+        shas = {line[1:] for line in missing.splitlines() if line.startswith("?")}
+        if not shas:
+            return []
+        tree = await cls._run_git("ls-tree", "-r", "-z", "HEAD", cwd=repo_dir, action="git ls-tree")
+        paths = []
+        for record in tree.split("\0"):
+            # "<mode> blob <sha>\t<path>"
+            meta, _, path = record.partition("\t")
+            parts = meta.split()
+            if path and len(parts) == 3 and parts[2] in shas:
+                paths.append(path)
+        return paths
+
+    @classmethod
+    async def _run_git(
+        cls, *args: str, cwd: str | None = None, stdin: str | None = None,
+        action: str = "git",
+    ) -> str:
+        proc = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+            env=cls._git_env(),
         )
         try:
-            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=_CLONE_TIMEOUT)
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(stdin.encode() if stdin is not None else None),
+                timeout=_CLONE_TIMEOUT,
+            )
         except asyncio.TimeoutError:
             proc.kill()
-            raise RuntimeError("git clone timed out after 2 minutes")
+            raise RuntimeError(f"{action} timed out after 2 minutes")
         if proc.returncode != 0:
-            raise RuntimeError(f"git clone failed: {stderr.decode().strip()}")
+            raise RuntimeError(f"{action} failed: {stderr.decode().strip()}")
+        return stdout.decode(errors="replace")
+
+    @classmethod
+    async def _size_report(cls, repo_dir: str, oversized_blobs: int) -> dict[str, int]:
+        """Bytes downloaded into the object store plus files left out of the checkout."""
+        pack_bytes = 0
+        try:
+            counts = await cls._run_git("count-objects", "-v", cwd=repo_dir, action="git count-objects")
+            for line in counts.splitlines():
+                key, _, value = line.partition(": ")
+                if key in ("size", "size-pack"):
+                    pack_bytes += int(value) * 1024
+        except (RuntimeError, ValueError):
+            pass
+        return {"pack_bytes": pack_bytes, "oversized_blobs": oversized_blobs}
 
     @staticmethod
     async def _get_commit_sha(repo_dir: str) -> str:
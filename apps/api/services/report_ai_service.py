@@ -9,6 +9,7 @@ import redis.asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.config import settings
+from apps.api.observability.tracing import llm_span, record_llm_usage
 from apps.api.services.llm_config import get_llm_config
 from apps.api.services.report_service import ReportService
 
@@ -50,15 +51,17 @@ class ReportAIService:
         config = await get_llm_config(self.session)
         client = openai.AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
 
-        response = await client.chat.completions.create(
-            model=config.model,
-            messages=[
-                {"role": "system", "content": _SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.4,
-            max_tokens=768,
-        )
+        with llm_span("chat", config.model) as span:
+            response = await client.chat.completions.create(
+                model=config.model,
+                messages=[
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.4,
+                max_tokens=768,
+            )
+            record_llm_usage(span, response.usage)
         raw = response.choices[0].message.content or "{}"
         try:
             return json.loads(raw)
@@ -13,6 +13,7 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.api.observability.tracing import llm_span, record_llm_usage
 from apps.api.services.llm_config import get_llm_config
 from apps.api.services.report_service import ReportService
 
@@ -396,12 +397,14 @@ class ReportDocumentService:
 
         config = await get_llm_config(self.session)
         client = openai.AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
-        response = await client.chat.completions.create(
-            model=config.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.5,
-            max_tokens=512,
-        )
+        with llm_span("chat", config.model) as span:
+            response = await client.chat.completions.create(
+                model=config.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.5,
+                max_tokens=512,
+            )
+            record_llm_usage(span, response.usage)
         return response.choices[0].message.content or ""
 
 
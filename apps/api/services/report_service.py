@@ -463,15 +463,11 @@ class ReportService:
         }
 
     async def _build_scan_metrics(self, product_id: UUID) -> dict:
-        """Pull code progress scan data from the latest RepositoryAnalysis."""
+        """Pull code progress scan data from the product's latest scan analysis."""
         stmt = (
             select(RepositoryAnalysis.gap_analysis)
-            .where(
-                RepositoryAnalysis.product_id == product_id,
-                RepositoryAnalysis.gap_analysis.isnot(None),
-            )
-            .order_by(RepositoryAnalysis.created_at.desc())
-            .limit(1)
+            .join(Product, Product.latest_analysis_id == RepositoryAnalysis.id)
+            .where(Product.id == product_id)
         )
         result = await self.session.execute(stmt)
         gap = result.scalar_one_or_none()
@@ -584,6 +580,7 @@ class ReportService:
         links_map = await self._fetch_project_links(product_ids)
         code_progress = await self._fetch_code_progress_batch(product_ids)
         members_map = await self._fetch_members_map(product_ids)
+        task_rows = await self._fetch_report_task_rows(product_ids)
         result: dict[UUID, dict] = {}
         today = datetime.now(timezone.utc).date()
 
@@ -601,7 +598,9 @@ class ReportService:
             dev_names = members_map.get(pid, {}).get("dev_names", [])
             has_multiple_devs = len(dev_names) > 1
 
-            task_result = await self._fetch_task_details_for_report(pid, today, has_multiple_devs)
+            task_result = self._group_task_details_for_report(
+                task_rows.get(pid, []), today, has_multiple_devs,
+            )
 
             result[pid] = {
                 "summary_line": summary,
@@ -613,14 +612,14 @@ class ReportService:
 
         return result
 
-    async def _fetch_task_details_for_report(self, product_id: UUID, today, has_multiple_devs: bool = False) -> dict:
-        """Fetch in-progress tasks + tasks completed today, grouped by milestone."""
+    async def _fetch_report_task_rows(self, product_ids: list[UUID]) -> dict[UUID, list]:
+        """Return {product_id: [task rows]} for every project in one query."""
         from apps.api.models.milestone import Milestone
         from apps.api.models.user import Profile
 
         stmt = (
             select(
-                Task.title, Task.status, Task.priority,
+                Task.product_id, Task.title, Task.status, Task.priority,
                 Task.due_date, Task.updated_at, Task.assignee_id,
                 Task.milestone_id,
                 Profile.full_name.label("assignee_name"),
@@ -630,20 +629,25 @@ class ReportService:
             .outerjoin(Profile, Task.assignee_id == Profile.id)
             .outerjoin(Milestone, Task.milestone_id == Milestone.id)
             .where(
-                Task.product_id == product_id,
+                Task.product_id.in_(product_ids),
                 Task.task_type == "task",
                 Task.is_draft == False,  # noqa: E712
             )
             .order_by(Milestone.sort_order.nulls_last(), Task.status, Task.priority.desc())
         )
-        result = await self.session.execute(stmt)
+        rows_map: dict[UUID, list] = {}
+        for row in (await self.session.execute(stmt)).all():
+            rows_map.setdefault(row.product_id, []).append(row)
+        return rows_map
 
-        # Group tasks by milestone
+    @staticmethod
+    def _group_task_details_for_report(rows: list, today, has_multiple_devs: bool = False) -> dict:
+        """In-progress tasks + tasks completed today, grouped by milestone."""
         milestones: dict[str, list[dict]] = {}
         milestone_order: dict[str, int] = {}
         assignee_ids = set()
 
-        for row in result.all():
+        for row in rows:
             status = (row.status or "").lower()
             is_in_progress = status in IN_PROGRESS_STATUSES
             is_done_today = (
@@ -690,25 +694,11 @@ class ReportService:
         }
 
     async def _fetch_code_progress_batch(self, product_ids: list[UUID]) -> dict[UUID, float]:
-        """Return {product_id: progress_pct} from latest RepositoryAnalysis."""
-        from sqlalchemy import distinct
-        result_map: dict[UUID, float] = {}
-        for pid in product_ids:
-            stmt = (
-                select(RepositoryAnalysis.gap_analysis)
-                .where(
-                    RepositoryAnalysis.product_id == pid,
-                    RepositoryAnalysis.gap_analysis.isnot(None),
-                )
-                .order_by(RepositoryAnalysis.created_at.desc())
-                .limit(1)
-            )
-            result = await self.session.execute(stmt)
-            gap = result.scalar_one_or_none()
-            if gap and isinstance(gap, dict):
-                result_map[pid] = gap.get("progress_pct", 0.0)
-            else:
-                result_map[pid] = 0.0
+        """Return {product_id: progress_pct} from each product's latest scan."""
+        stmt = select(Product.id, Product.last_scan_progress).where(Product.id.in_(product_ids))
+        result_map: dict[UUID, float] = {pid: 0.0 for pid in product_ids}
+        for pid, pct in await self.session.execute(stmt):
+            result_map[pid] = pct or 0.0
         return result_map
 
     async def _fetch_project_links(self, product_ids: list[UUID]) -> dict[UUID, list[dict]]:
@@ -739,24 +729,28 @@ class ReportService:
 
         BUG_STATUS_ORDER = ["reported", "triaging", "in_progress", "reopened", "fixed", "verified", "wont_fix", "live"]
 
+        stmt = (
+            select(
+                Task.product_id, Task.title, Task.status, Task.priority,
+                Task.due_date, Task.updated_at, Task.assignee_id,
+                Profile.full_name.label("assignee_name"),
+            )
+            .outerjoin(Profile, Task.assignee_id == Profile.id)
+            .where(
+                Task.product_id.in_(product_ids),
+                Task.task_type == "bug",
+                Task.is_draft == False,  # noqa: E712
+            )
+            .order_by(Task.status, Task.priority.desc())
+        )
+        rows_map: dict[UUID, list] = {}
+        for row in (await self.session.execute(stmt)).all():
+            rows_map.setdefault(row.product_id, []).append(row)
+
         result: dict[UUID, dict] = {}
 
         for pid in product_ids:
-            stmt = (
-                select(
-                    Task.title, Task.status, Task.priority,
-                    Task.due_date, Task.updated_at, Task.assignee_id,
-                    Profile.full_name.label("assignee_name"),
-                )
-                .outerjoin(Profile, Task.assignee_id == Profile.id)
-                .where(
-                    Task.product_id == pid,
-                    Task.task_type == "bug",
-                    Task.is_draft == False,  # noqa: E712
-                )
-                .order_by(Task.status, Task.priority.desc())
-            )
-            rows = (await self.session.execute(stmt)).all()
+            rows = rows_map.get(pid, [])
 
             status_groups: dict[str, list[dict]] = {}
             status_counts: dict[str, int] = {}
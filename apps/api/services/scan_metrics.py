@@ -0,0 +1,108 @@
+"""Scan metrics — per-stage timing and volume counters for repo scans."""
+
+import math
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from apps.api.observability.tracing import tracer
+from apps.api.services.extraction.pattern_runner import SKIP_DIRS
+
+
+class ScanMetrics:
+    """Collects wall time per stage plus volume counters for one scan run."""
+
+    def __init__(self) -> None:
+        self.stages_ms: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self.artifact_counts: dict[str, int] = {}
+        self.llm_batches: list[dict] = []
+        # Limits hit along the way; non-empty means the results are partial
+        self.warnings: list[str] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block and record it under ``name`` (milliseconds), in a ``scan.<name>`` span."""
+        start = time.perf_counter()
+        try:
+            with tracer.start_as_current_span(f"scan.{name}"):
+                yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages_ms[name] = round(self.stages_ms.get(name, 0.0) + elapsed, 1)
+
+    def record_clone(self, repo_dir: str) -> None:
+        """Record bytes on disk and file count for a fresh clone."""
+        total_bytes = 0
+        files = 0
+        for dirpath, dirnames, filenames in os.walk(repo_dir):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS or d == ".git"]
+            in_git = ".git" in os.path.relpath(dirpath, repo_dir).split(os.sep)
+            for name in filenames:
+                try:
+                    total_bytes += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                if not in_git:
+                    files += 1
+        self.counters["bytes_cloned"] = total_bytes
+        self.counters["files_scanned"] = files
+
+    def record_artifacts(self, artifacts: dict) -> None:
+        """Record item counts per artifact category."""
+        self.artifact_counts = {
+            key: len(value) if isinstance(value, (list, dict)) else 0
+            for key, value in artifacts.items()
+        }
+
+    def record_llm_batches(self, batches: list[dict]) -> None:
+        """Record per-batch LLM latency and token usage from the matcher."""
+        self.llm_batches = batches
+        self.counters["prompt_tokens"] = sum(b.get("prompt_tokens") or 0 for b in batches)
+        self.counters["completion_tokens"] = sum(b.get("completion_tokens") or 0 for b in batches)
+
+    def to_dict(self) -> dict:
+        return {
+            "stages_ms": self.stages_ms,
+            "total_ms": round(sum(self.stages_ms.values()), 1),
+            "counters": self.counters,
+            "artifact_counts": self.artifact_counts,
+            "llm_batches": self.llm_batches,
+            "warnings": self.warnings,
+        }
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of ``values`` (``pct`` in 0–100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def aggregate_stage_metrics(metrics: list[dict]) -> dict:
+    """Aggregate p50/p90/p99 and mean per stage across scan metric dicts."""
+    series: dict[str, list[float]] = {}
+    for m in metrics:
+        for name, ms in (m.get("stages_ms") or {}).items():
+            series.setdefault(name, []).append(ms)
+        if "total_ms" in m:
+            series.setdefault("total", []).append(m["total_ms"])
+        for batch in m.get("llm_batches") or []:
+            if batch.get("latency_ms") is not None:
+                series.setdefault("llm_batch", []).append(batch["latency_ms"])
+        for name, value in (m.get("counters") or {}).items():
+            series.setdefault(name, []).append(value)
+
+    return {
+        name: {
+            "count": len(values),
+            "mean": round(sum(values) / len(values), 1),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+        }
+        for name, values in series.items()
+    }
@@ -9,7 +9,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from apps.api.models.audit import RepositoryAnalysis, RepoScanHistory
 from apps.api.models.job import Job
 from apps.api.models.product import Product
+from apps.api.services.analysis_payloads import load_payload
+from apps.api.services.job_events import publish_job_event
 from apps.api.services.job_service import JobService
+from apps.api.services.scan_metrics import aggregate_stage_metrics
 from packages.common.utils.error_handlers import bad_request, not_found
 
 logger = logging.getLogger(__name__)
@@ -22,9 +25,13 @@ class ScanService:
         self.session = session
 
     async def trigger_high_level_scan(
-        self, product_id: UUID, user_id: str,
+        self, product_id: UUID, user_id: str, force: bool = False,
     ) -> Job:
-        """Create and enqueue a high-level scan job."""
+        """Create and enqueue a high-level scan job.
+
+        Unless ``force`` is set, the worker skips the scan when the remote HEAD
+        matches the last scanned commit.
+        """
         product = await self.session.get(Product, product_id)
         if not product:
             raise not_found("Product")
@@ -39,6 +46,7 @@ class ScanService:
             arq_function="high_level_scan_job",
             user_id=user_id,
             product_id=product_id,
+            input_data={"force": force},
         )
 
     async def cancel_scan(self, product_id: UUID) -> int:
@@ -51,10 +59,18 @@ class ScanService:
                 Job.status.in_(["pending", "running"]),
             )
             .values(status="failed", progress_message="Cancelled by user")
+            .returning(Job.id)
         )
-        result = await self.session.execute(stmt)
-        await self.session.flush()
-        return result.rowcount
+        cancelled = list((await self.session.execute(stmt)).scalars().all())
+        # Commit before telling subscribers: they stop at the terminal event
+        # and may re-read the job straight away
+        await self.session.commit()
+        for job_id in cancelled:
+            await publish_job_event(job_id, {
+                "job_id": str(job_id), "status": "failed",
+                "progress_message": "Cancelled by user",
+            })
+        return len(cancelled)
 
     async def _check_no_running_scan(self, product_id: UUID) -> None:
         """Raise if a scan is already running for this product."""
@@ -67,18 +83,30 @@ class ScanService:
         if count > 0:
             raise bad_request("A scan is already in progress for this product")
 
-    async def get_latest_scan_result(
-        self, product_id: UUID,
-    ) -> RepositoryAnalysis | None:
-        """Get the most recent analysis for a product."""
+    async def get_latest_scan_result(self, product_id: UUID) -> dict | None:
+        """Get the product's latest scan analysis, with its task evidence."""
         stmt = (
             select(RepositoryAnalysis)
-            .where(RepositoryAnalysis.product_id == product_id)
-            .order_by(RepositoryAnalysis.created_at.desc())
-            .limit(1)
+            .join(Product, Product.latest_analysis_id == RepositoryAnalysis.id)
+            .where(Product.id == product_id)
         )
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        analysis = (await self.session.execute(stmt)).scalar_one_or_none()
+        if analysis is None:
+            return None
+        return {
+            "id": analysis.id,
+            "product_id": analysis.product_id,
+            "repository_url": analysis.repository_url,
+            "branch": analysis.branch,
+            "commit_sha": analysis.commit_sha,
+            "file_count": analysis.file_count,
+            "progress_pct": analysis.progress_pct,
+            "functional_inventory": await load_payload(
+                self.session, analysis.functional_inventory_sha,
+            ),
+            "gap_analysis": analysis.gap_analysis,
+            "created_at": analysis.created_at,
+        }
 
     async def get_scan_history(
         self, product_id: UUID, page: int = 1, page_size: int = 20,
@@ -103,21 +131,45 @@ class ScanService:
             "page_size": page_size,
         }
 
+    async def get_stage_metrics(
+        self, product_id: UUID | None = None, limit: int = 200,
+    ) -> dict:
+        """Percentiles of per-stage scan timings across the most recent scans."""
+        stmt = (
+            select(RepoScanHistory.stage_metrics)
+            .where(RepoScanHistory.stage_metrics.is_not(None))
+            .order_by(RepoScanHistory.created_at.desc())
+            .limit(limit)
+        )
+        if product_id:
+            stmt = stmt.where(RepoScanHistory.product_id == product_id)
+        rows = list((await self.session.execute(stmt)).scalars().all())
+        return {
+            "product_id": str(product_id) if product_id else None,
+            "scan_count": len(rows),
+            "stages": aggregate_stage_metrics(rows),
+        }
+
     async def get_progress_summary(self, product_id: UUID) -> dict:
         """Quick summary: progress %, last scan time, commit SHA."""
         product = await self.session.get(Product, product_id)
         if not product:
             raise not_found("Product")
 
-        latest = await self.get_latest_scan_result(product_id)
+        latest = None
+        if product.latest_analysis_id:
+            latest = (await self.session.execute(
+                select(RepositoryAnalysis.commit_sha, RepositoryAnalysis.gap_analysis)
+                .where(RepositoryAnalysis.id == product.latest_analysis_id)
+            )).one_or_none()
         summary = latest.gap_analysis if latest and latest.gap_analysis else None
         active_job_id = await self._get_active_scan_job_id(product_id)
 
         return {
             "product_id": str(product_id),
             "progress_pct": product.progress or 0.0,
-            "last_scan_at": str(latest.created_at) if latest else None,
-            "commit_sha": latest.branch if latest else None,
+            "last_scan_at": str(product.last_scan_at) if product.last_scan_at else None,
+            "commit_sha": latest.commit_sha if latest else None,
             "scan_summary": summary,
             "active_job_id": str(active_job_id) if active_job_id else None,
         }
@@ -1,14 +1,13 @@
-"""Auto-seed standard checklist templates on startup."""
+"""Seed the standard checklist templates (run by the maintenance job)."""
 
 import logging
 from uuid import uuid4
 from datetime import datetime, timezone
 
-from sqlalchemy import select, text
+from sqlalchemy import func, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.models.checklist_template import ChecklistTemplate, ChecklistTemplateItem
-from packages.common.db.session import async_session_factory
 
 logger = logging.getLogger(__name__)
 
@@ -328,22 +327,41 @@ async def seed_development_checklist(session: AsyncSession) -> None:
     logger.info("Seeded Development Standard Checklist with %d items", len(DEVELOPMENT_ITEMS))
 
 
-async def run_checklist_seeds() -> None:
-    """Run all checklist seeds. Called from app lifespan."""
-    async with async_session_factory() as session:
-        await seed_development_checklist(session)
-        await seed_checklist(
-            session,
-            name="GTM Standard Checklist",
-            template_type="gtm",
-            description="Go-to-market standards for every product launch",
-            items=GTM_ITEMS,
-        )
-        await seed_checklist(
-            session,
-            name="QA Standard Checklist",
-            template_type="qa",
-            description="General QA standards to be followed for every project",
-            items=QA_ITEMS,
-        )
-        await session.commit()
+# (template_type, name) of every template seeded below
+STANDARD_CHECKLISTS = [
+    ("development", "Development Standard Checklist"),
+    ("gtm", "GTM Standard Checklist"),
+    ("qa", "QA Standard Checklist"),
+]
+
+
+async def checklists_seeded(session: AsyncSession) -> bool:
+    """Whether every standard checklist template exists, in one query."""
+    stmt = select(func.count(func.distinct(
+        tuple_(ChecklistTemplate.template_type, ChecklistTemplate.name)
+    ))).where(
+        tuple_(ChecklistTemplate.template_type, ChecklistTemplate.name).in_(STANDARD_CHECKLISTS)
+    )
+    return (await session.execute(stmt)).scalar_one() >= len(STANDARD_CHECKLISTS)
+
+
+async def run_checklist_seeds(session: AsyncSession) -> None:
+    """Create whichever standard checklist templates are missing."""
+    if await checklists_seeded(session):
+        return
+    await seed_development_checklist(session)
+    await seed_checklist(
+        session,
+        name="GTM Standard Checklist",
+        template_type="gtm",
+        description="Go-to-market standards for every product launch",
+        items=GTM_ITEMS,
+    )
+    await seed_checklist(
+        session,
+        name="QA Standard Checklist",
+        template_type="qa",
+        description="General QA standards to be followed for every project",
+        items=QA_ITEMS,
+    )
+    await session.commit()
@@ -6,6 +6,7 @@ from uuid import UUID
 from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from apps.api.models.product import Product
 from apps.api.models.specification import Specification, SpecificationFeature
@@ -73,34 +74,32 @@ class SpecificationService(BaseService[Specification]):
 
     async def get_library_features(self) -> list[dict]:
         """Get all reusable features with product names and import counts."""
+        imports = aliased(SpecificationFeature)
+        import_counts = (
+            select(imports.source_feature_id, func.count().label("import_count"))
+            .where(imports.source_feature_id.isnot(None))
+            .group_by(imports.source_feature_id)
+            .subquery()
+        )
         stmt = (
             select(
                 SpecificationFeature,
                 Product.name.label("product_name"),
-                func.count(SpecificationFeature.id)
-                .filter(
-                    SpecificationFeature.source_feature_id
-                    == SpecificationFeature.id
-                )
-                .label("import_count"),
+                func.coalesce(import_counts.c.import_count, 0),
             )
             .join(Product, SpecificationFeature.product_id == Product.id)
+            .outerjoin(
+                import_counts,
+                import_counts.c.source_feature_id == SpecificationFeature.id,
+            )
             .where(SpecificationFeature.is_reusable.is_(True))
-            .group_by(SpecificationFeature.id, Product.name)
             .order_by(SpecificationFeature.reusable_category)
         )
         result = await self.repo.session.execute(stmt)
         rows = result.all()
 
         features = []
-        for feature, product_name, _ in rows:
-            # Count imports separately for accuracy
-            count_stmt = select(func.count()).where(
-                SpecificationFeature.source_feature_id == feature.id
-            )
-            count_result = await self.repo.session.execute(count_stmt)
-            import_count = count_result.scalar_one()
-
+        for feature, product_name, import_count in rows:
             feature_dict = {
                 "id": feature.id,
                 "name": feature.name,
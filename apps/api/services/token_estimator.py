@@ -0,0 +1,16 @@
+"""Tokenizer-free token estimates for prompt budgeting.
+
+Exact counts depend on the model's tokenizer, which differs per provider
+behind OpenRouter. A character ratio is close enough to size prompts and
+errs on the high side for JSON, whose punctuation tokenizes densely.
+"""
+
+import math
+
+# English prose averages ~4 characters per token; JSON closer to 3
+CHARS_PER_TOKEN = 3.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
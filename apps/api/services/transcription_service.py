@@ -3,8 +3,6 @@
 import base64
 import logging
 
-import openai
-
 from apps.api.config import settings
 
 logger = logging.getLogger(__name__)
@@ -17,6 +15,8 @@ class TranscriptionService:
     """Transcribe audio files via OpenAI Whisper or OpenRouter multimodal."""
 
     def __init__(self) -> None:
+        import openai
+
         if settings.openai_api_key:
             self._mode = "openai"
             self._client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
@@ -40,6 +40,8 @@ class TranscriptionService:
 
     async def _transcribe_whisper(self, audio_file: bytes, filename: str) -> str:
         """Transcribe via OpenAI Whisper endpoint."""
+        import openai
+
         try:
             response = await self._client.audio.transcriptions.create(
                 model="whisper-1",
@@ -52,6 +54,8 @@ class TranscriptionService:
 
     async def _transcribe_multimodal(self, audio_file: bytes, filename: str) -> str:
         """Transcribe via OpenRouter chat completions with audio input."""
+        import openai
+
         ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "webm"
         mime_map = {
             "webm": "audio/webm", "mp3": "audio/mpeg", "wav": "audio/wav",
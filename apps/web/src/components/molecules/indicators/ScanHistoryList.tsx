@@ -18,6 +18,7 @@ const STATUS_VARIANT: Record<string, "default" | "secondary" | "destructive" | "
   completed: "default",
   failed: "destructive",
   running: "secondary",
+  partial: "secondary",
   pending: "outline",
 };
 
@@ -89,14 +89,18 @@ export function AIChatPanel({
     sendMessage,
     cancelStream,
     clearChat,
+    hasOlderMessages,
+    loadingOlder,
+    loadOlderMessages,
   } = useAIChat(productId);
 
   const bottomRef = useRef<HTMLDivElement>(null);
 
-  // Auto-scroll on new messages and during streaming
+  // Auto-scroll on new messages and during streaming (not when older ones load)
+  const latestMessage = messages[messages.length - 1];
   useEffect(() => {
     bottomRef.current?.scrollIntoView({ behavior: "smooth" });
-  }, [messages, isStreaming]);
+  }, [latestMessage, isStreaming]);
 
   // Focus input when panel opens
   useEffect(() => {
@@ -140,6 +144,21 @@ export function AIChatPanel({
           />
         ) : (
           <div className="space-y-4">
+            {hasOlderMessages && (
+              <div className="flex justify-center">
+                <Button
+                  type="button"
+                  variant="ghost"
+                  size="sm"
+                  onClick={loadOlderMessages}
+                  disabled={loadingOlder}
+                  className="text-xs text-muted-foreground"
+                >
+                  {loadingOlder && <Loader2 className="h-3 w-3 mr-1 animate-spin" />}
+                  Load earlier messages
+                </Button>
+              </div>
+            )}
             {messages.map((msg, i) => (
               <ChatMessage
                 key={msg.id}
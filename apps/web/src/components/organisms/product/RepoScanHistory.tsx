@@ -17,6 +17,7 @@ interface RepoScanHistoryProps {
 const STATUS_VARIANT: Record<string, "default" | "secondary" | "destructive" | "outline"> = {
   completed: "default",
   no_changes: "secondary",
+  partial: "secondary",
   error: "destructive",
   pending: "outline",
 };
@@ -12,6 +12,8 @@ export function useAIChat(productId: string | null) {
   const queryClient = useQueryClient();
   const [messages, setMessages] = useState<AIChatMessage[]>([]);
   const [error, setError] = useState<string | null>(null);
+  const [olderCursor, setOlderCursor] = useState<string | null>(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const sessionIdRef = useRef<string | null>(null);
   const messagesRef = useRef<AIChatMessage[]>(messages);
   messagesRef.current = messages;
@@ -26,8 +28,9 @@ export function useAIChat(productId: string | null) {
       );
       if (existing) {
         sessionIdRef.current = existing.id;
-        const msgs = await aiRepository.getMessages(existing.id);
-        setMessages(msgs);
+        const page = await aiRepository.getMessages(existing.id);
+        setMessages(page.data);
+        setOlderCursor(page.next_cursor);
         return existing;
       }
       const newSession = await aiRepository.createSession(
@@ -35,6 +38,7 @@ export function useAIChat(productId: string | null) {
       );
       sessionIdRef.current = newSession.id;
       setMessages([]);
+      setOlderCursor(null);
       return newSession;
     },
     enabled: !!user?.id,
@@ -45,10 +49,23 @@ export function useAIChat(productId: string | null) {
     if (productId !== undefined) {
       sessionIdRef.current = null;
       setMessages([]);
+      setOlderCursor(null);
       setError(null);
     }
   }, [productId]);
 
+  const loadOlderMessages = useCallback(async () => {
+    if (!session || !olderCursor || loadingOlder) return;
+    setLoadingOlder(true);
+    try {
+      const page = await aiRepository.getMessages(session.id, olderCursor);
+      setMessages((prev) => [...page.data, ...prev]);
+      setOlderCursor(page.next_cursor);
+    } finally {
+      setLoadingOlder(false);
+    }
+  }, [session, olderCursor, loadingOlder]);
+
   const handleChunk = useCallback((content: string, msgId: string) => {
     setMessages((prev) =>
       prev.map((m) => (m.id === msgId ? { ...m, content } : m)),
@@ -105,6 +122,7 @@ export function useAIChat(productId: string | null) {
     if (!session) return;
     await aiRepository.deleteSession(session.id);
     setMessages([]);
+    setOlderCursor(null);
     setError(null);
     queryClient.invalidateQueries({
       queryKey: ["ai-chat-session", productId, user?.id],
@@ -120,5 +138,8 @@ export function useAIChat(productId: string | null) {
     cancelStream,
     clearChat,
     session,
+    hasOlderMessages: olderCursor !== null,
+    loadingOlder,
+    loadOlderMessages,
   };
 }
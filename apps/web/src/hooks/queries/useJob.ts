@@ -1,20 +1,85 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
+import { useEffect, useState } from "react";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
 import { jobsRepository } from "@/lib/api/repositories";
 import type { Job } from "@/lib/types";
 
 const ACTIVE_STATUSES = new Set(["pending", "running"]);
 const POLL_INTERVAL_MS = 2000;
 
+type JobEvent = Partial<Pick<Job, "status" | "progress" | "progress_message" | "error_message">>;
+
+/** Streams job events over SSE into the query cache; returns false if streaming failed. */
+function useJobEvents(jobId: string | null): boolean {
+  const queryClient = useQueryClient();
+  const [streaming, setStreaming] = useState(true);
+
+  useEffect(() => {
+    if (!jobId) return;
+    const controller = new AbortController();
+    setStreaming(true);
+
+    const run = async () => {
+      let finished = false;
+      try {
+        const response = await jobsRepository.streamEvents(jobId, controller.signal);
+        const reader = response.body!.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+
+          let newlineIdx: number;
+          while ((newlineIdx = buffer.indexOf("\n")) !== -1) {
+            const line = buffer.slice(0, newlineIdx).replace(/\r$/, "");
+            buffer = buffer.slice(newlineIdx + 1);
+            if (!line.startsWith("data: ")) continue;
+
+            let event: JobEvent;
+            try {
+              event = JSON.parse(line.slice(6)) as JobEvent;
+            } catch {
+              continue;
+            }
+            queryClient.setQueryData<Job>(["jobs", jobId], (prev) =>
+              prev ? { ...prev, ...event } : prev,
+            );
+            if (event.status && !ACTIVE_STATUSES.has(event.status)) {
+              finished = true;
+              // Fetch the final row (result_data, completed_at)
+              void queryClient.invalidateQueries({ queryKey: ["jobs", jobId] });
+            }
+          }
+        }
+      } catch (err) {
+        if (err instanceof Error && err.name === "AbortError") return;
+      }
+      // Stream dropped before a terminal event — fall back to polling
+      if (!finished && !controller.signal.aborted) setStreaming(false);
+    };
+
+    void run();
+    return () => controller.abort();
+  }, [jobId, queryClient]);
+
+  return streaming;
+}
+
 export function useJob(jobId: string | null) {
+  const streaming = useJobEvents(jobId);
+
   return useQuery({
     queryKey: ["jobs", jobId],
     queryFn: (): Promise<Job> => jobsRepository.getById(jobId!),
     enabled: !!jobId,
-    refetchInterval: (query) => {
-      const status = query.state.data?.status;
-      if (status && ACTIVE_STATUSES.has(status)) return POLL_INTERVAL_MS;
+    refetchInterval: (q) => {
+      const status = q.state.data?.status;
+      // Poll only as a fallback when the event stream is unavailable
+      if (!streaming && status && ACTIVE_STATUSES.has(status)) return POLL_INTERVAL_MS;
       return false;
     },
   });
@@ -1,5 +1,5 @@
 import type { AxiosInstance } from "axios";
-import type { AIChatSession, AIChatMessage } from "@/lib/types";
+import type { AIChatSession, AIChatMessage, AIChatMessagePage } from "@/lib/types";
 import { apiClient, AUTH_TOKEN_KEY } from "../client";
 
 export class AIRepository {
@@ -34,9 +34,10 @@ export class AIRepository {
     await this.client.delete(`${this.basePath}/sessions/${sessionId}`);
   }
 
-  async getMessages(sessionId: string): Promise<AIChatMessage[]> {
-    const response = await this.client.get<AIChatMessage[]>(
+  async getMessages(sessionId: string, before?: string): Promise<AIChatMessagePage> {
+    const response = await this.client.get<AIChatMessagePage>(
       `${this.basePath}/sessions/${sessionId}/messages`,
+      { params: before ? { before } : undefined },
     );
     return response.data;
   }
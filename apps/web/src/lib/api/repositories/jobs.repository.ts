@@ -1,4 +1,5 @@
 import type { Job } from "@/lib/types/job";
+import { AUTH_TOKEN_KEY } from "../client";
 import { BaseRepository } from "./base.repository";
 
 export class JobsRepository extends BaseRepository<Job> {
@@ -10,6 +11,24 @@ export class JobsRepository extends BaseRepository<Job> {
     const result = await this.getAll(params);
     return Array.isArray(result) ? result : result.data ?? [];
   }
+
+  async streamEvents(jobId: string, signal?: AbortSignal): Promise<Response> {
+    const token = typeof window !== "undefined"
+      ? localStorage.getItem(AUTH_TOKEN_KEY)
+      : null;
+
+    const response = await fetch(`/api${this.basePath}/${jobId}/events`, {
+      headers: token ? { Authorization: `Bearer ${token}` } : {},
+      signal,
+    });
+
+    if (!response.ok) {
+      throw new Error(`Request failed with status ${response.status}`);
+    }
+    if (!response.body) throw new Error("No response body");
+
+    return response;
+  }
 }
 
 export const jobsRepository = new JobsRepository();
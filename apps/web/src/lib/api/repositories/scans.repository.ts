@@ -5,9 +5,11 @@ import { BaseRepository, type PaginatedResponse, type QueryParams } from "./base
 export class ScansRepository extends BaseRepository<ScanResult> {
   protected readonly basePath = "/scans";
 
-  async triggerHighLevel(productId: string): Promise<Job> {
+  async triggerHighLevel(productId: string, force = false): Promise<Job> {
     const response = await this.client.post<Job>(
       `${this.basePath}/${productId}/high-level`,
+      undefined,
+      { params: force ? { force } : undefined },
     );
     return response.data;
   }
@@ -13,3 +13,10 @@ export interface AIChatMessage {
   content: string;
   created_at: string;
 }
+
+export interface AIChatMessagePage {
+  /** Oldest first */
+  data: AIChatMessage[];
+  /** Pass as `before` to load the previous page; null at the start */
+  next_cursor: string | null;
+}
@@ -78,7 +78,7 @@ export type {
   OrgSetting,
 } from "./settings";
 
-export type { AIChatSession, AIChatMessage } from "./ai";
+export type { AIChatSession, AIChatMessage, AIChatMessagePage } from "./ai";
 
 export type {
   Stakeholder,
@@ -26,6 +26,9 @@ export interface Product {
   task_count: number;
   bug_count: number;
   bugs_fixed_count: number;
+  latest_analysis_id: string | null;
+  last_scan_at: string | null;
+  last_scan_progress: number | null;
   created_at: string;
   updated_at: string;
 }
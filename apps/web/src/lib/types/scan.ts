@@ -21,7 +21,9 @@ export interface ScanResult {
   product_id: string;
   repository_url: string;
   branch: string | null;
+  commit_sha: string | null;
   file_count: number | null;
+  progress_pct: number | null;
   functional_inventory: TaskEvidence[] | null;
   gap_analysis: ScanSummary | null;
   created_at: string;
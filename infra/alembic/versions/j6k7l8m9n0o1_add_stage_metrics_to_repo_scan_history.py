@@ -0,0 +1,25 @@
+"""add stage_metrics to repo_scan_history
+
+Revision ID: j6k7l8m9n0o1
+Revises: i5j6k7l8m9n0
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "j6k7l8m9n0o1"
+down_revision = "i5j6k7l8m9n0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "repo_scan_history",
+        sa.Column("stage_metrics", JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("repo_scan_history", "stage_metrics")
@@ -0,0 +1,33 @@
+"""add scan_task_verdicts
+
+Revision ID: k7l8m9n0o1p2
+Revises: j6k7l8m9n0o1
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "k7l8m9n0o1p2"
+down_revision = "j6k7l8m9n0o1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scan_task_verdicts",
+        sa.Column("job_id", sa.UUID(), nullable=False),
+        sa.Column("task_id", sa.String(), nullable=False),
+        sa.Column("commit_sha", sa.String(), nullable=False),
+        sa.Column("evidence", JSONB(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("job_id", "task_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scan_task_verdicts")
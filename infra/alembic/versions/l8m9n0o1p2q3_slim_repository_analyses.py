@@ -0,0 +1,133 @@
+"""move analysis payloads to analysis_payloads, add summary columns
+
+Revision ID: l8m9n0o1p2q3
+Revises: k7l8m9n0o1p2
+Create Date: 2026-10-19
+"""
+import hashlib
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, insert
+
+revision = "l8m9n0o1p2q3"
+down_revision = "k7l8m9n0o1p2"
+branch_labels = None
+depends_on = None
+
+
+# Same encoding as apps/api/services/analysis_payloads.py, inlined so the
+# migration does not change if that module does
+def _encode(value) -> tuple[str, bytes, int]:
+    raw = json.dumps(value, separators=(",", ":"), sort_keys=True, default=str).encode()
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, 6), len(raw)
+
+
+_payloads = sa.table(
+    "analysis_payloads",
+    sa.column("sha256", sa.String()),
+    sa.column("data", sa.LargeBinary()),
+    sa.column("size_bytes", sa.Integer()),
+)
+_analyses = sa.table(
+    "repository_analyses",
+    sa.column("id", sa.UUID()),
+    sa.column("structure_map", JSONB()),
+    sa.column("functional_inventory", JSONB()),
+    sa.column("structure_map_sha", sa.String()),
+    sa.column("functional_inventory_sha", sa.String()),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis_payloads",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.add_column("repository_analyses", sa.Column("commit_sha", sa.String(), nullable=True))
+    op.add_column("repository_analyses", sa.Column("progress_pct", sa.Float(), nullable=True))
+    op.add_column("repository_analyses", sa.Column("structure_map_sha", sa.String(length=64), nullable=True))
+    op.add_column("repository_analyses", sa.Column("functional_inventory_sha", sa.String(length=64), nullable=True))
+    op.create_foreign_key(
+        "fk_repository_analyses_structure_map_sha", "repository_analyses",
+        "analysis_payloads", ["structure_map_sha"], ["sha256"],
+    )
+    op.create_foreign_key(
+        "fk_repository_analyses_functional_inventory_sha", "repository_analyses",
+        "analysis_payloads", ["functional_inventory_sha"], ["sha256"],
+    )
+
+    op.execute(
+        "UPDATE repository_analyses "
+        "SET progress_pct = (gap_analysis->>'progress_pct')::float "
+        "WHERE jsonb_typeof(gap_analysis->'progress_pct') = 'number'"
+    )
+
+    # Move existing payloads one row at a time to bound memory
+    conn = op.get_bind()
+    ids = conn.execute(
+        sa.select(_analyses.c.id).where(sa.or_(
+            _analyses.c.structure_map.is_not(None),
+            _analyses.c.functional_inventory.is_not(None),
+        ))
+    ).scalars().all()
+    for analysis_id in ids:
+        row = conn.execute(
+            sa.select(_analyses.c.structure_map, _analyses.c.functional_inventory)
+            .where(_analyses.c.id == analysis_id)
+        ).one()
+        values = {}
+        for column, value in (
+            ("structure_map_sha", row.structure_map),
+            ("functional_inventory_sha", row.functional_inventory),
+        ):
+            if value is None:
+                continue
+            sha, data, size = _encode(value)
+            conn.execute(
+                insert(_payloads).values(sha256=sha, data=data, size_bytes=size)
+                .on_conflict_do_nothing(index_elements=["sha256"])
+            )
+            values[column] = sha
+        conn.execute(sa.update(_analyses).where(_analyses.c.id == analysis_id).values(**values))
+
+    op.drop_column("repository_analyses", "structure_map")
+    op.drop_column("repository_analyses", "functional_inventory")
+
+
+def downgrade() -> None:
+    op.add_column("repository_analyses", sa.Column("structure_map", JSONB(), nullable=True))
+    op.add_column("repository_analyses", sa.Column("functional_inventory", JSONB(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(_analyses.c.id, _analyses.c.structure_map_sha, _analyses.c.functional_inventory_sha)
+        .where(sa.or_(
+            _analyses.c.structure_map_sha.is_not(None),
+            _analyses.c.functional_inventory_sha.is_not(None),
+        ))
+    ).all()
+    for analysis_id, structure_sha, inventory_sha in rows:
+        values = {}
+        for column, sha in (("structure_map", structure_sha), ("functional_inventory", inventory_sha)):
+            if sha is None:
+                continue
+            data = conn.execute(
+                sa.select(_payloads.c.data).where(_payloads.c.sha256 == sha)
+            ).scalar_one()
+            values[column] = json.loads(zlib.decompress(data))
+        conn.execute(sa.update(_analyses).where(_analyses.c.id == analysis_id).values(**values))
+
+    op.drop_constraint("fk_repository_analyses_functional_inventory_sha", "repository_analyses", type_="foreignkey")
+    op.drop_constraint("fk_repository_analyses_structure_map_sha", "repository_analyses", type_="foreignkey")
+    op.drop_column("repository_analyses", "functional_inventory_sha")
+    op.drop_column("repository_analyses", "structure_map_sha")
+    op.drop_column("repository_analyses", "progress_pct")
+    op.drop_column("repository_analyses", "commit_sha")
+    op.drop_table("analysis_payloads")
@@ -0,0 +1,46 @@
+"""add latest analysis pointer and last scan columns to products
+
+Revision ID: m9n0o1p2q3r4
+Revises: l8m9n0o1p2q3
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "m9n0o1p2q3r4"
+down_revision = "l8m9n0o1p2q3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("latest_analysis_id", sa.UUID(), nullable=True))
+    op.add_column("products", sa.Column("last_scan_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("products", sa.Column("last_scan_progress", sa.Float(), nullable=True))
+    op.create_foreign_key(
+        "fk_products_latest_analysis_id", "products", "repository_analyses",
+        ["latest_analysis_id"], ["id"], ondelete="SET NULL",
+    )
+    # Scan analyses are the ones with a progress percentage
+    op.execute(
+        """
+        UPDATE products p
+        SET latest_analysis_id = ra.id,
+            last_scan_at = ra.created_at,
+            last_scan_progress = ra.progress_pct
+        FROM (
+            SELECT DISTINCT ON (product_id) id, product_id, created_at, progress_pct
+            FROM repository_analyses
+            WHERE progress_pct IS NOT NULL
+            ORDER BY product_id, created_at DESC
+        ) ra
+        WHERE ra.product_id = p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_products_latest_analysis_id", "products", type_="foreignkey")
+    op.drop_column("products", "last_scan_progress")
+    op.drop_column("products", "last_scan_at")
+    op.drop_column("products", "latest_analysis_id")
@@ -0,0 +1,23 @@
+"""add rolling history summary to ai_chat_sessions
+
+Revision ID: n0o1p2q3r4s5
+Revises: m9n0o1p2q3r4
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "n0o1p2q3r4s5"
+down_revision = "m9n0o1p2q3r4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("ai_chat_sessions", sa.Column("history_summary", sa.Text(), nullable=True))
+    op.add_column("ai_chat_sessions", sa.Column("summary_until", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("ai_chat_sessions", "summary_until")
+    op.drop_column("ai_chat_sessions", "history_summary")
@@ -0,0 +1,24 @@
+"""add (session_id, created_at, id) index to ai_chat_messages
+
+Revision ID: o1p2q3r4s5t6
+Revises: n0o1p2q3r4s5
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "o1p2q3r4s5t6"
+down_revision = "n0o1p2q3r4s5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_ai_chat_messages_session_created_id",
+        "ai_chat_messages",
+        ["session_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_chat_messages_session_created_id", table_name="ai_chat_messages")
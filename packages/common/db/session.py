@@ -1,19 +1,39 @@
 """Database session factory for async SQLAlchemy."""
 
+import time
+
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from apps.api.config import settings
+from apps.api.observability import query_stats, tracing
+from apps.api.observability.metrics import observe_pool_checkout
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool reporting how long each checkout took, waits included."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            observe_pool_checkout(time.perf_counter() - start)
+
 
 engine = create_async_engine(
     settings.database_url,
     echo=False,
+    poolclass=TimedQueuePool,
     pool_size=20,
     max_overflow=10,
 )
+query_stats.install(engine.sync_engine)
+tracing.install(engine.sync_engine)
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -1,5 +1,5 @@
 """Redis connection utilities."""
 
-from .client import get_arq_redis, close_arq_redis
+from .client import get_arq_redis, close_arq_redis, use_arq_redis
 
-__all__ = ["get_arq_redis", "close_arq_redis"]
+__all__ = ["get_arq_redis", "close_arq_redis", "use_arq_redis"]
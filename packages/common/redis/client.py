@@ -34,6 +34,12 @@ async def get_arq_redis() -> ArqRedis:
     return _pool
 
 
+def use_arq_redis(pool: ArqRedis) -> None:
+    """Adopt an existing pool (the Arq worker's own) as the shared connection."""
+    global _pool  # noqa: PLW0603
+    _pool = pool
+
+
 async def close_arq_redis() -> None:
     """Close the shared Arq Redis pool on shutdown."""
     global _pool  # noqa: PLW0603